@@ -0,0 +1,305 @@
+'''bench.py module.  class list: [Console, Bench].  Headless benchmarks of the tabs editor, run with python bench.py, see Bench.__init__() for the cmd line options.'''
+
+import os, random, sys, tempfile, time, tracemalloc
+
+os.environ.setdefault('LINES', '50')                           # the viewport height used by setLastRow(), independent of the console running the benchmarks
+os.environ.setdefault('COLUMNS', '200')
+
+import bits, cmdArgs, tabs
+
+class Console(object):
+    '''A console that discards its output.  It reports a tty so colorama and the screen.Writer treat it like a real console.'''
+
+    encoding = 'utf-8'
+
+    def __init__(self):
+        self.fd = os.open(os.devnull, os.O_WRONLY)             # the file descriptor the screen.Writer writes to with os.write()
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return True
+
+    def fileno(self):
+        return self.fd
+
+class Bench(object):
+    '''Build a Tabs object for each synthetic song, without a tty and without loop(), and measure the time, the peak memory, and the console bytes of each operation.'''
+
+    SPELLINGS = { 4:'E1A1D2G2', 5:'B0E1A1D2G2', 6:'E2A2D3G3B3E4' }   # string spellings, other numbers of strings are tuned a whole tone apart
+    WHOLE_TONES = ['E2', 'F#2', 'G#2', 'A#2', 'C3', 'D3', 'E3', 'F#3', 'G#3', 'A#3', 'C4', 'D4']  # spans less than 2 octaves, chords.Chords names intervals up to 4 octaves
+    FRETS = '0123456789abcdefghijklmno'
+    NUM_VOICINGS = 2000                                        # number of random voicings named by chordNames()
+
+    def __init__(self):
+        '''[cmd line opts: -c number of columns, -n number of strings, -t columns per line, -r repeats, -o operation names, e.g. python bench.py -c 10 100 -n 6 -o printTabs]'''
+        argMap = {}
+        cmdArgs.parseCmdLine(argMap)
+        self.numCols = [int(a) for a in argMap.get('c', [])] or [10, 100, 1000, 10000]
+        self.numStrings = [int(a) for a in argMap.get('n', [])] or [4, 6, 12]
+        self.numTabsPerLine = int(argMap['t'][0]) if argMap.get('t') else 50
+        self.numRepeats = int(argMap['r'][0]) if argMap.get('r') else 3
+        self.opNames = argMap.get('o', [])
+        self.console = Console()
+        self.dir = tempfile.mkdtemp(prefix='tabs_bench_')
+        self.argv, self.stdout = sys.argv, sys.stdout
+        self.cacheName = os.path.join(self.dir, 'chords.cache')   # the chord cache file written by saveTabs()
+        self.ops = [('readTabs(ANSI)',         self.readAnsi,    self.bgnNone),
+                    ('readTabs(NATIVE)',       self.readNative,  self.bgnNone),
+                    ('printTabs',              self.printTabs,   self.bgnPrintTabs),
+                    ('printTabs(unchanged)',   self.printTabs,   self.bgnNone),
+                    ('setTab(REPLACE)',        self.setTab,      self.bgnReplace),
+                    ('setTab(INSERT)',         self.setTab,      self.bgnInsert),
+                    ('pasteSelectTabs(REPLACE)', self.paste,     self.bgnPasteReplace),
+                    ('pasteSelectTabs(INSERT)',  self.paste,     self.bgnPasteInsert),
+                    ('printChords',            self.printChords, self.bgnPrintChords),
+                    ('printChords(unchanged)', self.printChords, self.bgnNone),
+                    ('analyse(song)',          self.analyse,     self.bgnPrintChords),
+                    ('getChordName(baseline)', self.chordNames,  self.bgnPrintChords),
+                    ('saveTabs(ANSI)',         self.saveAnsi,    self.bgnNone),
+                    ('saveTabs(NATIVE)',       self.saveNative,  self.bgnNone)]
+        print('{:>6} {:>7} {:>24} {:>10} {:>10} {:>11}'.format('cols', 'strings', 'op', 'ms', 'peak KB', 'bytes'))
+        for ns in self.numStrings:
+            for nc in self.numCols:
+                self.run(nc, ns)
+        os.rmdir(self.dir)
+
+    def spelling(self, numStrings):
+        if numStrings in self.SPELLINGS: return self.SPELLINGS[numStrings]
+        if not 1 <= numStrings <= len(self.WHOLE_TONES):
+            raise Exception('Bench.spelling() ERROR! numStrings={} not in range [1, {}]'.format(numStrings, len(self.WHOLE_TONES)))
+        return ''.join(self.WHOLE_TONES[:numStrings])
+
+    def song(self, numCols, numStrings):
+        '''Return the tabs of a synthetic song, one bytearray for each string, a random melody with a chord every 4th column.'''
+        rand = random.Random(numCols * 100 + numStrings)
+        rows = [bytearray(b'-' * numCols) for r in range(0, numStrings)]
+        for c in range(0, numCols):
+            if c % 4 == 0:
+                for r in rand.sample(range(0, numStrings), min(3, numStrings)):
+                    rows[r][c] = ord(rand.choice(self.FRETS[:13]))
+            else:
+                rows[rand.randrange(numStrings)][c] = ord(rand.choice(self.FRETS))
+        return rows
+
+    def writeNative(self, name, numCols, numStrings):
+        '''Write a synthetic song in the native format, see Tabs.parseNativeTabs().'''
+        ntpl = min(numCols, self.numTabsPerLine)
+        numLines = -(-numCols // ntpl)
+        spelling = self.spelling(numStrings).encode('ascii')
+        with open(name, 'wb') as outFile:
+            outFile.write(tabs.Tabs.NATIVE_HDR.pack(tabs.Tabs.NATIVE_MAGIC, tabs.Tabs.NATIVE_VERSION, ord('0'), ntpl, numLines, len(spelling)))
+            outFile.write(spelling)
+            for row in self.song(numLines * ntpl, numStrings):
+                outFile.write(row)
+            outFile.write(bits.Bits(numStrings, numLines * ntpl).tobytes())
+        return ntpl
+
+    def build(self, name, ntpl, numStrings):
+        '''Build a Tabs object, like Tabs() does but without starting loop(), with the notes and chords sections enabled.'''
+        sys.argv, sys.stdout = ['tabs.py', '-f', name, '-t', str(ntpl), '-s', self.spelling(numStrings), '-n', '-b', '-C', self.cacheName], self.console
+        try:
+            tabsObj = tabs.Tabs.__new__(tabs.Tabs)
+            tabsObj.init()
+        finally:
+            sys.argv, sys.stdout = self.argv, self.stdout
+        if len(tabsObj.tabs) != numStrings or tabsObj.numTabsPerStringPerLine != ntpl:
+            raise Exception('Bench.build() ERROR! failed to read {}, numStrings={}, numTabsPerStringPerLine={}'.format(name, len(tabsObj.tabs), tabsObj.numTabsPerStringPerLine))
+        return tabsObj
+
+    def run(self, numCols, numStrings):
+        '''Run each operation numRepeats times on a song, report the fastest time, the peak memory of one more run traced by tracemalloc, and the console bytes.'''
+        name = os.path.join(self.dir, 'bench_{}_{}'.format(numCols, numStrings))
+        self.ansiName, self.nativeName = name + '.tab', name + '.tabs'
+        ntpl = self.writeNative(self.nativeName, numCols, numStrings)
+        self.tabsObj = self.build(self.nativeName, ntpl, numStrings)
+        self.measure(self.saveAnsi, self.bgnNone)            # the ANSI file read by readTabs(ANSI)
+        for opName, op, bgn in self.ops:
+            if self.opNames and opName.split('(')[0] not in self.opNames and opName not in self.opNames: continue
+            try:
+                secs = min(self.measure(op, bgn)[0] for i in range(0, self.numRepeats))
+                tracemalloc.start()
+                try:     peak, numBytes = self.measure(op, bgn)[1:]
+                finally: tracemalloc.stop()
+                print('{:>6,} {:>7} {:>24} {:>10.3f} {:>10,.1f} {:>11,}'.format(numCols, numStrings, opName, secs * 1000, peak / 1024, numBytes))
+            except Exception as e:
+                sys.stdout = self.stdout
+                print('{:>6,} {:>7} {:>24} ERROR! {}: {}'.format(numCols, numStrings, opName, type(e).__name__, e))
+        self.tabsObj.logs.close()
+        for n in (self.ansiName, self.nativeName, self.cacheName):
+            if os.path.exists(n): os.remove(n)
+
+    def measure(self, op, bgn):
+        '''Prepare the Tabs object with bgn() then time op() with the console output buffered by the screen.Writer, as loop() does for each command.'''
+        tabsObj, sys.stdout = self.tabsObj, self.console
+        try:
+            bgn()
+            writerObj = tabsObj.writerObj
+            n0 = writerObj.numBytes
+            if tracemalloc.is_tracing(): tracemalloc.reset_peak()
+            m0 = tracemalloc.get_traced_memory()[0]
+            t0 = time.perf_counter()
+            writerObj.bgn()
+            try:     op()
+            finally: writerObj.end()
+            secs = time.perf_counter() - t0
+            return secs, tracemalloc.get_traced_memory()[1] - m0, writerObj.numBytes - n0
+        finally:
+            sys.stdout = self.stdout
+
+    def bgnNone(self):
+        pass
+
+    def bgnPrintTabs(self):
+        self.tabsObj.screenObj.invalidate()
+
+    def bgnEdit(self, editMode):
+        tabsObj = self.tabsObj
+        tabsObj.editMode = tabsObj.EDIT_MODES[editMode]
+        tabsObj.moveTo(tabsObj.bgnRow(tabsObj.topLine), tabsObj.bgnCol())
+
+    def bgnReplace(self):
+        self.bgnEdit('REPLACE')
+
+    def bgnInsert(self):
+        self.bgnEdit('INSERT')
+
+    def bgnPaste(self, editMode):
+        '''Select the first 4 columns of all the strings and copy them, then move to the first tab.'''
+        tabsObj = self.tabsObj
+        tabsObj.selectTabs, tabsObj.selectHTabs = [], []
+        tabsObj.selectRows = list(range(0, tabsObj.numStrings))
+        tabsObj.selectCols = list(range(0, min(4, tabsObj.numTabsPerStringPerLine)))
+        tabsObj.copySelectTabs()
+        self.bgnEdit(editMode)
+
+    def bgnPasteReplace(self):
+        self.bgnPaste('REPLACE')
+
+    def bgnPasteInsert(self):
+        self.bgnPaste('INSERT')
+
+    def bgnPrintChords(self):
+        self.tabsObj.chordsObj.clearCache()                    # measure the chord discovery, not only the lookup of the cached names
+
+    def readAnsi(self):
+        with open(self.ansiName, 'rb') as self.tabsObj.inFile:
+            self.tabsObj.readTabs()
+
+    def readNative(self):
+        with open(self.nativeName, 'rb') as self.tabsObj.inFile:
+            self.tabsObj.readTabs()
+
+    def printTabs(self):
+        self.tabsObj.printTabs()
+
+    def setTab(self):
+        self.tabsObj.setTab(ord('5'))
+
+    def paste(self):
+        self.tabsObj.pasteSelectTabs()
+
+    def printChords(self):
+        self.tabsObj.chordsObj.printChords()
+
+    def analyse(self):
+        self.tabsObj.chordsObj.analyse()
+
+    def chordNames(self):
+        '''Name random voicings with chords.Chords.getChordName() and check the names against the baseline naming, see baselineChordName().  A voicing
+           the baseline names must keep its name and root, a voicing it does not name may only be named from the folded compound intervals e.g. a 2 and a 9.'''
+        tabsObj = self.tabsObj
+        rand = random.Random(tabsObj.numStrings)
+        for i in range(0, self.NUM_VOICINGS):
+            tabs = [rand.choice('-' + self.FRETS[:13]) for r in range(0, tabsObj.numStrings)]
+            notes = [tabsObj.getNote(r + 1, ord(tabs[r])) for r in range(tabsObj.numStrings - 1, -1, -1) if tabs[r] != '-']
+            name, baseline = tabsObj.chordsObj.getChordName(notes), self.baselineChordName(notes)
+            if baseline is not None and name != baseline:
+                raise Exception('Bench.chordNames() ERROR! tabs={} named {} not {}'.format(''.join(reversed(tabs)), name, baseline))
+
+    def baselineChordName(self, notes):
+        '''Return the chord name of the notes, lowest string first, as the baseline printChord() named it, or None.  Each note in turn is tried as the root and the
+           other notes are spelled from it with Tabs.INTERVALS, the notes below the root within an octave, the first spelling baselineSuffix() knows names the chord.'''
+        for root in notes:
+            imap = {}
+            for note in notes:
+                d = note.index - root.index
+                imap[self.tabsObj.INTERVALS[d % 12 if d < 0 else d]] = note
+            suffix = self.baselineSuffix(imap)
+            if suffix is not None: return imap['R'].name + suffix
+        return None
+
+    @staticmethod
+    def baselineSuffix(imap):
+        '''Return the chord name suffix of the spelled intervals as the baseline getChordName() named them, or None.'''
+        if '5' in imap:
+            if len(imap) == 2:                            return '5'
+            elif 'M3' in imap:
+                if len(imap) == 3:                        return ''
+                elif len(imap) == 4:
+                    if   'b7' in imap:                    return '7'
+                    elif  '7' in imap:                    return 'M7'
+                    elif  '6' in imap or '13' in imap:    return '6'
+                elif len(imap) == 5:
+                    if 'b7' in imap:
+                        if   '2' in imap or  '9' in imap: return '9'
+                        elif '4' in imap or '11' in imap: return '11'
+                        elif '6' in imap or '13' in imap: return '13'
+                    elif '7' in imap:
+                        if   '2' in imap or  '9' in imap: return 'M9'
+                        elif '4' in imap or '11' in imap: return 'M11'
+                        elif '6' in imap or '13' in imap: return 'M13'
+            elif 'm3' in imap:
+                if len(imap) == 3:                        return 'm'
+                elif len(imap) == 4:
+                    if   'b7' in imap:                    return 'm7'
+                    elif  '7' in imap:                    return 'mM7'
+                    elif  '6' in imap or '13' in imap:    return 'm6'
+                elif len(imap) == 5:
+                    if 'b7' in imap:
+                        if   '2' in imap or  '9' in imap: return 'm9'
+                        elif '4' in imap or '11' in imap: return 'm11'
+                        elif '6' in imap or '13' in imap: return 'm13'
+            elif len(imap) == 3:
+                if    '2' in imap or  '9' in imap:        return 's2'
+                elif  '4' in imap or '11' in imap:        return 's4'
+            elif len(imap) == 4:
+                if   'b7' in imap:
+                    if    '2' in imap or  '9' in imap:    return '7s2'
+                    elif  '4' in imap or '11' in imap:    return '7s4'
+        elif 'b5' in imap:
+            if 'm3' in imap and len(imap) == 3:           return 'dim'
+        elif 'a5' in imap:
+            if 'M3' in imap and len(imap) == 3:           return 'aug'
+        elif 'M3' in imap:
+            if len(imap) == 3:
+                if   'b7' in imap:                        return '7n5'
+                elif  '7' in imap:                        return 'M7n5'
+            elif len(imap) == 4:
+                if 'b7' in imap and '9' in imap:          return '9n5'
+        elif 'm3' in imap:
+            if len(imap) == 3:
+                if   'b7' in imap:                        return 'm7n5'
+                elif  '7' in imap:                        return 'mM7n5'
+        return None
+
+    def saveAnsi(self):
+        self.save(self.ansiName, 'ANSI')
+
+    def saveNative(self):
+        self.save(self.nativeName, 'NATIVE')
+
+    def save(self, name, fileFormat):
+        tabsObj = self.tabsObj
+        tabsObj.outName, tabsObj.fileFormat = name, tabsObj.FILE_FORMATS[fileFormat]
+        tabsObj.saveTabs()
+
+def main():
+    Bench()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+'''bits.py module.  class list: [Bits].  Packed flags for the tabs, one bit per cell, e.g. the harmonic flags.'''
+
+class Bits(object):
+    '''Model a strings x columns grid of flags packed 8 cells per byte in one contiguous bytearray, bit c % 8 of byte c // 8 of a row is the flag of column c.
+       Each row is stored in stride bytes, the bits past numCols are always clear.  The bulk operations convert the bytes of a row to an int, shift it, and write it back.'''
+
+    def __init__(self, numRows, numCols, data=None):
+        '''The data is the packed bytes of all the rows one after the other, see tobytes(), the default is numRows rows of numCols clear flags.'''
+        self.numRows = numRows                                 # number of rows, e.g. one for each string
+        self.numCols = numCols                                 # number of flags in each row
+        self.stride = self.rowBytes(numCols)                   # number of bytes reserved for each row, doubled when appended columns do not fit
+        self.buf = bytearray(data) if data is not None else bytearray(numRows * self.stride)
+        if len(self.buf) != numRows * self.stride:
+            raise Exception('Bits() ERROR! len(data)={:,} != numRows={} * rowBytes(numCols={})={}'.format(len(self.buf), numRows, numCols, self.stride))
+
+    @classmethod
+    def fromFlags(cls, rows, one=ord('1')):
+        '''Return Bits with a flag set for each byte equal to one in the given rows, e.g. the '0' and '1' bytes of a bytearray for each string, all the rows must have the same length.'''
+        numCols = len(rows[0]) if rows else 0
+        table = bytes(ord('1') if b == one else ord('0') for b in range(256))
+        bits = cls(len(rows), numCols)
+        for r in range(0, len(rows)):
+            bits.setRow(r, int(bytes(rows[r]).translate(table)[::-1] or b'0', 2))
+        return bits
+
+    @staticmethod
+    def rowBytes(numCols):
+        return (numCols + 7) // 8
+
+    def __len__(self):
+        return self.numRows
+
+    def row(self, r):
+        '''Return the flags of row r as an int, bit c is the flag of column c.'''
+        return int.from_bytes(self.buf[r * self.stride:(r + 1) * self.stride], 'little')
+
+    def setRow(self, r, bits):
+        '''Set the flags of row r from the bits of an int, the bits past numCols are dropped.'''
+        bits &= (1 << self.numCols) - 1
+        self.buf[r * self.stride:(r + 1) * self.stride] = bits.to_bytes(self.stride, 'little')
+
+    def test(self, r, c):
+        '''Return 1 if the flag of row r column c is set else 0, a negative c counts from the end of the row like a list index.'''
+        if c < 0: c += self.numCols
+        if not 0 <= c < self.numCols:
+            raise IndexError('Bits.test() ERROR! c={} not in range [0, {})'.format(c, self.numCols))
+        return self.buf[r * self.stride + (c >> 3)] >> (c & 7) & 1
+
+    def set(self, r, c, value=1):
+        '''Set the flag of row r column c, or clear it if value is false.'''
+        i, mask = r * self.stride + (c >> 3), 1 << (c & 7)
+        if value: self.buf[i] |= mask
+        else:     self.buf[i] &= ~mask & 0xFF
+
+    def get(self, r, c, end):
+        '''Return the flags of row r from column c to end as an int, bit 0 is the flag of column c.  Only the bytes holding the range are read.'''
+        if c >= end: return 0
+        bgn = r * self.stride
+        return int.from_bytes(self.buf[bgn + (c >> 3):bgn + ((end + 7) >> 3)], 'little') >> (c & 7) & ((1 << (end - c)) - 1)
+
+    def put(self, r, c, end, bits):
+        '''Set the flags of row r from column c to end from the bits of an int, see get().'''
+        if c >= end: return
+        bgn, stop = r * self.stride + (c >> 3), r * self.stride + ((end + 7) >> 3)
+        mask = ((1 << (end - c)) - 1) << (c & 7)
+        old = int.from_bytes(self.buf[bgn:stop], 'little')
+        self.buf[bgn:stop] = ((old & ~mask) | ((bits << (c & 7)) & mask)).to_bytes(stop - bgn, 'little')
+
+    def resize(self, numCols):
+        '''Set the number of flags of every row, new flags are clear.  The capacity at least doubles when it grows, like grid.Grid.resize().'''
+        stride = self.rowBytes(numCols)
+        if stride > self.stride:
+            old, self.stride = self.stride, max(stride, 2 * self.stride)
+            buf = bytearray(self.numRows * self.stride)
+            for r in range(0, self.numRows):
+                buf[r * self.stride:r * self.stride + old] = self.buf[r * old:(r + 1) * old]
+            self.buf = buf
+        shrink, self.numCols = numCols < self.numCols, numCols
+        if shrink:
+            for r in range(0, self.numRows):
+                self.setRow(r, self.row(r))
+
+    def fill(self, value):
+        '''Set every flag, or clear every flag if value is false.'''
+        self.buf[:] = bytes(len(self.buf))
+        if value:
+            for r in range(0, self.numRows):
+                self.setRow(r, -1)
+
+    def insert(self, c, rows=None, n=1):
+        '''Shift the flags from column c n columns right in the given rows, default all the rows, the last n flags of each row are dropped.
+           The flags from c to c + n are unchanged until the caller overwrites them, like grid.Grid.insert().'''
+        keep = (1 << (c + n)) - 1
+        for r in range(0, self.numRows) if rows is None else rows:
+            bits = self.row(r)
+            self.setRow(r, (bits & keep) | (bits >> c << (c + n)))
+
+    def delete(self, c, rows=None, n=1):
+        '''Shift the flags from column c + n n columns left in the given rows, default all the rows, the last n flags of each row are unchanged, like grid.Grid.delete().'''
+        n = min(n, self.numCols - c)
+        if n <= 0: return
+        keep, last = (1 << c) - 1, ((1 << n) - 1) << (self.numCols - n)
+        for r in range(0, self.numRows) if rows is None else rows:
+            bits = self.row(r)
+            self.setRow(r, (bits & keep) | (bits >> (c + n) << c) | (bits & last))
+
+    def tobytes(self):
+        '''Return the packed bytes of all the rows one after the other, rowBytes(numCols) bytes for each row.'''
+        n = self.rowBytes(self.numCols)
+        if n == self.stride: return bytes(self.buf)
+        return b''.join(self.buf[r * self.stride:r * self.stride + n] for r in range(0, self.numRows))
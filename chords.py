@@ -1,238 +1,422 @@
 '''chords.py module.  class list: [Chords].  Users are encouraged to modify this module to customize chord discovery and naming'''
 
+import collections, os, struct, zlib
+
 class Chords(object):
     '''Model chords for stringed instruments.  Discover and name chords'''
-    
-    def __init__(self, tabsObj):
-        self.INTERVAL_RANK = { 'R':0, 'b2':1, '2':2, 'm3':3, 'M3':4, '4':5, 'b5':6, '5':7, 'a5':8, '6':9, 'b7':10, '7':11, 'b9':12, '9':13, '11':14, '13':15 }
-        self.tabsObj = tabsObj
-        self.chords = {}                                       # dict of chord spelling -> chord name; cache of discovered chords to avoid calculation
-        print('Chords() tabsObj={}'.format(tabsObj), file=tabsObj.dbgFile)
 
-    def imapKeyFunc(self, inKey):
-        return self.INTERVAL_RANK[inKey]
-        
-    def getChordKey(self, keys):
-        return '-'.join(keys)
+    INTERVAL_BITS = { 'R':0, 'b2':1, '2':2, 'm3':3, 'M3':4, '4':5, 'b5':6, '5':7, 'a5':8, '6':9, 'b7':10, '7':11, 'b9':1, '9':2, '11':5, '13':9 }  # interval name -> semitones above the root mod 12
+
+    VOCABULARY = (                                             # chord name suffix and the intervals of the chord, a tuple of intervals is any one of them; edit to customize chord naming
+        ('5',     ('R', '5')),
+        ('',      ('R', 'M3', '5')),
+        ('7',     ('R', 'M3', '5', 'b7')),
+        ('M7',    ('R', 'M3', '5', '7')),
+        ('6',     ('R', 'M3', '5', ('6', '13'))),
+        ('9',     ('R', 'M3', '5', 'b7', ('2', '9'))),
+        ('11',    ('R', 'M3', '5', 'b7', ('4', '11'))),
+        ('13',    ('R', 'M3', '5', 'b7', ('6', '13'))),
+        ('M9',    ('R', 'M3', '5', '7', ('2', '9'))),
+        ('M11',   ('R', 'M3', '5', '7', ('4', '11'))),
+        ('M13',   ('R', 'M3', '5', '7', ('6', '13'))),
+        ('m',     ('R', 'm3', '5')),
+        ('m7',    ('R', 'm3', '5', 'b7')),
+        ('mM7',   ('R', 'm3', '5', '7')),
+        ('m6',    ('R', 'm3', '5', ('6', '13'))),
+        ('m9',    ('R', 'm3', '5', 'b7', ('2', '9'))),
+        ('m11',   ('R', 'm3', '5', 'b7', ('4', '11'))),
+        ('m13',   ('R', 'm3', '5', 'b7', ('6', '13'))),
+        ('s2',    ('R', ('2', '9'), '5')),
+        ('s4',    ('R', ('4', '11'), '5')),
+        ('7s2',   ('R', ('2', '9'), '5', 'b7')),
+        ('7s4',   ('R', ('4', '11'), '5', 'b7')),
+        ('dim',   ('R', 'm3', 'b5')),
+        ('aug',   ('R', 'M3', 'a5')),
+        ('7n5',   ('R', 'M3', 'b7')),                          # Maybe omit all the n5 (no 5th) chords for simplicity
+        ('M7n5',  ('R', 'M3', '7')),
+        ('9n5',   ('R', 'M3', 'b7', '9')),
+        ('m7n5',  ('R', 'm3', 'b7')),
+        ('mM7n5', ('R', 'm3', '7')) )
+
+    COMPOUND = ('b9', '9', '11', '13')                         # the intervals spelled an octave or more above the root, e.g. 14 semitones is a 9 and 2 semitones is a 2
+
+    TABLE = None                                               # list of 4096 entries indexed by pitch class mask, see getTable()
+    SPELLINGS = None                                           # dict of spelled interval mask -> chord name suffix, see getTable()
+    SPELLED_BITS = None                                        # tuple of the spelled interval bit of each number of semitones mod 12 an octave or more above the root, see getTable()
+    CACHE_MAGIC = b'CHRD'                                      # leading bytes of the chord cache file
+    CACHE_VERSION = 2                                          # version of the chord cache file format
+    CACHE_HDR = struct.Struct('<4sBIII')                       # magic, version, vocabulary version, number of entries, crc32 of the entries
+
+    @classmethod
+    def getSpellings(cls, intervals):
+        '''Return the spellings of the intervals of a VOCABULARY entry, one tuple of interval names for each choice of the alternative intervals.'''
+        spellings = [()]
+        for interval in intervals:
+            spellings = [spelling + (name,) for spelling in spellings for name in ((interval,) if isinstance(interval, str) else interval)]
+        return spellings
+
+    @classmethod
+    def getSuffixMasks(cls):
+        '''Return a dict of chord name suffix -> 12 bit pitch class mask of the chord with root C, the alternative intervals of a suffix are the same pitch class.'''
+        masks = {}
+        for suffix, intervals in cls.VOCABULARY:
+            masks[suffix] = 0
+            for interval in cls.getSpellings(intervals)[0]: masks[suffix] |= 1 << cls.INTERVAL_BITS[interval]
+        return masks
+
+    @classmethod
+    def getTable(cls):
+        '''Return the chord table, built once from the VOCABULARY.  TABLE[mask] is None if no rotation of the 12 bit pitch class mask names a chord,
+           else a tuple of 12 entries indexed by root pitch class, the chord name suffix if the mask rotated to that root is in the vocabulary else None.
+           The SPELLINGS are built with it, they name the chords from the spelled intervals e.g. a 2 and a 9 are different intervals, see findChord().'''
+        if cls.TABLE is None:
+            suffixes, spellings = {}, {}
+            for suffix, mask in cls.getSuffixMasks().items():
+                if mask in suffixes: raise Exception('Chords.getTable() ERROR! {} and {} have the same intervals'.format(suffixes[mask], suffix))
+                suffixes[mask] = suffix
+            bits = {name:cls.INTERVAL_BITS[name] + (12 if name in cls.COMPOUND else 0) for name in cls.INTERVAL_BITS}
+            for suffix, intervals in cls.VOCABULARY:
+                for spelling in cls.getSpellings(intervals):
+                    spelled = 0
+                    for interval in spelling: spelled |= 1 << bits[interval]
+                    spellings[spelled] = suffix
+            table = [None] * 4096
+            for mask in range(1, 4096):
+                roots = tuple(suffixes.get(((mask >> pc) | (mask << (12 - pc))) & 0xFFF) if mask >> pc & 1 else None for pc in range(0, 12))
+                if any(suffix is not None for suffix in roots): table[mask] = roots
+            cls.SPELLED_BITS = tuple(pc + 12 if pc + 12 in bits.values() else pc for pc in range(0, 12))
+            cls.SPELLINGS = spellings
+            cls.TABLE = table
+        return cls.TABLE
+
+    def __init__(self, tabsObj, cacheSize=1024):
+        self.tabsObj = tabsObj
+        self.log = tabsObj.logs.channel('chords')             # the logs.Channel for this module
+        self.table = self.getTable()                           # the chord table shared by all the Chords objects
+        self.spellings = self.SPELLINGS                        # the spelled chords shared by all the Chords objects, see findChord()
+        self.cache = collections.OrderedDict()                 # LRU dict of interval structure -> (root interval, chord name suffix) or None, see getChord()
+        self.cacheSize = cacheSize                             # bound on len(cache), the least recently used entry is dropped first
+        self.hits = 0                                          # number of getChord() calls found in the cache
+        self.misses = 0                                        # number of getChord() calls looked up in the table and added to the cache
+        self.memo = {}                                         # dict of column index -> (key, cells), the chords section of each drawn column, see getCells()
+        self.arpeggios = {}                                    # dict of line index -> (key, dict of column index -> cells), the arpeggios of each drawn line, see getArpeggios()
+        self.cacheName = tabsObj.chordsName                    # file the cache is loaded from and saved to, None to not persist the cache
+        self.dirty = False                                     # True if the cache has entries that are not in the cache file
+        self.log('Chords() tabsObj={}, cacheSize={}, cacheName={}', tabsObj, cacheSize, self.cacheName)
+        self.loadCache()
 
     def eraseChord(self, cc):
         row, col = self.tabsObj.indices2RowCol(self.tabsObj.numStrings + self.tabsObj.NOTES_LEN, cc)
-#        print('eraseChord({}) (row,col)=({},{}) bgn: '.format(cc, row, col), file=self.tabsObj.dbgFile)
+#        self.log('eraseChord({}) (row,col)=({},{}) bgn: ', cc, row, col)
         for r in range(0, self.tabsObj.CHORDS_LEN):
             self.tabsObj.prints(' ', r + row, col, self.tabsObj.styles['NAT_CHORD'])
             
-    def printChords(self):
-        print('printChords({}, {}) bgn {} =?= {} * {}'.format(self.tabsObj.row, self.tabsObj.col, self.tabsObj.numTabsPerString, self.tabsObj.numLines, self.tabsObj.numTabsPerStringPerLine), file=self.tabsObj.dbgFile)
-        for c in range(0, self.tabsObj.numTabsPerString):
-            noteCount = 0
-            self.eraseChord(c)
-            for r in range(0, self.tabsObj.numStrings):
-                if self.tabsObj.isFret(chr(self.tabsObj.tabs[r][c])):
-                    if noteCount > 0:
-                        self.printChord(c=c)
-                        break
-                    noteCount += 1
-            print(file=self.tabsObj.outFile)
-        print('printChords({}, {}) end {} =?= {} * {}'.format(self.tabsObj.row, self.tabsObj.col, self.tabsObj.numTabsPerString, self.tabsObj.numLines, self.tabsObj.numTabsPerStringPerLine), file=self.tabsObj.dbgFile)
+    def printChords(self, bgn=0, end=None):
+        '''Print the chords of the columns in the viewport, optionally only the columns from index bgn to end.  Only the columns that changed are analysed, see getCells().'''
+        self.log('printChords({}, {}) bgn={}, end={} {} =?= {} * {}', self.tabsObj.row, self.tabsObj.col, bgn, end, self.tabsObj.numTabsPerString, self.tabsObj.numLines, self.tabsObj.numTabsPerStringPerLine)
+        ntpspl, topLine = self.tabsObj.numTabsPerStringPerLine, self.tabsObj.topLine
+        viewEnd = (topLine + self.tabsObj.numViewLines) * ntpspl
+        bgn, end = max(bgn, topLine * ntpspl), viewEnd if end is None else min(end, viewEnd)
+        if bgn < end and (bgn not in self.memo or end - 1 not in self.memo):
+            self.analyse(bgn, end)                             # e.g. the first lines drawn or lines scrolled into view
+        for c in range(bgn, end):                              # only the lines in the viewport
+            if c == bgn or c % ntpspl == 0:
+                arpeggios = self.updateArpeggios(c // ntpspl, bgn, end)
+            self.printCells(c, arpeggios.get(c) or self.getCells(c))
+            if self.tabsObj.outFile != None: print(file=self.tabsObj.outFile)
+        self.log('printChords({}, {}) end {} =?= {} * {}', self.tabsObj.row, self.tabsObj.col, self.tabsObj.numTabsPerString, self.tabsObj.numLines, self.tabsObj.numTabsPerStringPerLine)
         
     def printChord(self, c=None, dbg=0):
         '''Analyse notes in given column index and if a valid chord is discovered then print it in the appropriate chords section.'''
         if c is None:
             c = self.tabsObj.col - self.tabsObj.COL_OFF
-        self.eraseChord(c)
         row, col = self.tabsObj.indices2RowCol(self.tabsObj.numStrings + self.tabsObj.NOTES_LEN, c)
         if dbg:
-            print('printChord({}) (row,col)=({},{}) bgn: '.format(c, row, col), file=self.tabsObj.dbgFile)
-            print('Strings     [', end='', file=self.tabsObj.dbgFile)
-            for r in range(self.tabsObj.numStrings - 1, -1, -1):
-                if self.tabsObj.isFret(chr(self.tabsObj.tabs[r][c])):
-                    note = self.tabsObj.getNote(r + 1, 0)
-                    print('{:>3}/{:<1}'.format(r+1, note.name[0]), end=' ', file=self.tabsObj.dbgFile)
-        
-        tbs = []
-        for r in range(0, self.tabsObj.numStrings):
-            if self.tabsObj.isFret(chr(self.tabsObj.tabs[r][c])):
-                tbs.append(chr(self.tabsObj.tabs[r][c]))
-        tbs.reverse()
-        if dbg:
-            print(']\ntabs        [', end='', file=self.tabsObj.dbgFile)
-            for t in range(len(tbs)):
-                print('{:>5}'.format(tbs[t]), end=' ', file=self.tabsObj.dbgFile)
-        tbs = []
-        for r in range(0, self.tabsObj.numStrings):
-            if self.tabsObj.isFret(chr(self.tabsObj.tabs[r][c])):
-                tbs.append(chr(self.tabsObj.getFretByte(self.tabsObj.getFretNum(self.tabsObj.tabs[r][c]) + self.tabsObj.getFretNum(self.tabsObj.capo))))
-        tbs.reverse()
-        if dbg:
-            print(']\ncapoed tabs [', end='', file=self.tabsObj.dbgFile)
-            for t in range(len(tbs)):
-                print('{:>5}'.format(tbs[t]), end=' ', file=self.tabsObj.dbgFile)
-        
-        notes = []
-        for r in range(0, self.tabsObj.numStrings):
-            tab = self.tabsObj.getFretByte(self.tabsObj.getFretNum(self.tabsObj.tabs[r][c]) + self.tabsObj.getFretNum(self.tabsObj.capo))
-            if self.tabsObj.isFret(chr(tab)):
-                note = self.tabsObj.getNote(r + 1, tab)
-                if len(note.name) > 1 and note.name[1] == '#' and self.tabsObj.enharmonic == self.tabsObj.ENHARMONIC['FLAT']:
-                    note.name = self.tabsObj.SHARPS_2_FLATS[note.name]
-                elif len(note.name) > 1 and note.name[1] == 'b' and self.tabsObj.enharmonic == self.tabsObj.ENHARMONIC['SHARP']:
-                    note.name = self.tabsObj.FLATS_2_SHARPS[note.name]
-                notes.append(note.name)
-        notes.reverse()
-        if dbg:
-            print(']\nnotes       [', end='', file=self.tabsObj.dbgFile)
-            for t in range(len(notes)):
-                print('{:>5}'.format(notes[t]), end=' ', file=self.tabsObj.dbgFile)
-        indices = []
-        for r in range(0, self.tabsObj.numStrings):
-            tab = self.tabsObj.getFretByte(self.tabsObj.getFretNum(self.tabsObj.tabs[r][c]) + self.tabsObj.getFretNum(self.tabsObj.capo))
-            if self.tabsObj.isFret(chr(tab)):
-                note = self.tabsObj.getNote(r + 1, tab)
-                indices.append(note.index)
-        indices.reverse()
-        if dbg:
-            print(']\nindices     [', end='', file=self.tabsObj.dbgFile)
-            for t in range(len(indices)):
-                print('{:>5}'.format(indices[t]), end=' ', file=self.tabsObj.dbgFile)
-            print(']', file=self.tabsObj.dbgFile)
-        
-        for j in range(len(indices)):
-            deltas = []
-            for i in range(0, len(indices)):
-                if indices[i] - indices[j] >= 0:
-                    deltas.append(indices[i] - indices[j])
-                elif 0 > indices[i] - indices[j] >= -12:
-                    deltas.append(indices[i] - indices[j] + 12)
-                elif -12 > indices[i] - indices[j] >= -24:
-                    deltas.append(indices[i] - indices[j] + 24)
-                elif -24 > indices[i] - indices[j] >= -36:
-                    deltas.append(indices[i] - indices[j] + 36)
-                elif -36 > indices[i] - indices[j] >= -48:
-                    deltas.append(indices[i] - indices[j] + 48)
-            if dbg:
-                print('deltas      [', end='', file=self.tabsObj.dbgFile)
-                for t in range(len(deltas)):
-                    print('{:>5}'.format(deltas[t]), end=' ', file=self.tabsObj.dbgFile)
-            intervals = []
-            for i in range(0, len(deltas)):
-                intervals.append(self.tabsObj.INTERVALS[deltas[i]])
-            if dbg:
-                print(']\nintervals   [', end='', file=self.tabsObj.dbgFile)
-                for t in range(len(deltas)):
-                    print('{:>5}'.format(intervals[t]), end=' ', file=self.tabsObj.dbgFile)
-            
-            imap = dict(zip(intervals, notes))
-            imapKeys = sorted(imap, key=self.imapKeyFunc, reverse=False)
-            chordKeys = [ imap[k] for k in imapKeys ]
-            chordKey = self.getChordKey(chordKeys)
-            if dbg:
-                print(']\niMap        [', end='', file=self.tabsObj.dbgFile)
-                for k in imap:
-                    print('{:>2}:{:<2}'.format(k, imap[k]), end=' ', file=self.tabsObj.dbgFile)
-                print(']\nimapKeys    [', end='', file=self.tabsObj.dbgFile)
-                for k in imapKeys:
-                    print('{:>5}'.format(k), end=' ', file=self.tabsObj.dbgFile)
-                print(']\nchordKeys   [', end='', file=self.tabsObj.dbgFile)
-                for k in chordKeys:
-                    print('{:>5}'.format(k), end=' ', file=self.tabsObj.dbgFile)
-                print(']\nchords      [', end=' ', file=self.tabsObj.dbgFile)
-                for k in self.chords:
-                    print('{:>5}:{:<5}'.format(k, self.chords[k]), end=' ', file=self.tabsObj.dbgFile)
-                print(']', file=self.tabsObj.dbgFile)
-            
-            chordName = None
-            if chordKey not in self.chords:
-                if dbg: print('printChord() Key = \'{}\' not found in chords - calculating value'.format(chordKey), file=self.tabsObj.dbgFile)
-                chordName = self.getChordName(imap)
-                if chordName and len(chordName) > 0:
-                    self.chords[chordKey] = chordName
-                    if dbg:
-                        print('printChord() Adding Key = \'{}\', value = \'{}\' to chords'.format(chordKey, self.chords[chordKey]), file=self.tabsObj.dbgFile)
-                        print('chords      [', end=' ', file=self.tabsObj.dbgFile)
-                        for k in self.chords:
-                            print('{:>5}:{:<5}'.format(k, self.chords[k]), end=' ', file=self.tabsObj.dbgFile)
-                        print(']', file=self.tabsObj.dbgFile)
-            else: 
-                if dbg: print('printChord() Found key = \'{}\', value = \'{}\' in chords'.format(chordKey, self.chords[chordKey]), file=self.tabsObj.dbgFile)
-                chordName = self.chords[chordKey]
-            if chordName != None:
-                if len(chordName) > 1 and ( chordName[1] == '#' or chordName[1] == 'b' ):
-                    chordName = chordName[0] + chordName[2:]
-                for i in range(len(chordName)):
-                    style = self.tabsObj.styles['NAT_CHORD']
-                    if i == 0:
-                        if len(imap['R']) > 1:
-                            if imap['R'][1] == '#':
-                                if self.tabsObj.enharmonic == self.tabsObj.ENHARMONIC['FLAT']:
-                                    style = self.tabsObj.styles['FLT_CHORD']
-                                else:
-                                    style = self.tabsObj.styles['SHP_CHORD']
-                            elif imap['R'][1] == 'b':
-                                if self.tabsObj.enharmonic == self.tabsObj.ENHARMONIC['SHARP']:
-                                    style = self.tabsObj.styles['SHP_CHORD']
-                                else:
-                                    style = self.tabsObj.styles['FLT_CHORD']
-                    if chordName[i] == 'm' or 'dim' in chordName and chordName[i] == 'd' or chordName[i] == 'i':
-                        style = self.tabsObj.styles['FLT_CHORD']
-                    self.tabsObj.prints(chordName[i], i + row, col, style)
-#                    self.moveTo()
-                break
-
-    def getChordName(self, imap):
-        '''Calculate chord name.'''
-        r = imap['R'] # r = imap['R'][0]
-        if 'R' in imap:
-            if '5' in imap: 
-                if len(imap) == 2:                            return '{}5'.format(r)
-                elif 'M3' in imap:
-                    if len(imap) == 3:                        return '{}'.format(r)
-                    elif len(imap) == 4:
-                        if   'b7' in imap:                    return '{}7'.format(r)
-                        elif  '7' in imap:                    return '{}M7'.format(r)
-                        elif  '6' in imap or '13' in imap:    return '{}6'.format(r)
-                    elif len(imap) == 5:
-                        if 'b7' in imap:
-                            if   '2' in imap or  '9' in imap: return '{}9'.format(r)
-                            elif '4' in imap or '11' in imap: return '{}11'.format(r)
-                            elif '6' in imap or '13' in imap: return '{}13'.format(r)
-                        elif '7' in imap:
-                            if   '2' in imap or  '9' in imap: return '{}M9'.format(r)
-                            elif '4' in imap or '11' in imap: return '{}M11'.format(r)
-                            elif '6' in imap or '13' in imap: return '{}M13'.format(r)
-                elif 'm3' in imap:
-                    if len(imap) == 3:                        return '{}m'.format(r)
-                    elif len(imap) == 4:
-                        if   'b7' in imap:                    return '{}m7'.format(r)
-                        elif  '7' in imap:                    return '{}mM7'.format(r)
-                        elif  '6' in imap or '13' in imap:    return '{}m6'.format(r)
-                    elif len(imap) == 5:
-                        if 'b7' in imap:
-                            if   '2' in imap or  '9' in imap: return '{}m9'.format(r)
-                            elif '4' in imap or '11' in imap: return '{}m11'.format(r)
-                            elif '6' in imap or '13' in imap: return '{}m13'.format(r)
-                elif len(imap) == 3:
-                    if    '2' in imap or  '9' in imap:        return '{}s2'.format(r)
-                    elif  '4' in imap or '11' in imap:        return '{}s4'.format(r)
-                elif len(imap) == 4:
-                    if   'b7' in imap:
-                        if    '2' in imap or  '9' in imap:    return '{}7s2'.format(r)
-                        elif  '4' in imap or '11' in imap:    return '{}7s4'.format(r)
-            elif 'b5' in imap:
-                if 'm3' in imap:
-                    if len(imap) == 3:                        return '{}dim'.format(r)
-            elif 'a5' in imap:
-                if 'M3' in imap:
-                    if len(imap) == 3:                        return '{}aug'.format(r)
-            # Maybe omit all the n5 (no 5th) chords for simplicity
-            elif 'M3' in imap:
-                if len(imap) == 3:
-                    if   'b7' in imap:                        return '{}7n5'.format(r)
-                    elif  '7' in imap:                        return '{}M7n5'.format(r)
-                elif len(imap) == 4:
-                    if   'b7' in imap:
-                        if '9' in imap:                       return '{}9n5'.format(r)
-            elif 'm3' in imap:
-                if len(imap) == 3:
-                    if   'b7' in imap:                        return '{}m7n5'.format(r)
-                    elif  '7' in imap:                        return '{}mM7n5'.format(r)
+            notes = self.getNotes(c)
+            self.log('printChord({}) (row,col)=({},{}) notes=[{}], indices={}, mask={:012b}, chord={}', c, row, col, ' '.join(n.name for n in notes), [n.index for n in notes], self.getMask(notes), self.getChordName(notes))
+        arpeggios = self.updateArpeggios(c // self.tabsObj.numTabsPerStringPerLine, c, c + 1)
+        self.printCells(c, arpeggios.get(c) or self.getCells(c))
+
+    def printCells(self, c, cells):
+        row, col = self.tabsObj.indices2RowCol(self.tabsObj.numStrings + self.tabsObj.NOTES_LEN, c)
+        for i, (ch, style) in enumerate(cells):
+            self.tabsObj.prints(ch, i + row, col, style)
+
+    def updateArpeggios(self, line, bgn, end):
+        '''Return the arpeggios of the line, see getArpeggios().  If an edit moved them, reprint the first columns of the old and the new arpeggios outside the columns from index bgn to end.'''
+        old = self.arpeggios.get(line)
+        arpeggios = self.getArpeggios(line)
+        if old is not None and old[1] != arpeggios:
+            for c in set(old[1]) | set(arpeggios):
+                if not bgn <= c < end: self.printCells(c, arpeggios.get(c) or self.getCells(c))
+        return arpeggios
+
+    def getCells(self, c):
+        '''Return the (char, style) cells of the chords section of column index c, the chord name padded with blanks to CHORDS_LEN cells.  The cells are memoized
+           for each column with the tabs of the column, the capo, and the enharmonic setting.  A write to the column changes the key, which marks the entry dirty.'''
+        tabsObj = self.tabsObj
+        key = (tabsObj.tabs.col(c), tabsObj.capo, tabsObj.enharmonic, tabsObj.CHORDS_LEN)
+        entry = self.memo.get(c)
+        if entry is not None and entry[0] == key: return entry[1]
+        cells = self.makeCells(self.getChord(self.getNotes(c)))
+        self.memo[c] = (key, cells)
+        return cells
+
+    def makeCells(self, chord):
+        '''Return the (char, style) cells of the chord (root note, suffix) or of no chord if chord is None, see getCells().'''
+        tabsObj = self.tabsObj
+        cells = [(' ', tabsObj.styles['NAT_CHORD'])] * tabsObj.CHORDS_LEN
+        if chord is not None:
+            root, suffix = chord
+            chordName = root.name + suffix
+            if len(chordName) > 1 and ( chordName[1] == '#' or chordName[1] == 'b' ):
+                chordName = chordName[0] + chordName[2:]
+            for i in range(len(chordName)):
+                style = tabsObj.styles['NAT_CHORD']
+                if i == 0:
+                    if len(root.name) > 1:
+                        if root.name[1] == '#':
+                            if tabsObj.enharmonic == tabsObj.ENHARMONIC['FLAT']:
+                                style = tabsObj.styles['FLT_CHORD']
+                            else:
+                                style = tabsObj.styles['SHP_CHORD']
+                        elif root.name[1] == 'b':
+                            if tabsObj.enharmonic == tabsObj.ENHARMONIC['SHARP']:
+                                style = tabsObj.styles['SHP_CHORD']
+                            else:
+                                style = tabsObj.styles['FLT_CHORD']
+                if chordName[i] == 'm' or 'dim' in chordName and chordName[i] == 'd' or chordName[i] == 'i':
+                    style = tabsObj.styles['FLT_CHORD']
+                if i < len(cells): cells[i] = (chordName[i], style)
+                else:              cells.append((chordName[i], style))   # a name longer than CHORDS_LEN is drawn past the chords section, as before
+        return tuple(cells)
+
+    def analyse(self, bgn=0, end=None):
+        '''Memoize the cells of every column from index bgn to end, default the whole song, from one getChords() pass, so the renderer only reads the memo.'''
+        tabsObj = self.tabsObj
+        state, names = (tabsObj.capo, tabsObj.enharmonic, tabsObj.CHORDS_LEN), {}
+        blank = self.makeCells(None)
+        for c, chord in enumerate(self.getChords(bgn, end), bgn):
+            if chord is None: cells = blank
+            else:
+                name = (chord[0].name, chord[1])
+                if name not in names: names[name] = self.makeCells(chord)
+                cells = names[name]
+            self.memo[c] = ((tabsObj.tabs.col(c),) + state, cells)
+        self.log('analyse() bgn={}, end={}, {} distinct chords', bgn, end, len(names))
+
+    def getChords(self, bgn=0, end=None):
+        '''Return the chord (root note, suffix) or None of every column from index bgn to end, default the whole song, as getChord() names them.
+           The pitch class masks of all the columns are computed at once: each string is translated to its pitch classes, then to 2 bytes of note bits
+           per column, and the strings are ORed together as big ints.  Only the columns whose mask is in the table look at their notes again, with getChord().'''
+        tabsObj = self.tabsObj
+        end = len(tabsObj.tabs[0]) if end is None else end
+        lows, highs, pcs = self.getMasks(bgn, end)
+        chords, strings = [None] * len(lows), range(tabsObj.numStrings - 1, -1, -1)   # lowest string first
+        for c in range(0, len(lows)):
+            if self.table[lows[c] | highs[c] << 8] is None: continue
+            chords[c] = self.getChord([tabsObj.getNote(r + 1, tabsObj.tabs[r][bgn + c]) for r in strings if pcs[r][c]])
+        return chords
+
+    def getMasks(self, bgn, end):
+        '''Return the low bytes and the high bytes of the pitch class masks of the columns from index bgn to end, and the pitch class + 1 of each string in each column, see getPcTable().'''
+        tabsObj = self.tabsObj
+        n, masks, pcs = max(0, end - bgn), 0, []
+        lo = bytes((1 << (k - 1)) & 0xFF if k else 0 for k in range(256))      # pitch class + 1 -> low byte of the note bit
+        hi = bytes((1 << (k - 1)) >> 8 if 0 < k <= 12 else 0 for k in range(256))
+        for r in range(0, tabsObj.numStrings):
+            pc = bytes(tabsObj.tabs[r][bgn:end]).translate(self.getPcTable(r))
+            bits = bytearray(2 * n)
+            bits[0::2], bits[1::2] = pc.translate(lo), pc.translate(hi)
+            masks |= int.from_bytes(bits, 'little')
+            pcs.append(pc)
+        masks = masks.to_bytes(2 * n, 'little')
+        return masks[0::2], masks[1::2], pcs
+
+    def getArpeggios(self, line):
+        '''Return a dict of column index -> (char, style) cells of the arpeggios of the given line, the name of each arpeggio is shown in the chords section of its first column.
+           An arpeggio is a span of consecutive columns, each with notes but no chord of its own, whose notes together name a chord of at least 3 pitch classes.
+           A window of up to numStrings columns slides across the line with a running count of each pitch class, so each step adds or removes one column's notes.
+           Once the window names a chord it grows while the next column keeps it a chord, then the span is named and the window restarts after it.
+           The result is memoized for each line with the tabs of the line, the capo, the enharmonic setting, and CHORDS_LEN.'''
+        tabsObj, ntpspl = self.tabsObj, self.tabsObj.numTabsPerStringPerLine
+        bgn, end = line * ntpspl, min((line + 1) * ntpspl, len(tabsObj.tabs[0]))
+        key = (b''.join(tabsObj.tabs[r][bgn:end] for r in range(0, tabsObj.numStrings)), tabsObj.capo, tabsObj.enharmonic, tabsObj.CHORDS_LEN)
+        entry = self.arpeggios.get(line)
+        if entry is not None and entry[0] == key: return entry[1]
+        lows, highs, pcs = self.getMasks(bgn, end)
+        table, width, n, spans = self.table, tabsObj.numStrings, len(lows), []
+        counts, mask, lo, hi, named = [0] * 12, 0, 0, 0, False   # the window is the columns from lo to hi, named is True if they name a chord
+        while hi <= n:
+            m = lows[hi] | highs[hi] << 8 if hi < n else 0
+            if m == 0 or table[m] is not None or named and table[mask | m] is None or hi - lo == width:
+                if named:                                      # the window can not grow, name it and restart with column hi
+                    spans.append((lo, hi))
+                    counts, mask, lo, named = [0] * 12, 0, hi, False
+                    continue
+                if m == 0 or table[m] is not None:             # a column without notes or with a chord of its own, restart after it
+                    counts, mask, lo, hi = [0] * 12, 0, hi + 1, hi + 1
+                    continue
+                old = lows[lo] | highs[lo] << 8                # the window is full, slide it one column
+                for pc in range(0, 12):
+                    if old >> pc & 1:
+                        counts[pc] -= 1
+                        if not counts[pc]: mask &= ~(1 << pc)
+                lo += 1
+            for pc in range(0, 12):
+                if m >> pc & 1:
+                    counts[pc] += 1
+                    mask |= 1 << pc
+            hi += 1
+            named = hi - lo > 1 and table[mask] is not None and bin(mask).count('1') > 2
+        cells = {}
+        for lo, hi in spans:
+            notes = sorted((tabsObj.getNote(r + 1, tabsObj.tabs[r][bgn + c]) for r in range(0, tabsObj.numStrings) for c in range(lo, hi) if pcs[r][c]), key=lambda note: note.index)
+            cells[bgn + lo] = self.makeCells(self.getChord(notes))
+        self.arpeggios[line] = (key, cells)
+        self.log('getArpeggios({}) spans={}', line, spans)
+        return cells
+
+    def getPcTable(self, r):
+        '''Return the translate() table of string index r, tab byte -> pitch class + 1 of its note, 0 if the tab is not a fret or the capo pushes it past NUM_FRETS.'''
+        tabsObj, table = self.tabsObj, bytearray(256)
+        for fn in range(0, tabsObj.NUM_FRETS + 1 - tabsObj.getFretNum(tabsObj.capo)):
+            tab = tabsObj.getFretByte(fn)
+            table[tab] = tabsObj.getNote(r + 1, tab).index % 12 + 1
+        return bytes(table)
+
+    def getNotes(self, c):
+        '''Return the notes of the frets in column index c, lowest string first.  Frets pushed past NUM_FRETS by the capo are skipped.'''
+        tabsObj, notes = self.tabsObj, []
+        capFN = tabsObj.getFretNum(tabsObj.capo)
+        for r in range(tabsObj.numStrings - 1, -1, -1):
+            tab = tabsObj.tabs[r][c]
+            if tabsObj.isFret(chr(tab)) and tabsObj.getFretNum(tab) + capFN <= tabsObj.NUM_FRETS:
+                notes.append(tabsObj.getNote(r + 1, tab))
+        return notes
+
+    @staticmethod
+    def getMask(notes):
+        '''Return the 12 bit pitch class mask of the notes, bit 0 is C.'''
+        mask = 0
+        for note in notes:
+            mask |= 1 << (note.index % 12)
+        return mask
+
+    def getChord(self, notes):
+        '''Return (root note, chord name suffix) of the chord formed by the notes, lowest string first, or None, see findChord().  The cache key is the interval
+           structure, the semitones of the notes above the first note in order of first appearance, so the same shape in any key is one entry.
+           The cache holds the root interval and the suffix, the root note is attached here.'''
+        if not notes: return None
+        bass, seen, key = notes[0].index, set(), []
+        for note in notes:
+            i = note.index - bass
+            if i not in seen:
+                seen.add(i)
+                key.append(i)
+        key = tuple(key)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            chord = self.cache[key]
+        else:
+            self.misses += 1
+            chord = self.findChord(key)
+            self.cache[key] = chord
+            self.dirty = True
+            if len(self.cache) > self.cacheSize: self.cache.popitem(last=False)
+        if chord is None: return None
+        for note in notes:
+            if note.index - bass == chord[0]: return note, chord[1]
+
+    def findChord(self, intervals):
+        '''Return (root interval, chord name suffix) of the chord of the intervals in semitones, or None.  Each interval in turn is tried as the root,
+           the others are spelled from it, e.g. 2 semitones above the root is a 2 and 14 is a 9, and the first root whose spelled intervals are in the SPELLINGS names the chord.
+           If no root does, the pitch classes name it from the table, e.g. a 2 and a 9 together, the root is the first of the intervals that is a root in the table.'''
+        mask = 0
+        for i in intervals: mask |= 1 << (i % 12)
+        roots = self.table[mask]
+        if roots is None: return None
+        for j in intervals:
+            spelled = 0
+            for i in intervals:
+                d = i - j
+                spelled |= 1 << (self.SPELLED_BITS[d % 12] if d >= 12 else d % 12)   # the intervals below the root are spelled within an octave
+            suffix = self.spellings.get(spelled)
+            if suffix is not None: return j, suffix
+        for j in intervals:
+            if roots[j % 12] is not None: return j, roots[j % 12]
         return None
+
+    def clearCache(self):
+        '''Forget the cached chord names and the memoized cells of every column and every line.'''
+        self.cache.clear()
+        self.memo.clear()
+        self.arpeggios.clear()
+
+    @classmethod
+    def getVocabularyVersion(cls):
+        '''Return the crc32 of the INTERVAL_BITS, the VOCABULARY, and the COMPOUND intervals, a cache file saved with another vocabulary is stale.'''
+        return zlib.crc32(repr((sorted(cls.INTERVAL_BITS.items()), cls.VOCABULARY, cls.COMPOUND)).encode('ascii'))
+
+    def loadCache(self):
+        '''Load the cache saved by saveCache(), so the chords of a new session start warm.  A missing file is an empty cache, a corrupt or stale file is ignored and rebuilt.
+           Each entry is the number of intervals, the intervals and the root interval as signed bytes, and the VOCABULARY index of the suffix, 0xFF for no chord, least recently used first.'''
+        if self.cacheName is None: return
+        try:
+            with open(self.cacheName, 'rb') as inFile:
+                data = inFile.read()
+        except FileNotFoundError:
+            self.log('loadCache() no cache file {}', self.cacheName)
+            return
+        try:
+            magic, version, vocabulary, numEntries, crc = self.CACHE_HDR.unpack_from(data)
+            if magic != self.CACHE_MAGIC or version != self.CACHE_VERSION or vocabulary != self.getVocabularyVersion():
+                raise Exception('stale cache magic={}, version={}, vocabulary={:08x}'.format(magic, version, vocabulary))
+            bgn = self.CACHE_HDR.size
+            if zlib.crc32(data[bgn:]) != crc: raise Exception('bad crc32')
+            cache = collections.OrderedDict()
+            for i in range(0, numEntries):
+                n = data[bgn]
+                key, root, index = tuple(b - 256 if b > 127 else b for b in data[bgn + 1:bgn + 2 + n]), data[bgn + 1 + n], data[bgn + 2 + n]
+                key, root = key[:-1], key[-1]
+                bgn += n + 3
+                if len(key) != n or not n or key[0] != 0 or index != 0xFF and (root not in key or index >= len(self.VOCABULARY)): raise Exception('bad entry {}'.format(i))
+                cache[key] = None if index == 0xFF else (root, self.VOCABULARY[index][0])
+            if bgn != len(data): raise Exception('{:,} trailing bytes'.format(len(data) - bgn))
+        except Exception as e:
+            self.log.err('loadCache() ERROR! ignoring {}, {}', self.cacheName, e)
+            self.dirty = True                                  # rebuild the file on the next saveCache()
+            return
+        while len(cache) > self.cacheSize: cache.popitem(last=False)
+        self.cache = cache
+        self.log('loadCache() {:,} entries from {}', len(cache), self.cacheName)
+
+    def saveCache(self):
+        '''Save the cache to the cache file if it has new entries, see loadCache().  The file is written to a temporary file and renamed, so it is never left half written.'''
+        if self.cacheName is None or not self.dirty: return
+        suffixes = {suffix:i for i, (suffix, intervals) in enumerate(self.VOCABULARY)}
+        entries, numEntries = bytearray(), 0
+        for key, chord in self.cache.items():
+            if not -128 <= min(key) <= max(key) < 128: continue   # e.g. an instrument tuned over 10 octaves
+            entries.append(len(key))
+            entries += bytes(i & 0xFF for i in key)
+            entries += bytes((0xFF, 0xFF) if chord is None else (chord[0] & 0xFF, suffixes[chord[1]]))
+            numEntries += 1
+        tmpName = self.cacheName + '.tmp'
+        with open(tmpName, 'wb') as outFile:
+            outFile.write(self.CACHE_HDR.pack(self.CACHE_MAGIC, self.CACHE_VERSION, self.getVocabularyVersion(), numEntries, zlib.crc32(entries)))
+            outFile.write(entries)
+        os.replace(tmpName, self.cacheName)
+        self.dirty = False
+        self.log('saveCache() {:,} entries to {}', numEntries, self.cacheName)
+
+    def cacheInfo(self):
+        '''Return a line with the chord cache hits, misses, hit rate, and size.'''
+        n = self.hits + self.misses
+        return 'chord cache hits={:,}, misses={:,}, hit rate={:.1%}, size={:,}/{:,}'.format(self.hits, self.misses, self.hits / n if n else 0, len(self.cache), self.cacheSize)
+
+    def getChordName(self, notes):
+        '''Return the chord name e.g. Am7 of the chord formed by the notes, lowest note first, or None.'''
+        chord = self.getChord(notes)
+        return None if chord is None else chord[0].name + chord[1]
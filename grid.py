@@ -0,0 +1,74 @@
+'''grid.py module.  class list: [Grid].  One contiguous buffer for the tabs of all the strings, bulk operations are slice operations on the buffer.'''
+
+class Grid(list):
+    '''Model a strings x columns grid of bytes in one contiguous bytearray, each string is stored in a row of cap bytes.
+       The items are memoryviews of the rows, so grid[r][c] indexing and len(grid[r]) work as they do with a list of bytearrays.
+       The views are rebuilt when the grid grows, do not keep a row view across a call to resize().'''
+
+    def __init__(self, numRows, numCols, blank, data=None):
+        '''The data is the bytes of all the rows one after the other, the default is numRows rows of numCols blank bytes.'''
+        self.blank = blank                                     # byte value of new cells, e.g. ord('-') for tabs or ord('0') for htabs
+        self.numCols = numCols                                 # number of columns in each row
+        self.cap = max(1, numCols)                             # number of bytes reserved for each row, doubled when appended columns do not fit
+        self.buf = bytearray(data) if data is not None else bytearray([blank]) * (numRows * self.cap)  # rows of cap bytes, the cells past numCols are blank
+        if len(self.buf) != numRows * self.cap:
+            raise Exception('Grid() ERROR! len(data)={:,} != numRows={} * numCols={}'.format(len(self.buf), numRows, numCols))
+        self.setViews(numRows)
+
+    @classmethod
+    def fromRows(cls, rows, blank):
+        '''Return a Grid with a copy of the given rows, e.g. a list of bytearrays, all the rows must have the same length.'''
+        return cls(len(rows), len(rows[0]) if rows else 0, blank, b''.join(rows))
+
+    def setViews(self, numRows):
+        view = memoryview(self.buf)
+        self[:] = [view[r * self.cap:r * self.cap + self.numCols] for r in range(0, numRows)]
+
+    def resize(self, numCols):
+        '''Set the number of columns of every row, new cells are blank.  The capacity at least doubles when it grows, so appending a line is amortized O(line).'''
+        numRows, cap = len(self), self.cap
+        if numCols > cap:
+            self.cap = max(numCols, 2 * cap)
+            buf = bytearray([self.blank]) * (numRows * self.cap)
+            for r in range(0, numRows):
+                buf[r * self.cap:r * self.cap + self.numCols] = self.buf[r * cap:r * cap + self.numCols]
+            self.buf = buf
+        elif numCols < self.numCols:                           # the cells past numCols are blank, so only a shrink blanks cells
+            for r in range(0, numRows):
+                self.buf[r * cap + numCols:r * cap + self.numCols] = bytes([self.blank]) * (self.numCols - numCols)
+        self.numCols = numCols
+        self.setViews(numRows)
+
+    def line(self, r, line, numCols):
+        '''Return a view of the numCols cells of the given line of row r.'''
+        return self[r][line * numCols:(line + 1) * numCols]
+
+    def fill(self, value):
+        '''Set every cell to the given byte value.'''
+        self.buf[:] = bytes([value]) * len(self.buf)
+
+    def col(self, c):
+        '''Return the bytes of column c, one for each row.'''
+        return bytes(self.buf[c::self.cap])
+
+    def setCol(self, c, data):
+        '''Set column c to the given bytes, one for each row.'''
+        self.buf[c::self.cap] = data
+
+    def insert(self, c, rows=None, n=1):
+        '''Shift the cells from column c n columns right in the given rows, default all the rows, the last n cells of each row are dropped.
+           Each row is shifted with one memmove, the cells from c to c + n are unchanged until the caller overwrites them.'''
+        for r in range(0, len(self)) if rows is None else rows:
+            row = self[r]
+            row[c + n:] = row[c:max(c, len(row) - n)]
+
+    def delete(self, c, rows=None, n=1):
+        '''Shift the cells from column c + n n columns left in the given rows, default all the rows, the last n cells of each row are unchanged.'''
+        for r in range(0, len(self)) if rows is None else rows:
+            row = self[r]
+            row[c:max(c, len(row) - n)] = row[c + n:]
+
+    def tobytes(self):
+        '''Return the bytes of all the rows one after the other.'''
+        if self.cap == self.numCols: return bytes(self.buf)
+        return b''.join(self)
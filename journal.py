@@ -0,0 +1,175 @@
+'''journal.py module.  class list: [Journal].  Undo and redo the edits to the tabs by recording only the cells each edit changes.'''
+
+import collections, contextlib, functools
+
+class Journal(object):
+    '''Model the undo and redo history as a bounded list of edits.  An edit records the cursor line, string index, and column, the old and new capo, the old and new number of lines,
+       and a list of deltas in the order they were made.  A cell delta (r, c, oldTabs, newTabs, oldHTabs, newHTabs) holds the old and new bytes of the tabs and the old and new
+       harmonic flags of string r from column index c.  A shift delta (kind, r, c, n, tabs, htabs) records an INSERT edit mode shift of string r at column index c, kind is 'insert'
+       or 'delete', and only the tabs and flags shifted out of the row are kept, the last n cells for an insert of n columns or the deleted cell for a delete.'''
+
+    def __init__(self, tabsObj, maxBytes=1 << 22):
+        self.tabsObj = tabsObj
+        self.log = tabsObj.logs.channel('journal')            # the logs.Channel for this module
+        self.maxBytes = maxBytes                               # bound on the sum of the delta bytes of all the edits, the oldest edits are dropped first
+        self.numBytes = 0                                      # sum of the delta bytes of the edits in the undo and redo lists
+        self.undos = collections.deque()                       # deque of edits, the last edit is undone first
+        self.redos = []                                        # list of undone edits, cleared by the next edit
+        self.depth = 0                                         # number of nested edit() calls, e.g. cutSelectTabs() calls deleteSelectTabs() which calls deleteTabs()
+        self.saves = None                                      # list of (r, c, end, oldTabs, oldHTabs) ranges saved by the edit being recorded, the flags are ints see bits.Bits.get()
+        self.deltas = None                                     # list of the deltas of the edit being recorded, the saves become cell deltas before each shift delta, see flush()
+        self.bgnState = None                                   # (name, line, r, col, capo, numLines) when the edit being recorded began
+        self.applying = False                                  # True while undo() or redo() modify the tabs, so they are not recorded
+        self.log('Journal() maxBytes={:,}', maxBytes)
+
+    @contextlib.contextmanager
+    def edit(self, name):
+        '''Record the cells saved with save() during the with block as one edit, nested blocks are part of the outer edit.'''
+        tabsObj = self.tabsObj
+        if self.depth == 0 and not self.applying:
+            self.saves, self.deltas = [], []
+            self.bgnState = (name, tabsObj.row2Line(tabsObj.row), tabsObj.row2Index(tabsObj.row), tabsObj.col, tabsObj.capo, tabsObj.numLines)
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0 and not self.applying:
+                self.record()
+
+    def recorded(self, name, method):
+        '''Return method wrapped so each call is recorded as one edit, e.g. each user interactive command is undone as a whole.'''
+        @functools.wraps(method)
+        def recordedMethod(*args, **kwargs):
+            with self.edit(name):
+                return method(*args, **kwargs)
+        return recordedMethod
+
+    def save(self, r, c, end):
+        '''Save the tabs and harmonic flags of string r from column index c to end before the edit changes them.'''
+        if self.depth == 0 or self.applying: return
+        end = min(end, len(self.tabsObj.tabs[r]))
+        if c < end:
+            self.saves.append((r, c, end, bytes(self.tabsObj.tabs[r][c:end]), self.tabsObj.htabs.get(r, c, end)))
+
+    def saveInsert(self, r, c, n=1):
+        '''Save the tabs and harmonic flags the insert of n columns at column index c shifts out of string r, before the edit calls grid.Grid.insert().
+           The cells from c to c + n the edit then writes must be saved with save() after the shift.'''
+        if self.depth == 0 or self.applying: return
+        n = min(n, len(self.tabsObj.tabs[r]) - c)
+        if n > 0: self.saveShift('insert', r, c, n, len(self.tabsObj.tabs[r]) - n)
+
+    def saveDelete(self, r, c):
+        '''Save the tab and harmonic flag the delete of column index c shifts out of string r, before the edit calls grid.Grid.delete().'''
+        if self.depth == 0 or self.applying: return
+        if c < len(self.tabsObj.tabs[r]): self.saveShift('delete', r, c, 1, c)
+
+    def saveShift(self, kind, r, c, n, bgn):
+        self.flush()                                           # the saved ranges are compared before the shift moves their cells
+        self.deltas.append((kind, r, c, n, bytes(self.tabsObj.tabs[r][bgn:bgn + n]), self.tabsObj.htabs.get(r, bgn, bgn + n)))
+
+    def flush(self):
+        '''Compare the saved ranges with the tabs and append the ranges that changed as cell deltas.'''
+        tabsObj = self.tabsObj
+        for rr, cc, end, oldTabs, oldHTabs in self.saves:
+            newTabs, newHTabs = bytes(tabsObj.tabs[rr][cc:end]), tabsObj.htabs.get(rr, cc, end)
+            if newTabs != oldTabs or newHTabs != oldHTabs:
+                self.deltas.append((rr, cc, oldTabs, newTabs, oldHTabs, newHTabs))
+        self.saves = []
+
+    def record(self):
+        if self.saves is None: return                          # the edit was an undo or a redo
+        tabsObj = self.tabsObj
+        name, line, r, col, capo, numLines = self.bgnState
+        self.flush()
+        deltas, self.saves, self.deltas = self.deltas, None, None
+        if not deltas and capo == tabsObj.capo and numLines == tabsObj.numLines: return
+        edit = (name, line, r, col, (capo, tabsObj.capo), (numLines, tabsObj.numLines), deltas)
+        self.drop(self.redos)
+        self.redos = []
+        self.undos.append(edit)
+        self.numBytes += self.size(edit)
+        while self.numBytes > self.maxBytes and len(self.undos) > 1:
+            self.drop([self.undos.popleft()])
+        self.log('record({}) line={}, r={}, col={}, capo={}, numLines={}, {} deltas, {} undos, {:,} bytes', name, line, r, col, edit[4], edit[5], len(deltas), len(self.undos), self.numBytes)
+
+    @staticmethod
+    def size(edit):
+        '''Return the number of bytes of tabs of the deltas of the edit, the flags take 1 bit per tab.'''
+        return sum(len(d[4]) + (len(d[4]) + 7) // 8 if isinstance(d[0], str) else len(d[2]) + len(d[3]) + 2 * ((len(d[2]) + 7) // 8) for d in edit[6])
+
+    def drop(self, edits):
+        for edit in edits:
+            self.numBytes -= self.size(edit)
+
+    def undo(self):
+        if not self.undos:
+            self.tabsObj.printe('undo() nothing to undo')
+            return
+        edit = self.undos.pop()
+        self.apply(edit, undo=True)
+        self.redos.append(edit)
+
+    def redo(self):
+        if not self.redos:
+            self.tabsObj.printe('redo() nothing to redo')
+            return
+        edit = self.redos.pop()
+        self.apply(edit, undo=False)
+        self.undos.append(edit)
+
+    def apply(self, edit, undo):
+        '''Write the old bytes of the deltas in reverse order, or the new bytes in order, redraw the cells that changed, and move the cursor to where the edit was made.'''
+        tabsObj, i = self.tabsObj, 0 if undo else 1
+        name, line, r, col, capos, numLines, deltas = edit
+        self.log('apply({}, undo={}) line={}, r={}, col={}, capos={}, numLines={}, {} deltas', name, undo, line, r, col, capos, numLines, len(deltas))
+        self.applying, self.saves, self.deltas = True, None, None
+        try:
+            if undo: self.setNumLines(numLines[i])             # restore a removed line before writing its tabs
+            for delta in reversed(deltas) if undo else deltas:
+                if isinstance(delta[0], str): self.applyShift(delta, undo)
+                else:
+                    rr, cc, *data = delta
+                    tabs, htabs = data[i], data[2 + i]
+                    tabsObj.countTabs(tabsObj.tabs[rr][cc:cc + len(tabs)], -1, rr)
+                    tabsObj.tabs[rr][cc:cc + len(tabs)] = tabs
+                    tabsObj.htabs.put(rr, cc, cc + len(tabs), htabs)
+                    tabsObj.countTabs(tabs, 1, rr)
+            if not undo: self.setNumLines(numLines[i])
+        finally:
+            self.applying = False
+        line, tabsObj.capo = min(line, tabsObj.numLines - 1), capos[i]
+        if capos[0] != capos[1]: tabsObj.noteTable = None
+        if capos[0] != capos[1] or numLines[0] != numLines[1]:
+            tabsObj.printTabs()
+        else:
+            for delta in deltas:
+                if isinstance(delta[0], str): tabsObj.printTails(delta[2], [delta[1]])
+                else:                         tabsObj.printTails(delta[1], [delta[0]], delta[1] + len(delta[2]))
+        tabsObj.moveToLine(line, r, col, hi=1)
+
+    def applyShift(self, delta, undo):
+        '''Undo a shift delta with the opposite shift and write back the cells it shifted out, or redo it with the same shift, see grid.Grid.insert() and delete().'''
+        tabsObj = self.tabsObj
+        kind, r, c, n, tabs, htabs = delta
+        row, last = tabsObj.tabs[r], len(tabsObj.tabs[r]) - n
+        if (kind == 'insert') == undo:                         # shift left: undo an insert or redo a delete, the last n tabs stay in place and are also shifted left
+            tabsObj.countTabs(row[c:c + n], -1, r)
+            tabsObj.countTabs(tabs if undo else row[last:], 1, r)
+            tabsObj.tabs.delete(c, [r], n)
+            tabsObj.htabs.delete(c, [r], n)
+            if undo:
+                row[last:] = tabs
+                tabsObj.htabs.put(r, last, last + n, htabs)
+        else:                                                  # shift right: undo a delete or redo an insert, the tabs from c to c + n are now in the row twice
+            tabsObj.countTabs(row[last:], -1, r)
+            tabsObj.countTabs(tabs if undo else row[c:c + n], 1, r)
+            tabsObj.tabs.insert(c, [r], n)
+            tabsObj.htabs.insert(c, [r], n)
+            if undo:
+                row[c:c + n] = tabs
+                tabsObj.htabs.put(r, c, c + n, htabs)
+
+    def setNumLines(self, numLines):
+        while self.tabsObj.numLines < numLines: self.tabsObj.appendLine(printTabs=False)
+        while self.tabsObj.numLines > numLines: self.tabsObj.removeLine(printTabs=False)
@@ -0,0 +1,110 @@
+'''keys.py module.  class list: [Keys].  Users are encouraged to modify this module to customize key detection e.g. the key profiles'''
+
+import math, notes
+
+class Keys(object):
+    '''Model the key of the song and of each line.  A histogram of the pitch classes of the frets, one count for each note, is scored against the 24 major and minor key profiles.
+       The song histogram and its scores are updated with the fret counts on every write to the tabs, the pitch classes are counted without the capo, which only moves the tonic.'''
+
+    MAJOR = (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88)  # Krumhansl-Kessler major key profile, the weight of each pitch class above the tonic
+    MINOR = (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17)  # Krumhansl-Kessler minor key profile
+    WEIGHTS = None                                             # list of 12 lists of 24 int weights, WEIGHTS[pc][k] is the weight of pitch class pc in key k, see getWeights()
+
+    @classmethod
+    def getWeights(cls):
+        '''Return the weights, built once from the profiles.  Key k is the major key with tonic k for k < 12, else the minor key with tonic k - 12.  Each profile is centered and scaled
+           to unit length, so the key with the highest score has the highest correlation with the histogram.  The weights are scaled to ints so the running scores are exact.'''
+        if cls.WEIGHTS is None:
+            profiles = []
+            for profile in (cls.MAJOR, cls.MINOR):
+                mean = sum(profile) / 12
+                norm = math.sqrt(sum((w - mean) ** 2 for w in profile))
+                profiles.append([round(1000000 * (w - mean) / norm) for w in profile])
+            cls.WEIGHTS = [[profiles[k // 12][(pc - k) % 12] for k in range(0, 24)] for pc in range(0, 12)]
+        return cls.WEIGHTS
+
+    def __init__(self, tabsObj):
+        self.tabsObj = tabsObj
+        self.log = tabsObj.logs.channel('keys')               # the logs.Channel for this module
+        self.weights = self.getWeights()                       # the weights shared by all the Keys objects
+        self.pcTables = None                                   # list of translate() tables of each string index, see getPcTables(), reset when the tuning changes
+        self.counts = [0] * 12                                 # number of frets in the song with each pitch class, without the capo
+        self.scores = [0] * 24                                 # score of each key for the counts, updated with the counts
+        self.lines = {}                                        # dict of line index -> (pitch classes, counts, scores) of each line the status row showed, see getLineScores()
+
+    def getPcTables(self):
+        '''Return the translate() table of each string index, tab byte -> pitch class + 1 of its note without the capo, 0 if the tab is not a fret.'''
+        if self.pcTables is None:
+            tabsObj, self.pcTables = self.tabsObj, []
+            for r in range(0, tabsObj.numStrings):
+                table = bytearray(256)
+                for fn in range(0, tabsObj.NUM_FRETS + 1):
+                    table[tabsObj.getFretByte(fn)] = tabsObj.getNoteIndex(r + 1, fn) % 12 + 1
+                self.pcTables.append(bytes(table))
+        return self.pcTables
+
+    def reset(self):
+        '''Forget the pitch classes of the old tuning, countAll() recounts the tabs.'''
+        self.pcTables = None
+        self.lines.clear()
+
+    @staticmethod
+    def histogram(pcs):
+        '''Return the number of each pitch class in the given bytes of pitch class + 1 values.'''
+        return [pcs.count(pc + 1) for pc in range(0, 12)]
+
+    def countAll(self):
+        '''Count the pitch classes of all the tabs from scratch, e.g. after reading the tabs.'''
+        tables = self.getPcTables()
+        self.counts, self.scores = [0] * 12, [0] * 24
+        for r in range(0, self.tabsObj.numStrings):
+            self.add(self.histogram(bytes(self.tabsObj.tabs[r]).translate(tables[r])))
+        self.log('countAll() counts={}', self.counts)
+
+    def countTabs(self, tabs, n=1, r=None):
+        '''Add n to the counts for each fret in the given tabs of string index r, or in the given column of tabs, one for each string, if r is None.'''
+        tables = self.getPcTables()
+        if r is None: self.add(self.histogram(bytes(tables[i][tab] for i, tab in enumerate(tabs))), n)
+        else:         self.add(self.histogram(bytes(tabs).translate(tables[r])), n)
+
+    def countTab(self, r, tab, n=1):
+        '''Add n to the count of the given tab byte of string index r, see countTabs().'''
+        pc = self.getPcTables()[r][tab] - 1
+        if pc >= 0:
+            self.counts[pc] += n
+            w, scores = self.weights[pc], self.scores
+            for k in range(0, 24): scores[k] += n * w[k]
+
+    def add(self, counts, n=1):
+        for pc in range(0, 12):
+            if counts[pc]:
+                m, w, scores = n * counts[pc], self.weights[pc], self.scores
+                self.counts[pc] += m
+                for k in range(0, 24): scores[k] += m * w[k]
+
+    def getLineScores(self, line):
+        '''Return the counts and the scores of the given line, memoized with the tabs of the line.  Inserts and deletes shift the tabs of every later line, so the line is counted when it is shown.'''
+        tabsObj, tables, ntpspl = self.tabsObj, self.getPcTables(), self.tabsObj.numTabsPerStringPerLine
+        pcs = b''.join(bytes(tabsObj.tabs[r][line * ntpspl:(line + 1) * ntpspl]).translate(tables[r]) for r in range(0, tabsObj.numStrings))
+        entry = self.lines.get(line)
+        if entry is not None and entry[0] == pcs: return entry[1], entry[2]
+        counts, old = self.histogram(pcs), entry[1] if entry is not None else [0] * 12
+        scores = list(entry[2]) if entry is not None else [0] * 24
+        for pc in range(0, 12):                                # only the pitch classes the edits changed
+            if counts[pc] != old[pc]:
+                m, w = counts[pc] - old[pc], self.weights[pc]
+                for k in range(0, 24): scores[k] += m * w[k]
+        self.lines[line] = (pcs, counts, scores)
+        return counts, scores
+
+    def getKey(self, counts, scores):
+        '''Return the name of the key with the highest score e.g. G major or E minor, the tonic includes the capo, or None if there are no frets.'''
+        if not any(counts): return None
+        k = scores.index(max(scores))
+        tonic = notes.Note.get((k + self.tabsObj.getFretNum(self.tabsObj.capo)) % 12, self.tabsObj.enharmonic)
+        return tonic.name + (' major' if k < 12 else ' minor')
+
+    def getInfo(self):
+        '''Return the key of the song and the key of the cursor line for the status row.'''
+        line = self.tabsObj.row2Line(self.tabsObj.row)
+        return 'key={} line={}'.format(self.getKey(self.counts, self.scores), self.getKey(*self.getLineScores(line)) if line >= 0 else None)
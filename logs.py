@@ -0,0 +1,97 @@
+'''logs.py module.  class list: [Log, Channel].  Leveled debug logging, messages are only formatted when their level is enabled for their module.'''
+
+import collections
+
+class Log(object):
+    '''Model the debug log shared by all the modules.  Each module writes through its own Channel so its level can be switched independently.
+       Messages go to the debug file, which is only created by the first message, or to an in-memory ring buffer that is dumped to the debug file on error.'''
+
+    LEVELS = { 'OFF':0, 'ERROR':1, 'INFO':2, 'DEBUG':3 }
+
+    def __init__(self, name, level=0, ringLen=0):
+        self.name = name                                       # name of the debug file
+        self.file = None                                       # the debug file, opened by the first message written to it
+        self.level = level                                     # level of the modules without their own level
+        self.levels = {}                                       # dict of module name -> level; per module switches
+        self.channels = {}                                     # dict of module name -> Channel
+        self.ring = None                                       # deque of formatted messages, the last ringLen messages, None when writing to the file
+        self.setRingLen(ringLen)
+
+    def channel(self, module):
+        '''Return the Channel for the given module name, creating it on first use.'''
+        if module not in self.channels:
+            self.channels[module] = Channel(self, module)
+        return self.channels[module]
+
+    def getLevel(self, module):
+        return self.levels.get(module, self.level)
+
+    def setLevel(self, level, module=None):
+        '''Set the level of the given module, or the level of all the modules without their own level.  The level is a number or a LEVELS name.'''
+        if isinstance(level, str): level = self.LEVELS[level.upper()] if level.upper() in self.LEVELS else int(level)
+        if module is None: self.level = level
+        else:              self.levels[module] = level
+        for c in self.channels.values():
+            c.level = self.getLevel(c.module)
+
+    def setRingLen(self, ringLen):
+        '''Keep the last ringLen messages in memory instead of writing them to the debug file, 0 writes them to the debug file.'''
+        self.ring = collections.deque(maxlen=ringLen) if ringLen > 0 else None
+
+    def emit(self, fmt, args):
+        self.write(self.format(fmt, args))                     # formatted now even in the ring, the args may change before dump()
+
+    @staticmethod
+    def format(fmt, args):
+        '''Format a message and end it with a newline, a message without args is written as is.'''
+        return (fmt.format(*args) if args else fmt) + '\n'
+
+    def write(self, text):
+        if self.ring is not None:
+            self.ring.append(text)
+            return
+        if self.file is None: self.file = open(self.name, 'w')
+        self.file.write(text)
+
+    def dump(self, reason=''):
+        '''Write the messages in the ring buffer to the debug file, e.g. on error.'''
+        if not self.ring: return
+        ring, self.ring = self.ring, None
+        self.write('dump({}) last {} messages:\n'.format(reason, len(ring)))
+        for text in ring:
+            self.write(text)
+        self.ring = collections.deque(maxlen=ring.maxlen)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class Channel(object):
+    '''A module's view of the Log.  Call it with a format string and its arguments, the arguments are only formatted if the module level is enabled.
+       A Channel is also file-like, print(..., file=channel) writes only when DEBUG is enabled, guard multi-part messages with on().'''
+
+    def __init__(self, log, module):
+        self.log = log
+        self.module = module
+        self.level = log.getLevel(module)
+
+    def on(self, level=3):
+        return self.level >= level
+
+    def __call__(self, fmt, *args):
+        if self.level >= 3: self.log.emit(fmt, args)
+
+    def info(self, fmt, *args):
+        if self.level >= 2: self.log.emit(fmt, args)
+
+    def err(self, fmt, *args):
+        if self.level >= 1: self.log.emit(fmt, args)
+
+    def write(self, text):
+        if self.level >= 3: self.log.write(text)
+        return len(text)
+
+    def flush(self):
+        pass
@@ -1,7 +1,9 @@
 '''notes.py module.  class list: [Note].'''
             
 class Note(object):
-    '''Model a musical note played on a stringed instrument.'''
+    '''Model a musical note played on a stringed instrument.  Notes are immutable and interned, use Note.get() to share one instance for each index and spelling.'''
+
+    __slots__ = ('_index', '_name', '_octave', '_freq', '_waveLen', '_physProps')
     
     S_TONES = { 0:'C', 1:'C#', 2:'D', 3:'D#', 4:'E', 5:'F', 6:'F#', 7:'G', 8:'G#', 9:'A', 10:'A#', 11:'B' }
     F_TONES = { 0:'C', 1:'Db', 2:'D', 3:'Eb', 4:'E', 5:'F', 6:'Gb', 7:'G', 8:'Ab', 9:'A', 10:'Bb', 11:'B' }
@@ -16,13 +18,28 @@ class Note(object):
                 'C7':84, 'C#7':85, 'Db7':85, 'D7':86, 'D#7':87, 'Eb7':87, 'E7':88, 'F7':89, 'F#7':90, 'Gb7':90, 'G7':91, 'G#7':92, 'Ab7':92, 'A7':93, 'A#7':94, 'Bb7':94, 'B7':95, 
                 'C8':96 } # For simplicity omit double flats and double sharps and other redundant enharmonic note names e.g. Abb, C##, Cb, B#, Fb, E#
 
+    INTERNED = {}                                              # dict of (index, flats) -> the shared Note, see get()
+
+    @classmethod
+    def get(cls, index, flats=None):
+        '''Return the shared note with the given index, spelled with flats if flats is true else with sharps.'''
+        key = (index, 1 if flats else 0)
+        note = cls.INTERNED.get(key)
+        if note is None:
+            note = cls.INTERNED[key] = cls(index, flats)
+        return note
+
     def __init__(self, index, flats=None):
-        '''The index identifies the note value, the name is looked up using the TONES dictionary.'''
+        '''The index identifies the note value, the name is looked up using the TONES dictionary.  The physical properties are computed once here.'''
         self._index = index
-        if flats is None or flats is 0:
+        if not flats:
             self._name = self.S_TONES[index % len(self.S_TONES)]
         else:
             self._name = self.F_TONES[index % len(self.F_TONES)]
+        self._octave = index // len(self.S_TONES)              # Essentially the same as the piano octave number
+        self._freq = 440.0 * pow(2, (index - self.INDICES['A4']) / 12)
+        self._waveLen = 343 / self._freq
+        self._physProps = 'freq={:03.2f} {}, waveLen={:04.3f} {}'.format(self._freq, 'Hz', self._waveLen, 'm')
         
     @property
     def index(self):
@@ -32,34 +49,24 @@ class Note(object):
     def name(self):
         return self._name
         
-    @index.setter
-    def index(self, index):
-        self._index = index
-
-    @name.setter
-    def name(self, name):
-        self._name = name
-        
     def getOctaveNum(self):
-        return int(self.index / len(self.S_TONES)) # Essentially the same as the piano octave number
+        return self._octave
 
     def getPhysProps(self):
-        freq, freqUnit = self.getFreqInfo()
-        waveLen, waveLenUnit = self.getWaveLenInfo(freq)
-        return 'freq={:03.2f} {}, waveLen={:04.3f} {}'.format(freq, freqUnit, waveLen, waveLenUnit)
+        return self._physProps
         
     def getFreqInfo(self):
-        return self.getFreq(), 'Hz'
+        return self._freq, 'Hz'
 
     def getFreq(self):
-        return 440.0 * pow(pow(2, 1/12), self.index - self.INDICES['A4'])
+        return self._freq
     
     def getWaveLenInfo(self, freq=None):
-        if freq is None: return 343 / self.getFreq(), 'm'
+        if freq is None: return self._waveLen, 'm'
         else:            return 343 / freq, 'm'
             
     def getWaveLen(self, freq=None):
-        if freq is None: return 343 / self.getFreq()
+        if freq is None: return self._waveLen
         else:            return 343 / freq
 
 #    def getPianoIndex(self):
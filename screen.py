@@ -0,0 +1,152 @@
+'''screen.py module.  class list: [Screen, Writer].'''
+
+import os, sys
+
+class Screen(object):
+    '''Model the console display as a 2D array of (char, style) cells.  A frame draws into the model and then writes only the cells that changed since the last frame.'''
+
+    BLANK_STYLE = '0m'                                         # style used to blank a cell that was drawn in the last frame but not in the current one
+
+    def __init__(self, tabsObj):
+        self.tabsObj = tabsObj
+        self.log = tabsObj.logs.channel('screen')              # the logs.Channel for this module
+        self.numRows = 0                                       # number of console rows in the model, the status row is not modelled
+        self.numCols = 0                                       # number of console cols in the model
+        self.cells = []                                        # list of rows, one list of (char, style) cells per row; the frame being drawn, None denotes a blank cell
+        self.shown = []                                        # list of rows, one list of (char, style) cells per row; what the console currently displays
+        self.inFrame = False                                   # cells are only modelled while drawing a frame, otherwise changed cells are appended to the pending output
+        self.valid = False                                     # False when the console contents are unknown, e.g. after clearing the screen to display the help info
+        self.out = []                                          # pending escape sequences and text, written to the console by flush()
+        self.outRow, self.outCol = None, None                  # console cursor position implied by the pending output, None when unknown
+        self.outStyle = None                                   # console style implied by the pending output, None when unknown
+        self.numBytes = 0                                      # total number of bytes written to the console, inspect to measure the cost of the output
+        self.numWrites = 0                                     # total number of writes to the console
+        self.log('Screen() tabsObj={}', tabsObj)
+
+    def invalidate(self):
+        '''Forget what the console displays, the next frame clears the screen and draws every cell.'''
+        self.valid = False
+
+    def isShown(self, numRows, numCols):
+        '''Return True if the console displays a frame of the given size, so a frame can keep it and redraw only part of the screen.'''
+        return self.valid and numRows == self.numRows and numCols == self.numCols
+
+    def bgnFrame(self, numRows, numCols, keep=False):
+        '''Start drawing a new frame of the given size into an empty model, or into a copy of what the console displays if keep is True.  Clear the screen if the size changed or the console contents are unknown.'''
+        if not self.isShown(numRows, numCols):
+            self.log('bgnFrame({}, {}) valid={}, old size=({}, {}) clearing screen', numRows, numCols, self.valid, self.numRows, self.numCols)
+            self.numRows, self.numCols = numRows, numCols
+            self.shown = [[None] * numCols for r in range(0, numRows)]
+            self.tabsObj.clearScreen()
+            self.valid = True
+        if keep: self.cells = [list(row) for row in self.shown]
+        else:    self.cells = [[None] * numCols for r in range(0, numRows)]
+        self.inFrame = True
+
+    def endFrame(self):
+        '''Compare the frame with what the console displays and write only the cells that differ, blanking the cells that are no longer drawn.'''
+        count, numBytes = 0, self.numBytes
+        for r in range(0, self.numRows):
+            cells, shown = self.cells[r], self.shown[r]
+            if cells == shown: continue
+            for c in range(0, self.numCols):
+                if cells[c] != shown[c]:
+                    ch, style = cells[c] or (' ', self.BLANK_STYLE)
+                    self.emit(r + 1, c + 1, ch, style)
+                    count += 1
+        self.shown, self.cells, self.inFrame = self.cells, [], False
+        self.flush()
+        self.log('endFrame() size=({}, {}) wrote {} changed cells in {} bytes', self.numRows, self.numCols, count, self.numBytes - numBytes)
+
+    def put(self, row, col, text, style):
+        '''Draw text at the given 1 based row and col.  In a frame only the model is updated, otherwise the cells that differ from the console are appended to the pending output,
+           which the screen.Writer writes once per command, see Writer.write().  Cells outside the model are dropped.'''
+        r = row - 1
+        for i in range(0, len(text)):
+            c, cell = col - 1 + i, (text[i], style)
+            if self.valid:
+                if not (0 <= r < self.numRows and 0 <= c < self.numCols): continue    # e.g. a cell on a line scrolled out of the viewport
+                if self.inFrame:
+                    self.cells[r][c] = cell
+                    continue
+                if self.shown[r][c] == cell: continue
+                self.shown[r][c] = cell
+            self.emit(row, col + i, text[i], style)
+        if self.tabsObj.writerObj.stream is None: self.flush() # not buffering a command, e.g. while starting up
+
+    def emit(self, row, col, text, style):
+        '''Append text at the given 1 based row and col to the pending output.  The cursor move and the style change are dropped when the previous text already left the console in that state, so runs of same style text are written as one string.'''
+        CSI = self.tabsObj.CSI
+        if style != self.outStyle:
+            self.out.append(CSI + style)
+            self.outStyle = style
+        if row != self.outRow or col != self.outCol:
+            self.out.append(CSI + '{};{}H'.format(row, col))
+            self.outRow = row
+        self.out.append(text)
+        self.outCol = col + len(text)
+
+    def flush(self):
+        '''Write the pending output to the console in one call.  Other output and the automatic style reset after each write are not tracked, so the cursor and style are unknown afterwards.'''
+        if self.out:
+            data, self.out = ''.join(self.out), []
+            print(data, end='')
+            self.numBytes += len(data.encode())
+            self.numWrites += 1
+        self.outRow, self.outCol, self.outStyle = None, None, None
+
+class Writer(object):
+    '''Buffer the console output of a user interactive command in memory and write it to the console in one call when the command finishes.
+       The pending output of the screen.Screen is written first whenever other output is buffered or flushed, so the console sees the output in order.'''
+
+    RESET = '\033[0m'                                          # appended after each write that may change the style, as colorama.init(autoreset=True) does
+
+    def __init__(self, tabsObj):
+        self.tabsObj = tabsObj
+        self.log = tabsObj.logs.channel('screen')              # the logs.Channel for this module
+        self.stream = None                                     # the console stream replaced by the Writer while buffering, None when not buffering
+        self.buf = []                                          # the buffered output strings
+        self.numFlushes = 0                                    # total number of writes to the console
+        self.numBytes = 0                                      # total number of bytes buffered for the console
+        self.log('Writer() tabsObj={}', tabsObj)
+
+    def bgn(self):
+        '''Start buffering, all output to sys.stdout is kept in memory until flush() or end().'''
+        if self.stream is None:
+            self.stream, sys.stdout = sys.stdout, self
+
+    def end(self):
+        '''Stop buffering and write the buffered output to the console.'''
+        if self.stream is not None:
+            self.flush()
+            sys.stdout, self.stream = self.stream, None
+
+    def write(self, text):
+        if self.tabsObj.screenObj.out: self.tabsObj.screenObj.flush()
+        if text:
+            self.buf.append(text)
+            self.numBytes += len(text.encode())
+            if '\033' in text:
+                self.buf.append(self.RESET)
+                self.numBytes += len(self.RESET)
+        return len(text)
+
+    def flush(self):
+        '''Write the buffered output to the console in one call, e.g. before waiting for user input.  On Windows the output is written through the colorama stream
+        so the escape sequences can be converted, else it is written to the console file descriptor with os.write().'''
+        if self.stream is None: return
+        self.tabsObj.screenObj.flush()
+        if not self.buf: return
+        data, self.buf = ''.join(self.buf), []
+        self.numFlushes += 1
+        if os.name == 'nt' or not self.stream.isatty():
+            self.stream.write(data)
+            self.stream.flush()
+            return
+        self.stream.flush()
+        fd, data = self.stream.fileno(), data.encode(self.stream.encoding or 'utf-8', 'replace')
+        while data:
+            data = data[os.write(fd, data):]
+
+    def isatty(self):
+        return self.stream is not None and self.stream.isatty()
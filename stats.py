@@ -0,0 +1,57 @@
+'''stats.py module.  class list: [Stats].'''
+
+import functools, random, time
+
+class Stats(object):
+    '''Measure the latency and the console output of each user interactive command.  The count, total, and max latency of each command are running counters,
+       the percentiles are taken from a bounded reservoir sample of the latencies, so a long session keeps a fixed amount of memory per command.'''
+
+    def __init__(self, tabsObj, sampleSize=1000):
+        self.tabsObj = tabsObj
+        self.log = tabsObj.logs.channel('stats')              # the logs.Channel for this module
+        self.sampleSize = sampleSize                           # bound on the number of latencies kept for each command
+        self.counts = {}                                       # dict of uiCmds key -> number of calls
+        self.totals = {}                                       # dict of uiCmds key -> total latency in seconds
+        self.maxes = {}                                        # dict of uiCmds key -> max latency in seconds
+        self.samples = {}                                      # dict of uiCmds key -> list of at most sampleSize latencies in seconds, a uniform sample of all the calls
+        self.numBytes = {}                                     # dict of uiCmds key -> total bytes written to the console
+        self.rand = random.Random(0)                           # picks the latencies replaced in the samples
+
+    def timed(self, key, method):
+        '''Return method wrapped so each call is recorded under the given uiCmds key.  The bytes are counted as the screen.Writer buffers them.'''
+        @functools.wraps(method)
+        def timedMethod(*args, **kwargs):
+            writerObj = self.tabsObj.writerObj
+            t0, n0 = time.perf_counter(), writerObj.numBytes
+            try:     return method(*args, **kwargs)
+            finally: self.record(key, time.perf_counter() - t0, writerObj.numBytes - n0)
+        return timedMethod
+
+    def record(self, key, secs, numBytes):
+        '''Count a call, each call is kept in the sample with probability sampleSize / count (reservoir sampling).'''
+        if key not in self.counts:
+            self.counts[key], self.totals[key], self.maxes[key], self.samples[key], self.numBytes[key] = 0, 0.0, 0.0, [], 0
+        self.counts[key] += 1
+        self.totals[key] += secs
+        self.maxes[key] = max(self.maxes[key], secs)
+        self.numBytes[key] += numBytes
+        sample = self.samples[key]
+        if len(sample) < self.sampleSize: sample.append(secs)
+        else:
+            i = self.rand.randrange(self.counts[key])
+            if i < self.sampleSize: sample[i] = secs
+        self.log('record({}) {:.3f}ms {} bytes', key, secs * 1000, numBytes)
+
+    @staticmethod
+    def percentile(times, p):
+        '''Nearest rank percentile of the sorted list times.'''
+        return times[min(len(times) - 1, int(p * len(times)))]
+
+    def summary(self):
+        '''Return a list of lines with the count, total, p50, p99, and max latency, and the bytes written per command, slowest total first.'''
+        lines = ['{:>20} {:>7} {:>10} {:>9} {:>9} {:>9} {:>11} {:>9}'.format('Cmd', 'count', 'total ms', 'p50 ms', 'p99 ms', 'max ms', 'bytes', 'bytes/cmd')]
+        for key in sorted(self.counts, key=lambda k: self.totals[k], reverse=True):
+            times, count, numBytes = sorted(self.samples[key]), self.counts[key], self.numBytes[key]
+            lines.append('{:>20} {:>7} {:>10.3f} {:>9.3f} {:>9.3f} {:>9.3f} {:>11,} {:>9,}'.format(key, count, self.totals[key] * 1000, self.percentile(times, 0.5) * 1000,
+                         self.percentile(times, 0.99) * 1000, self.maxes[key] * 1000, numBytes, numBytes // count))
+        return lines
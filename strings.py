@@ -20,28 +20,28 @@ class Strings(object):
         self.ALIASES['VIOLA']                     = ['C3G3D4A4']
         self.ALIASES['VIOLIN']                    = ['G3D4A4E5']
     
-    def __init__(self, dbgFile, spelling=None, alias=None):
+    def __init__(self, log, spelling=None, alias=None):
         '''The alias argument overrides the spelling argument.  e.g. alias=['GUITAR'] -> strings=['E2A2D3G3B3E4'] represents a standard 6 string guitar tuning.'''
-        self.dbgFile = dbgFile
+        self.log = log                                         # the logs.Channel for this module
         self._map = {}
         self._keys = []
         if alias: alias = alias[0].upper()
         self._initAliases()
-        print('Strings() alias={}, spelling={}'.format(alias, spelling), file=self.dbgFile)
+        self.log('Strings() alias={}, spelling={}', alias, spelling)
         if not spelling and not alias:
             alias = 'GUITAR'
             spelling = self.ALIASES[alias]
-            print('Strings() no alias and no spelling, using defaluts: alias={}, spelling={}'.format(alias, spelling), file=self.dbgFile)
+            self.log('Strings() no alias and no spelling, using defaluts: alias={}, spelling={}', alias, spelling)
         elif alias and alias in self.ALIASES: 
             spelling = self.ALIASES[alias]
-            print('Strings() using valid alias={}, and its looked up spelling={}'.format(alias, spelling), file=self.dbgFile)
+            self.log('Strings() using valid alias={}, and its looked up spelling={}', alias, spelling)
         elif alias and spelling: 
-            print('Strings() Ignoring invalid alias={}, using valid spelling={}'.format(alias, spelling), file=self.dbgFile)
+            self.log('Strings() Ignoring invalid alias={}, using valid spelling={}', alias, spelling)
         elif alias:
-            print('Strings() ERROR! invalid alias={} and no spelling={}'.format(alias, spelling), file=self.dbgFile)
+            self.log.err('Strings() ERROR! invalid alias={} and no spelling={}', alias, spelling)
             raise Exception('Strings() ERROR! invalid alias={} and no spelling={}'.format(alias, spelling))
         if spelling:
-            print('Strings() spelling={}'.format(spelling), file=self.dbgFile)
+            self.log('Strings() spelling={}', spelling)
             self._parseSpelling(spelling)
 
     @property
@@ -66,37 +66,38 @@ class Strings(object):
         '''Parse string spelling into map of note name -> note index.'''
         if len(spelling) != 1:
             errorMsg = 'Strings.parseSpelling() invalid raw spelling len(spelling)={} expected len(spelling)=1, spelling={}'.format(len(spelling), spelling)
-            print(errorMsg, file=self.dbgFile)
+            self.log.err(errorMsg)
             print(errorMsg)
             raise Exception(errorMsg)
-        print('Strings.parseSpelling(list) spelling={} len(spelling)={}'.format(spelling, len(spelling)), file=self.dbgFile)
+        self.log('Strings.parseSpelling(list) spelling={} len(spelling)={}', spelling, len(spelling))
         self.spelling = str(spelling[0]).upper()
-        print('Strings.parseSpelling(strg) spelling={} len(spelling)={}'.format(self.spelling, len(self.spelling)), file=self.dbgFile)
+        self.log('Strings.parseSpelling(strg) spelling={} len(spelling)={}', self.spelling, len(self.spelling))
         for i in range(0, len(self.spelling)):
-            print('Strings.parseSpelling({}) {}'.format(i, self.spelling[i]), file=self.dbgFile)
+            self.log('Strings.parseSpelling({}) {}', i, self.spelling[i])
             if ord(self.spelling[i]) in range(ord('A'), ord('G') + 1) and self.spelling[i+1].isdecimal():
                 key = self.spelling[i:i+2]
             elif ord(self.spelling[i]) in range(ord('A'), ord('G') + 1) and self.spelling[i+1] in ('#', 'B') and self.spelling[i+2].isdecimal():
                 if self.spelling[i+1] == 'B': 
                     self.spelling = self.spelling[:i+1] + self.spelling[i+1].lower() + self.spelling[i+2:]
                 key = self.spelling[i:i+3]
-                print('Strings.parseSpelling({}) enharmonic string key {}'.format(i, key), file=self.dbgFile)
+                self.log('Strings.parseSpelling({}) enharmonic string key {}', i, key)
             if key:
-                print('Strings.parseSpelling({}) current key={}, current map={}'.format(i, key, self.map), file=self.dbgFile)
+                self.log('Strings.parseSpelling({}) current key={}, current map={}', i, key, self.map)
                 if key not in notes.Note.INDICES:
                     errorMsg = 'Strings.parseSpelling({}) invalid key={}, extracted from spelling={}'.format(i, key, spelling)
-                    print(errorMsg, file=self.dbgFile)
+                    self.log.err(errorMsg)
                     print(errorMsg)
                     raise Exception(errorMsg)
                 self.map[key] = notes.Note.INDICES[key]
-                print('Strings.parseSpelling({}) appending {}:{} to map={}'.format(i, key, self.map[key], self.map), file=self.dbgFile)
+                self.log('Strings.parseSpelling({}) appending {}:{} to map={}', i, key, self.map[key], self.map)
         self._keys = sorted(self.map, key=self._mapKeyFunc, reverse=False)
-        print('Strings.parseSpelling() map={}'.format(self.map), file=self.dbgFile)
-        print('Strings.parseSpelling() keys={}'.format(self.keys), file=self.dbgFile)
-        print('Strings.parseSpelling() sorted map: {', end='', file=self.dbgFile)
-        for k in self.keys:
-            print(' {}:{}'.format(k, self.map[k]), end='', file=self.dbgFile)
-        print(' }', file=self.dbgFile)
+        self.log('Strings.parseSpelling() map={}', self.map)
+        self.log('Strings.parseSpelling() keys={}', self.keys)
+        if self.log.on():
+            print('Strings.parseSpelling() sorted map: {', end='', file=self.log)
+            for k in self.keys:
+                print(' {}:{}'.format(k, self.map[k]), end='', file=self.log)
+            self.log(' }')
         
     def _mapKeyFunc(self, inKey):
         '''Internal method for sorting the map keys in ascending order.'''
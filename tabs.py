@@ -3,7 +3,7 @@
 '''Thus all methods are essentially private.  Note some functionality is deemed customizable by the user and is thus factored out into a separate module.  
 e.g. The tab modifications are in mods.py, the string tunings and aliases are in strings.py, and the chord discovery and name calculations are in chords.py.'''
 
-import os, inspect, sys
+import os, inspect, re, shutil, struct, sys
 
 impFile = open('tabs_imp.log', 'w')
 
@@ -47,17 +47,29 @@ else:
     impFile.flush()
 
 import colorama
+import bits
 import cmdArgs
 import chords
+import grid
+import journal
+import keys
+import logs
 import mods
 import notes
+import screen
+import stats
 import strings
+import voicings
 
 class Tabs(object):
     '''Model musical tab notation and tab editor functionality.'''
     ESC = '\033'
     CSI = '\033\133'
     QUIT_STR = 'Received Quit Cmd: Exiting'
+    TAB_CELL = re.compile(rb'\033\[([\d;]*)m\033\[(\d+);(\d+)H(.)', re.DOTALL)  # 'CSI style CSI row;colH tab' as written by prints()
+    NATIVE_MAGIC = b'TABS'                                     # leading bytes of a native format file, ANSI files start with ESC
+    NATIVE_VERSION = 2                                         # version 2 packs the harmonic flags 8 cells per byte, version 1 files with one '0' or '1' byte per cell are still read
+    NATIVE_HDR = struct.Struct('<4sBBIIH')                     # magic, version, capo, numTabsPerStringPerLine, numLines, len(spelling)
     
     def __init__(self, inName='tabs.tab', outName='tabs.tab', dbgName='dbg.tab'):
         '''Initialize the Tabs object and start the interactive loop method.  The inName and outName can be the same or different.'''
@@ -69,23 +81,31 @@ class Tabs(object):
         colorama.init(autoreset=True)
         self.clearScreen()
         
+        argMap = {}
+        cmdArgs.parseCmdLine(argMap)
         self.initFiles(inName, outName, dbgName)
+        self.initLogs(argMap)
+        self.log('tabs.py args={}', argMap)
         self.initConsts()
+        self.statsObj = stats.Stats(self)                      # the stats.Stats instance, measures the latency and output of each user interactive command
+        self.keysObj = keys.Keys(self)                         # the keys.Keys instance, counts the pitch classes of the tabs to show the key in the status row
+        self.journalObj = journal.Journal(self, *[int(a) for a in argMap.get('j', [])[:1]])  # the journal.Journal instance, records each user interactive command for undo and redo
         self.registerUiCmds()                                  # register the dictionary for all the user interactive commands
         self.mods = {}                                         # dict of tab modification characters -> contextual descriptions 
         self.dbgMove = True                                    # used for finding bugs in basic movement functionality
         self.capo = ord('0')                                   # essentially added to every tab that is a fret, written to the outFile and read from the inFile
-        self.maxFret = ord('0')                                # update in setTab() and readTabs()
         self.chordsObj = None                                  # the chords.Chords instance
+        self.voicingsObj = None                                # the voicings.Voicings instance, created by the first insertVoicing()
+        self.screenObj = screen.Screen(self)                   # the screen.Screen instance, models the console cells so printTabs() only writes what changed
+        self.writerObj = screen.Writer(self)                   # the screen.Writer instance, buffers the output of each user interactive command
         
-        self.htabs = []                                        # list of bytearrays, one for each string; for harmonic tabs
-        self.tabCount = 0                                      # used by appendTabs() 
-        self.tabs = []                                         # list of bytearrays, one for each string; for all the tabs
+        self.htabs = bits.Bits(0, 0)                           # bits.Bits, one row of flags for each string; for harmonic tabs
+        self.tabs = grid.Grid(0, 0, ord('-'))                  # grid.Grid, one row of bytes for each string; for all the tabs
         
         self.arpeggiate = 0                                    # used to transform chords to arpeggios
         self.selectFlag = 0                                    # used to un-hilite selected rows
         self.selectTabs = []                                   # list of bytearrays, one for each string; for selected tabs
-        self.selectHTabs = []                                  # list of bytearrays, one for each string; for selected tabs
+        self.selectHTabs = []                                  # bits.Bits set by copySelectTabs(), one row of flags for each selected string; for selected tabs
         self.selectRows = []                                   # list of row    indices, one for each selected row;    for selected rows
         self.selectCols = []                                   # list of column indices, one for each selected column; for selected columns
         self.stringMap = {}                                    # dict of string note name -> note index
@@ -93,6 +113,8 @@ class Tabs(object):
         self.numStrings = 1                                    # number of strings on the musical instrument, set here in case initStrings() fails
         
         self.numLines = 1                                      # number of music lines to display
+        self.topLine = 0                                       # index of the first music line displayed in the console, the viewport scrolls a page at a time
+        self.numViewLines = 1                                  # number of music lines displayed in the console, set by setLastRow() to fit the console height
         self.numTabsPerStringPerLine = 10                      # number of tabs to display on each line (for each string)
         self.numTabsPerString = self.numLines * self.numTabsPerStringPerLine  # total number of tabs per string
         
@@ -101,6 +123,7 @@ class Tabs(object):
         self.CHORDS_LEN = 0                                    # number of rows used to display chords on a given line
         self.NOTES_LEN = 0                                     # number of rows used to display notes  on a given line
         self.NUM_FRETS = 24                                    # number of frets, (might make this a list for all the strings)?
+        self.fretCounts = [0] * (self.NUM_FRETS + 1)           # number of tabs with each fret number, updated on every write to tabs so maxFret is O(1)
         
         self.hiliteCount = 0                                   # statistic for measuring efficiency
         self.hiliteColNum = 0                                  # used to hilite the current cursor column and unhilite the previous cursor column
@@ -117,15 +140,16 @@ class Tabs(object):
         self.displayChords = self.DISPLAY_CHORDS['DISABLED']   # enable or disable the display of the chords section for each line
         self.cursorDir = self.CURSOR_DIRS['DOWN']              # affects the automatic cursor movement (up/down) when entering a tab in chord or arpeggio mode
         self.enharmonic = self.ENHARMONIC['SHARP']             # toggle to display enharmonic notes using flats or sharps
+        self.noteTable = None                                  # list of the shared notes of each string, see getNoteTable(), reset when the tuning, capo, or enharmonic setting changes
         self.editMode = self.EDIT_MODES['REPLACE']             # toggle between modifying the current character or inserting a new character
         self.cursorMode = self.CURSOR_MODES['MELODY']          # toggle between different cursor modes; melody, chord, and arpeggio
+        self.fileFormat = self.FILE_FORMATS['ANSI']            # format used by saveTabs(), set by readTabs() from the inFile magic bytes
         
-        argMap = {}
-        cmdArgs.parseCmdLine(argMap)
-        print('tabs.py args={}'.format(argMap), file=self.dbgFile)
         if 'f' in argMap and len(argMap['f']) > 0:
             self.inName = argMap['f'][0]                       # file to read from
             self.outName = argMap['f'][0]                      # file to write to, only written to with the saveTabs command
+        if 'C' in argMap:
+            self.chordsName = argMap['C'][0] if len(argMap['C']) > 0 else 'chords.cache'  # chord cache file, -C alone uses chords.cache
         if 't' in argMap and len(argMap['t']) > 0:
             self.initTabLen(argMap['t'])                       # set number of tabs/columns per line (and per string)
         if 'S' in argMap and len(argMap['S']) > 0:
@@ -139,33 +163,33 @@ class Tabs(object):
 
         try:
             with open(self.inName, 'rb') as self.inFile:
-                self.readTabs(readSize=500)
+                self.readTabs()
         except Exception as e: # FileNotFoundError as e:
-            print('init() Exception: {}'.format(e), file=self.dbgFile)
+            self.log('init() Exception: {}', e)
             mult = 1
             tabs = '0123456789abcdefghijklmno'
-            print('init() seeding tabs with \'{}\', len(tabs):{}, numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}'.format(tabs, len(tabs), self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine), file=self.dbgFile)
+            self.log('init() seeding tabs with \'{}\', len(tabs):{}, numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}', tabs, len(tabs), self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine)
             if len(tabs) > self.numTabsPerStringPerLine: 
                 tabs = tabs[:self.numTabsPerStringPerLine]
-                print('init() truncated tabs to \'{}\', setting tabs = tabs[:self.numTabsPerStringPerLine], len(tabs):{} * mult:{} = {}'.format(tabs, len(tabs), mult, len(tabs) * mult), file=self.dbgFile)
+                self.log('init() truncated tabs to \'{}\', setting tabs = tabs[:self.numTabsPerStringPerLine], len(tabs):{} * mult:{} = {}', tabs, len(tabs), mult, len(tabs) * mult)
             else: 
-                print('init() setting tabs len'.format(), file=self.dbgFile)
+                self.log('init() setting tabs len')
                 for i in range(len(tabs) - 1, -1, -1):
-                    print('init() i={}'.format(i), file=self.dbgFile)
+                    self.log('init() i={}', i)
                     if not (self.numTabsPerStringPerLine % i):
                         tabs = tabs[:i]
                         mult = int(self.numTabsPerStringPerLine / i)
                         break
-                print('init() truncated tabs to \'{}\', setting tabs = tabs[:mult], len(tabs):{} * mult:{} = {}'.format(tabs, len(tabs), mult, len(tabs) * mult), file=self.dbgFile)
-            for r in range(0, self.numStrings):
-                self.tabs.append(bytearray([ord(t) for t in tabs] * mult))
-                self.htabs.append(bytearray([ord('0') for t in tabs] * mult))
+                self.log('init() truncated tabs to \'{}\', setting tabs = tabs[:mult], len(tabs):{} * mult:{} = {}', tabs, len(tabs), mult, len(tabs) * mult)
+            self.tabs = grid.Grid(self.numStrings, len(tabs) * mult, ord('-'), bytes([ord(t) for t in tabs] * mult) * self.numStrings)
+            self.htabs = bits.Bits(self.numStrings, len(tabs) * mult)
+            self.countFrets()
         finally:
             self.modsObj = mods.Mods(self)
             self.mods = self.modsObj.getMods()
-            print('init() mods=\{ ', file=self.dbgFile)
+            self.log('init() mods=\{ ')
             for k in self.mods:
-                print('{}:{}, '.format(k, self.mods[k]), file=self.dbgFile)
+                self.log('{}:{}, ', k, self.mods[k])
             if 'F' in argMap and len(argMap['F']) == 0:
                 self.toggleEnharmonic()                        # toggle enharmonic note display from sharp to flat
             if 'i' in argMap and len(argMap['i']) == 0:
@@ -186,6 +210,8 @@ class Tabs(object):
                 self.goToLastTab(cs=1, ll=1)                   # go to last tab on last line of current string
             if 'Z' in argMap and len(argMap['Z']) == 0:
                 self.goToLastTab(ll=1)                         # go to last tab on last line of all strings
+            if 'N' in argMap and len(argMap['N']) == 0:
+                self.fileFormat = self.FILE_FORMATS['NATIVE']  # save tabs in the native file format
             if 'h' in argMap and len(argMap['h']) == 0:
                 self.printHelpInfo()                           # display the help info
             self.printTabs()                                   # display all the tabs in the tabs section, optionally display the notes and chords sections and the modes/labels row
@@ -205,12 +231,27 @@ class Tabs(object):
         self.quit('testAnsi()')
      
     def initFiles(self, inName, outName, dbgName):
-        self.dbgFile = open(dbgName, "w")
+        self.logs = logs.Log(dbgName)                          # the logs.Log instance, nothing is written to the dbgName file unless enabled with -d or -D
+        self.log = self.logs.channel('tabs')                   # the logs.Channel for this module
         self.inName = inName
         self.inFile = None
         self.outName = outName
         self.outFile = None
+        self.chordsName = None                                 # file the chord cache is loaded from and saved to, see chords.Chords.loadCache(), None to not persist the cache
         
+    def initLogs(self, argMap):
+        '''Configure the debug log.  [cmd line opt -d level or module=level, e.g. -d 3 or -d chords=DEBUG, cmd line opt -D ring buffer length]'''
+        if 'D' in argMap:
+            self.logs.setRingLen(int(argMap['D'][0]) if len(argMap['D']) > 0 else 1000)
+            self.logs.setLevel('DEBUG')
+        if 'd' in argMap:
+            if len(argMap['d']) == 0: self.logs.setLevel('DEBUG')
+            for arg in argMap['d']:
+                if '=' in arg:
+                    module, level = arg.split('=', 1)
+                    self.logs.setLevel(level, module)
+                else: self.logs.setLevel(arg)
+
     def initConsts(self): # foreground 30-37, background 40-47, 0=black, 1=red, 2=green, 3=yellow, 4= blue, 5=magenta, 6=cyan, 7=white
         self.styles = { 'NAT_NOTE':'32;47m', 'NAT_H_NOTE':'37;43m', 'NAT_CHORD':'37;43m', 'MIN_COL_NUM':'32;40m',   'TABS':'32;40m', 'NUT_UP':'31;43m', 'NORMAL':'22;',
                         'FLT_NOTE':'34;47m', 'FLT_H_NOTE':'34;43m', 'FLT_CHORD':'34;43m', 'MAJ_COL_NUM':'33;40m', 'H_TABS':'33;40m', 'NUT_DN':'34;43m', 'BRIGHT':'1;',
@@ -230,37 +271,36 @@ class Tabs(object):
         self.DISPLAY_LABELS = { 'DISABLED':0, 'ENABLED':1 }
         self.DISPLAY_NOTES = { 'DISABLED':0, 'ENABLED':1 }
         self.DISPLAY_CHORDS = { 'DISABLED':0, 'ENABLED':1 }
+        self.FILE_FORMATS = { 'ANSI':0, 'NATIVE':1 }
+        self.NON_FRETS = bytes([b for b in range(256) if not self.isFret(chr(b))])  # translate() deletechars, leaves only the fret bytes
     
     def initStrings(self, alias=None, spelling=None):
-        print('initStrings(alias={}, spelling={})'.format(alias, spelling), file=self.dbgFile)
+        self.log('initStrings(alias={}, spelling={})', alias, spelling)
         try:
-            self.strings = strings.Strings(self.dbgFile, alias=alias, spelling=spelling)
+            self.strings = strings.Strings(self.logs.channel('strings'), alias=alias, spelling=spelling)
         except Exception as ex:
             e = sys.exc_info()[0]
             info = 'initStrings() Exception: \'{}\', e={}'.format(ex, str(e))
             self.quit(info, code=1)
         self.stringMap = self.strings.map
         self.stringKeys = self.strings.keys
+        self.noteTable = None
         self.numStrings = len(self.stringKeys)
+        self.keysObj.reset()
         if len(self.strings.map) < 1:
-            print('initStrings() ERROR! invalid stringMap, numStrings={}'.format(self.numStrings), file=self.dbgFile)
+            self.log.err('initStrings() ERROR! invalid stringMap, numStrings={}', self.numStrings)
             self.quit('initStrings() ERROR! Empty stringMap!', code=1)
-        print('initStrings() map = {', end='', file=self.dbgFile)
-        for k in self.stringKeys:
-            print(' {}:{}'.format(k, self.stringMap[k]), end='', file=self.dbgFile)
-        print(' }', file=self.dbgFile)
+        if self.log.on():
+            print('initStrings() map = {', end='', file=self.log)
+            for k in self.stringKeys:
+                print(' {}:{}'.format(k, self.stringMap[k]), end='', file=self.log)
+            self.log(' }')
     
     def initTabLen(self, numTabs):
         self.numTabsPerStringPerLine = int(numTabs[0])
         self.numTabsPerString = self.numLines * self.numTabsPerStringPerLine
-        print('initTabLen() numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}'.format(self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine), file=self.dbgFile)
+        self.log('initTabLen() numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}', self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine)
         
-    def initInFile(self):
-        self.inFile.seek(0, 2)
-        fileSize = self.inFile.tell()
-        self.inFile.seek(0, 0)
-        return fileSize
-    
     '''
                                                                                                    1         1         1         1         1         1         1         1         1         1         2         2         2
          1         2         3         4         5         6         7         8         9         0         1         2         3         4         5         6         7         8         9         0         1         2
@@ -268,193 +308,162 @@ class Tabs(object):
 [40m[32m[2;1H1[40m[32m[2;2H|[40m[32m[2;3H0[40m[32m[2;4H1[40m[32m[2;5H2[40m[32m[2;6H3[40m[32m[2;7H4[40m[32m[2;8H5[40m[32m[2;9H6
     '''
 
-    def readTabs(self, readSize=600):
-        dbg = 1
-        fileSize = self.initInFile()
-        tmp, htmp = [], []
-        cnt, bytesRead, bgnTabs, endTabs, hasFrag, rowStr = 0, 0, None, None, False, '{}'.format(self.ROW_OFF)
-        data = self.inFile.read(readSize)
-        if not len(data) or not fileSize:
-            info = 'readTabs({}) ERROR! Invalid input file: file={} fileSize {:,} bytes, readSize {:,}, len(data)={}, data={}'.format(rowStr, self.inFile, fileSize, readSize, len(data), data) 
-            print(info, file=self.dbgFile)
-            raise Exception(info)
-        print('readTabs({}) fileSize {:,} bytes, reading first {:,} bytes:\'\n{}\''.format(rowStr, fileSize, readSize, ''.join([chr(data[p]) for p in range(0, readSize)])), file=self.dbgFile)
-        while len(data) != 0:
-            bytesRead += len(data)
-            i, bgn, fragment, end = 0, 0, b'', len(data)
-            while i != -1:
-                ii = i
-                cnt += 1
-                i = data.find(ord('H'), bgn, end)
-                if i == -1 or i + 1 >= len(data):
-                    fragment += data[ii+2:end]
-                    hasFrag = True
-                    if dbg: print('readTabs({}) detected fragment, len={} \'{}\' ii={}, p1={}, p2={}, i={}, bgn={}'.format(rowStr, len(fragment), ''.join([chr(fragment[p]) for p in range(0, len(fragment))]), ii, p1, p2, i, bgn), file=self.dbgFile)
-                else:
-                    p2 = data.rfind(ord(';'), i-4, i)
-                    p1 = data.rfind(ord('['), i-7, p2) + 1
-                    row = ''.join([chr(data[p]) for p in range(p1, p2)])
-                    col = ''.join([chr(data[p]) for p in range(p2+1, i)])
-                    if data[p1-3] == ord('m') and data[p1-6] == ord(';'):
-                        s2 = ''.join([chr(data[p]) for p in range(p1-5, p1-3)])
-                        if data[p1-9] == ord('['):
-                            s1 = ''.join([chr(data[p]) for p in range(p1-8, p1-6)])
-                            if s1 == self.styles['H_TABS'][0:2] and s2 == self.styles['H_TABS'][3:5]:
-                                print('readTabs() s1={} & s2={} matched harmonic tab style r={}, c={}, {}'.format(s1, s2, (int(rowStr) - self.ROW_OFF) % self.numStrings, int(col) - self.COL_OFF, len(self.htabs)), file=self.dbgFile)
-                                htmp.append(ord('1'))
-                            else:
-                                htmp.append(ord('0'))
-                    z1 = data.find(ord('<'), bgn, p1)
-                    z2 = data.find(ord('>'), z1, p1)
-                    if z1 != -1 and z2 != -1 and data[z1+1:z2] == b'BGN_TABS_SECTION':
-                        bgnTabs = data[z1+1:z2]
-                        print('readTabs() found {} mark at z1,z2={},{}'.format(bgnTabs, z1, z2), file=self.dbgFile)
-                        z = data.find(ord('c'), bgn, z1)
-                        if z != -1:
-                            zName = ''.join([chr(data[p]) for p in range(z, z+len('capo'))])
-                            zLen = len(zName)
-                            print('readTabs() found name={} at z={} with len={}!'.format(zName, z, zLen), file=self.dbgFile)
-                            if zName == 'capo' and chr(data[z+zLen]) == '=':
-                                z += zLen + 1
-                                self.capo = ord(data[z:z+1])
-                                print('readTabs() parsing capo, raw value={}, setting capo={}'.format(data[z:z+1], self.capo), file=self.dbgFile)
-                    if bgnTabs:
-                        tab = chr(data[i+1])
-                        tmp.append(data[i+1])
-                        if self.isFret(tab):
-                            tabFN = self.getFretNum(ord(tab))
-                            maxFN = self.getFretNum(self.maxFret)
-                            if tabFN > maxFN: 
-                                self.maxFret = ord(tab)
-                                print('readTabs() updating chr(mf)={}, maxFret={}, maxFN={}'.format(chr(self.maxFret), self.maxFret, self.getFretNum(self.maxFret)), file=self.dbgFile)
-                        if hasFrag:
-                            print('readTabs({}) {} {} [{},{}], ii={}, p1={}, p2={}, i={}, bgn={} {} \'{}\' data=\'{}\' tmp=\'{}\''.format(rowStr, cnt, len(fragment), row, col, ii, p1, p2, i, bgn, hasFrag, tab, ''.join([chr(data[p]) for p in range(ii, i+2)]), ''.join([chr(tmp[p]) for p in range(0, len(tmp))])), file=self.dbgFile)
-                            hasFrag = False
-                        elif dbg:
-                            print('readTabs({}) {} {} [{},{}], ii={}, p1={}, p2={}, i={}, bgn={} {} \'{}\' data=\'{}\' tmp=\'{}\''.format(rowStr, cnt, len(fragment), row, col, ii, p1, p2, i, bgn, hasFrag, tab, ''.join([chr(data[p]) for p in range(ii+2, i+2)]), ''.join([chr(tmp[p]) for p in range(0, len(tmp))])), file=self.dbgFile)
-                        z1 = data.find(ord('<'), bgn, p1)
-                        z2 = data.find(ord('>'), z1, p1)
-                        if z1 != -1 and z2 != -1 and data[z1+1:z2] == b'END_TABS_SECTION':
-                            endTabs = data[z1+1:z2]
-                            print('readTabs() found {} mark at z1,z2={},{}'.format(endTabs, z1, z2), file=self.dbgFile)
-                            break
-                        elif self.numTabsPerStringPerLine == 0 and int(row) == self.ROW_OFF + 1:
-                            self.numTabsPerStringPerLine = cnt - self.COL_OFF
-                            self.numTabsPerString = self.numLines * self.numTabsPerStringPerLine
-                            tmp, htmp, rowStr = self.appendTabs(tmp, htmp, rowStr)
-                            tmp.append(data[i + 1])
-                            if dbg: print('readTabs({}) {} [{},{}] \'{}\' setting numTabsPerStringPerLine={} tmp=\'{}\''.format(rowStr, cnt, row, col, tab, self.numTabsPerStringPerLine, ''.join([chr(tmp[p]) for p in range(0, len(tmp))])), file=self.dbgFile)
-                        elif self.isTab(tab) and self.numTabsPerStringPerLine != 0 and int(col) == self.COL_OFF - 1 + self.numTabsPerStringPerLine:# and len(tmp) > 1 and tmp[1] == '|':
-                            tmp, htmp, rowStr = self.appendTabs(tmp, htmp, rowStr)
-                    else:
-                        info = 'readTabs() prior to bgnTabs!'
-                        quit(info)
-                bgn = i + 2
-            if endTabs: break
-            data = self.inFile.read(readSize)
-            dataLen = len(data)
-            if dataLen == 0:
-                print('readTabs() No more data to read from inFile, fragment: \'{}\''.format(''.join([chr(fragment[p]) for p in range(0, len(fragment))])), file=self.dbgFile)
-                break
-            data = fragment + data
-            if dbg: print('readTabs() bytes read {:,}, reading next {:,} bytes and appending to fragment of len {} bytes ({:,} bytes):\n{}'.format(bytesRead, dataLen, len(fragment), dataLen + len(fragment), ''.join([chr(data[p]) for p in range(0, len(data))])), file=self.dbgFile)
-        print('readTabs() numStrings:{} =?= len(tabs):{}, numTabsPerString:{} =?= numLines:{} * numTabsPerStringPerLine:{}, totTabs:{}'.format(
-            self.numStrings, len(self.tabs), self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, len(self.tabs) * len(self.tabs[0])), file=self.dbgFile)
+    def readTabs(self):
+        '''Read the inFile, detect its format from the leading magic bytes, and fill tabs and htabs directly.'''
+        data = self.inFile.read()
+        if data.startswith(self.NATIVE_MAGIC):
+            self.fileFormat = self.FILE_FORMATS['NATIVE']
+            self.parseNativeTabs(data)
+        else:
+            self.parseAnsiTabs(data)
+        self.numTabsPerString = self.numLines * self.numTabsPerStringPerLine
+        self.numTabs = self.numStrings * self.numTabsPerString
+        self.countFrets()
+        self.setLastRow()
+        self.log('readTabs() read {:,} bytes, fileFormat={}, capo={}, chr(mf)={}, maxFret={}, numStrings:{} =?= len(tabs):{}, numTabsPerString:{} =?= numLines:{} * numTabsPerStringPerLine:{}, totTabs:{}',
+            len(data), self.fileFormat, chr(self.capo), chr(self.maxFret), self.maxFret, self.numStrings, len(self.tabs), self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, len(self.tabs) * len(self.tabs[0]))
         self.dumpTabs('readTabs()')
         self.dumpTabs('readTabs(h)', h=1)
 
-    def appendTabs(self, tmp, htmp, rowStr):
-        rowStr = '{}'.format(int(rowStr) + 1)
-        tabDataRow = tmp[self.COL_OFF-1 : self.COL_OFF-1 + self.numTabsPerStringPerLine]
-        htabDataRow = htmp[self.COL_OFF-1 : self.COL_OFF-1 + self.numTabsPerStringPerLine]
-        self.tabCount += len(tabDataRow)
-        print('appendTabs({}) checking  \'{}\' , numTabsPerString={}, numLines={}, numTabsPerStringPerLine={}, tabCount={}'.format(rowStr, ''.join([chr(t) for t in tabDataRow]), self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.tabCount), file=self.dbgFile)
-        if self.tabCount > self.numStrings * self.numTabsPerStringPerLine:
-            if self.tabCount == (self.numStrings + 1) * self.numTabsPerStringPerLine or self.tabCount == (2 * self.numStrings + 1) * self.numTabsPerStringPerLine:
-                self.appendLine(printTabs=False)
-            if int(rowStr) - (self.numLines - 1) * self.numStrings - self.ROW_OFF <= self.numStrings:
-                r = (int(rowStr) - self.ROW_OFF - 1) % self.numStrings
-                for c in range(0, len(tabDataRow)):
-                    self.tabs[r][c + (self.numLines - 1) * self.numTabsPerStringPerLine] = tabDataRow[c]
-                    self.htabs[r][c + (self.numLines - 1) * self.numTabsPerStringPerLine] = ord('0')
-                print('appendTabs({},{}) appending \'{}\' to tabs[line={}, string={}], numTabsPerString={}, numLines={}, numTabsPerStringPerLine={}, tabCount={}'.format(rowStr, r, ''.join([chr(t) for t in tabDataRow]), self.numLines, '{}'.format(int(rowStr) - (self.numLines-1)*self.numStrings - self.ROW_OFF), self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.tabCount), file=self.dbgFile)
-        else:
-            self.tabs.append(tabDataRow)
-            self.htabs.append(htabDataRow)
-            print('appendTabs({}) appending \'{}\' to tabs[line={}, string={}], numTabsPerString={}, numLines={}, numTabsPerStringPerLine={}, tabCount={}'.format(rowStr, ''.join([chr(t) for t in tabDataRow]), self.numLines, '{}'.format(int(rowStr) - self.ROW_OFF), self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.tabCount), file=self.dbgFile)
-        tmp, htmp = [], []
-        return [tmp, htmp, rowStr]
-        
+    def parseNativeTabs(self, data):
+        '''Parse the native format: a fixed header, the string spelling, then the raw tabs bytes and the packed htabs flags of each string, see bits.Bits.tobytes().'''
+        magic, version, capo, numTabsPerStringPerLine, numLines, spellingLen = self.NATIVE_HDR.unpack_from(data)
+        bgn = self.NATIVE_HDR.size
+        spelling = data[bgn:bgn + spellingLen].decode('ascii')
+        bgn += spellingLen
+        self.log('parseNativeTabs() version={}, capo={}, numTabsPerStringPerLine={}, numLines={}, spelling={}', version, chr(capo), numTabsPerStringPerLine, numLines, spelling)
+        if version not in (1, self.NATIVE_VERSION):
+            info = 'parseNativeTabs() ERROR! Unsupported version={}, expected version={}'.format(version, self.NATIVE_VERSION)
+            self.log.err(info)
+            raise Exception(info)
+        if spelling != self.strings.spelling:
+            self.initStrings(spelling=[spelling])
+        ns, nt = self.numStrings, numLines * numTabsPerStringPerLine
+        nh = ns * nt if version == 1 else ns * bits.Bits.rowBytes(nt)
+        if len(data) != bgn + ns * nt + nh:
+            info = 'parseNativeTabs() ERROR! Invalid file size={:,} bytes, expected {:,} bytes for numStrings={} * numTabsPerString={}'.format(len(data), bgn + ns * nt + nh, ns, nt)
+            self.log.err(info)
+            raise Exception(info)
+        view = memoryview(data)
+        self.tabs  = grid.Grid(ns, nt, ord('-'), view[bgn:bgn + ns * nt])
+        bgn += ns * nt
+        if version == 1: self.htabs = bits.Bits.fromFlags([view[bgn + r * nt:bgn + (r + 1) * nt] for r in range(0, ns)])
+        else:            self.htabs = bits.Bits(ns, nt, view[bgn:bgn + nh])
+        self.capo, self.numLines, self.numTabsPerStringPerLine, self.noteTable = capo, numLines, numTabsPerStringPerLine, None
+
+    def parseAnsiTabs(self, data):
+        '''Parse the tabs section of the ANSI format in a single pass, filling tabs and htabs directly from the 'CSI style CSI row;colH tab' cells.'''
+        bgn = data.find(b'<BGN_TABS_SECTION>')
+        end = data.find(b'<END_TABS_SECTION>', bgn)
+        if bgn == -1 or end == -1:
+            info = 'parseAnsiTabs() ERROR! Invalid input file: file={}, len(data)={:,} bytes, bgn={}, end={}'.format(self.inFile, len(data), bgn, end)
+            self.log.err(info)
+            raise Exception(info)
+        z = data.rfind(b'capo=', 0, bgn)
+        if z != -1:
+            self.capo, self.noteTable = data[z + len('capo=')], None
+            self.log('parseAnsiTabs() parsing capo, raw value={}, setting capo={}', data[z:z + len('capo=') + 1], self.capo)
+        hStyle = self.styles['H_TABS'][:-1].encode()
+        rows, hrows, prevRow = [], [], None
+        for style, row, col, tab in self.TAB_CELL.findall(data, bgn, end):
+            if int(col) < self.COL_OFF: continue               # skip the string label and capo columns
+            if row != prevRow:
+                rows.append(bytearray())
+                hrows.append(bytearray())
+                prevRow = row
+            rows[-1] += tab
+            if style.endswith(hStyle): hrows[-1].append(ord('1'))
+            else:                      hrows[-1].append(ord('0'))
+        ns = self.numStrings
+        if not rows or len(rows) % ns or any(len(row) != len(rows[0]) for row in rows):
+            info = 'parseAnsiTabs() ERROR! Invalid tabs section: numStrings={}, len(rows)={}, row lens={}'.format(ns, len(rows), [len(row) for row in rows])
+            self.log.err(info)
+            raise Exception(info)
+        self.numLines = len(rows) // ns
+        self.numTabsPerStringPerLine = len(rows[0])
+        self.tabs = grid.Grid.fromRows([bytearray().join(rows[r::ns]) for r in range(0, ns)], ord('-'))
+        self.htabs = bits.Bits.fromFlags([bytearray().join(hrows[r::ns]) for r in range(0, ns)])
+
     def appendLine(self, printTabs=True):
-        '''Append another line of tabs to the display.'''
-        tabs, htabs = [], []
-        print('appendLine(old) numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}, numTabs:{} = numStrings:{} * len(tabs[0]):{}'.format(self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.numTabs, self.numStrings, len(self.tabs[0])), file=self.dbgFile)
+        '''Append another line of tabs to the display.  The grid capacity doubles when it is full, so the cost is amortized O(line) rather than O(song).'''
+        self.log('appendLine(old) numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}, numTabs:{} = numStrings:{} * len(tabs[0]):{}', self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.numTabs, self.numStrings, len(self.tabs[0]))
         self.numLines += 1
         self.numTabsPerString = self.numLines * self.numTabsPerStringPerLine
-        for r in range(0, self.numStrings):
-            tabs.append(bytearray([ord('-')] * self.numTabsPerString))
-            htabs.append(bytearray([0] * self.numTabsPerString))
-            for c in range(0, len(self.tabs[r])):
-                tabs[r][c] = self.tabs[r][c]
-                htabs[r][c] = self.htabs[r][c]
-        self.htabs = htabs
-        self.tabs = tabs
-        self.setLastRow()
-        count = 0
-        for r in range(0, self.numStrings):
-            count += len(self.tabs[r])
-        self.numTabs = count
-        print('appendLine(new) numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}, numTabs:{} = numStrings:{} * len(tabs[0]):{}'.format(self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.numTabs, self.numStrings, len(self.tabs[0])), file=self.dbgFile)
+        self.tabs.resize(self.numTabsPerString)
+        self.htabs.resize(self.numTabsPerString)
+        self.setView(self.row2Line(self.row), self.row2Index(self.row))
+        self.numTabs = self.numStrings * self.numTabsPerString
+        self.log('appendLine(new) numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}, numTabs:{} = numStrings:{} * len(tabs[0]):{}', self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.numTabs, self.numStrings, len(self.tabs[0]))
         if printTabs:
             self.printTabs()
 
-    def removeLine(self):
-        '''Remove last line of tabs from the display.'''
-        tabs, htabs = [], []
-        print('removeLine(old) numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}, numTabs:{} = numStrings:{} * len(tabs[0]):{}'.format(self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.numTabs, self.numStrings, len(self.tabs[0])), file=self.dbgFile)
+    def removeLine(self, printTabs=True):
+        '''Remove last line of tabs from the display.  The grid keeps its capacity.'''
+        self.log('removeLine(old) numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}, numTabs:{} = numStrings:{} * len(tabs[0]):{}', self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.numTabs, self.numStrings, len(self.tabs[0]))
+        line, rr = self.row2Line(self.row), self.row2Index(self.row)
         self.numLines -= 1
         self.numTabsPerString = self.numLines * self.numTabsPerStringPerLine
         for r in range(0, self.numStrings):
-            tabs.append(bytearray([ord('-')] * self.numTabsPerString))
-            htabs.append(bytearray([ord('0')] * self.numTabsPerString))
-            for c in range(0, self.numTabsPerString):
-                tabs[r][c] = self.tabs[r][c]
-                htabs[r][c] = self.htabs[r][c]
-        self.tabs = tabs
-        self.htabs = htabs
-        self.setLastRow()
-        count = 0
-        for r in range(0, self.numStrings):
-            count += len(self.tabs[r])
-        self.numTabs = count
-        print('removeLine(new) numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}, numTabs:{} = numStrings:{} * len(tabs[0]):{}'.format(self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.numTabs, self.numStrings, len(self.tabs[0])), file=self.dbgFile)
-        self.printTabs()
+            self.journalObj.save(r, self.numTabsPerString, len(self.tabs[r]))
+            self.countTabs(self.tabs[r][self.numTabsPerString:], -1, r)
+        self.tabs.resize(self.numTabsPerString)
+        self.htabs.resize(self.numTabsPerString)
+        self.setView(line, rr)
+        self.numTabs = self.numStrings * self.numTabsPerString
+        self.log('removeLine(new) numTabsPerString:{} = numLines:{} * numTabsPerStringPerLine:{}, numTabs:{} = numStrings:{} * len(tabs[0]):{}', self.numTabsPerString, self.numLines, self.numTabsPerStringPerLine, self.numTabs, self.numStrings, len(self.tabs[0]))
+        if printTabs:
+            self.printTabs()
     
     def quit(self, reason, code=0):
         '''Quit with reason and exit code.'''
         self.printLineInfo('quit(ExitCode={}, reason=\'{}\')'.format(code, reason))
         print(self.CSI + self.styles['CONS'] + self.CSI + '{};{}HExitCode={}, reason=\'{}\''.format(self.lastRow, 1, code, reason))
-        self.dbgFile.close()
+        for line in self.statsObj.summary(): self.statsObj.log.info(line)
+        if self.chordsObj is not None: self.chordsObj.saveCache()
+        if code: self.logs.dump(reason)
+        self.logs.close()
         exit(code)
      
     def printHelpInfo(self, ui=None):
         '''Print help info.  If ui: explicitly call printTabs(), else: assume printTabs() will be called by the invoker.  [cmd line opt -h]'''
         self.clearScreen()
+        self.screenObj.invalidate()
         self.printHelpSummary()
         self.printHelpUiCmds()
         print('{}'.format('Press any key to continue... (Note some of the help text may have scrolled off the screen, you should be able to scroll back to view it.)'))
+        self.writerObj.flush()
         b = ord(getwch())
         if ui:
             self.printTabs()
 
+    def undo(self):
+        '''Undo the last edit, each user interactive command that modifies the tabs is undone as a whole.'''
+        self.journalObj.undo()
+
+    def redo(self):
+        '''Redo the last undone edit, the redo history is cleared by the next edit.'''
+        self.journalObj.redo()
+
+    def printStats(self):
+        '''Print the count, total, p50 and p99 latency, and bytes written for each user interactive command.'''
+        self.clearScreen()
+        self.screenObj.invalidate()
+        for line in self.statsObj.summary(): print(line)
+        print('hiliteCount={}'.format(self.hiliteCount))
+        if self.chordsObj is not None: print(self.chordsObj.cacheInfo())
+        print('{}'.format('Press any key to continue...'))
+        self.writerObj.flush()
+        b = ord(getwch())
+        self.printTabs()
+
     def printHelpUiCmds(self):
         print('{:>20} : {}'.format('User Interactive Cmd', 'Description'))
-        print('{:>20} : {}'.format('User Interactive Cmd', 'Description'), file=self.dbgFile)
+        self.log('{:>20} : {}', 'User Interactive Cmd', 'Description')
         print('--------------------------------------------------------------------------------')
-        print('--------------------------------------------------------------------------------', file=self.dbgFile)
+        self.log('--------------------------------------------------------------------------------')
         for k in self.uiKeys:
             print('{:>20} : {}'.format(k, self.uiCmds[k].__doc__))
-            print('{:>20} : {}'.format(k, self.uiCmds[k].__doc__), file=self.dbgFile)
+            self.log('{:>20} : {}', k, self.uiCmds[k].__doc__)
     
     def registerUiCmds(self):
         self.uiCmds = {}
@@ -491,6 +500,10 @@ class Tabs(object):
         self.registerUiCmd('Shift L',             self.goToLastTab)
         self.registerUiCmd('Shift K',             self.setCapo)
         self.registerUiCmd('Shift H',             self.printHelpInfo)
+        self.registerUiCmd('Shift M',             self.printStats)
+        self.registerUiCmd('Shift U',             self.undo)
+        self.registerUiCmd('Shift R',             self.redo)
+        self.registerUiCmd('Shift V',             self.insertVoicing)
         self.registerUiCmd('Space',               self.moveCursor)
         self.registerUiCmd('Home',                self.moveHome)
         self.registerUiCmd('End',                 self.moveEnd)
@@ -514,69 +527,82 @@ class Tabs(object):
         
     def registerUiCmd(self, key, method):
         if key not in self.uiKeys:
-            self.uiCmds[key] = method
+            self.uiCmds[key] = self.statsObj.timed(key, self.journalObj.recorded(key, method))
         self.uiKeys = sorted(self.uiCmds)
             
     def loop(self):
-        '''Run the user interactive loop, executing user interactive commands as they are entered via the keyboard.'''
+        '''Run the user interactive loop, executing user interactive commands as they are entered via the keyboard.  The output of each command is buffered and written in one call.'''
         while True:
             b = ord(getwch())
-            if self.isTab(chr(b)): self.uiCmds['Tablature'](b)    # setTab()               # N/A
-            elif b == 1:   self.uiCmds['Ctrl A']()                # toggleDisplayLabels()  # cmd line opt  -a
-            elif b == 2:   self.uiCmds['Ctrl B']()                # toggleDisplayChords()  # cmd line opt  -b
-            elif b == 66:  self.uiCmds['Shift B'](arpg=0)         # copySelectTabs()       # N/A
-            elif b == 3:   self.uiCmds['Ctrl C']()                # copySelectTabs()       # N/A
-            elif b == 67:  self.uiCmds['Shift C'](arpg=1)         # copySelectTabs()       # N/A
-            elif b == 4:   self.uiCmds['Ctrl D']()                # deleteSelectTabs()     # N/A
-            elif b == 5:   self.uiCmds['Ctrl E']()                # eraseTabs()            #?cmd line opt?
-            elif b == 6:   self.uiCmds['Ctrl F']()                # toggleEnharmonic()     # cmd line opt  -F?
-            elif b == 7:   self.uiCmds['Ctrl G']()                # goTo()                 #?cmd line opt? -g
-            elif b == 8:   self.uiCmds['Ctrl H or Backspace']()   # deletePrevTab()        # N/A
-            elif b == 72:  self.uiCmds['Shift H'](ui=1)           # printHelpInfo()        # cmd line opt -h
-            elif b == 9:   self.uiCmds['Ctrl I or Tab']()         # toggleCursorDir()      # cmd line opt  -i
-            elif b == 10:  self.uiCmds['Ctrl J']()                # shiftSelectTabs()      # N/A
-            elif b == 11:  self.uiCmds['Ctrl K'](dbg=1)           # printChord()           # N/A
-            elif b == 75:  self.uiCmds['Shift K']()               # setCapo()              # cmd line opt -k?
-            elif b == 12:  self.uiCmds['Ctrl L'](cs=1)            # goToLastTab()          # cmd line opt -l
-            elif b == 76:  self.uiCmds['Shift L']()               # goToLastTab()          # cmd line opt -L
-            elif b == 13:  self.uiCmds['Ctrl M or Enter']()       # toggleCursorMode()     # cmd line opt  -m
-            elif b == 14:  self.uiCmds['Ctrl N']()                # toggleDisplayNotes()   # cmd line opt  -n
-            elif b == 16:  self.uiCmds['Ctrl P']()                # printTabs()            # DBG?
-            elif b == 17:  self.uiCmds['Ctrl Q'](self.QUIT_STR)   # quit()                 # DBG?
-            elif b == 18:  self.uiCmds['Ctrl R']()                # resetTabs()            # DBG?
-            elif b == 19:  self.uiCmds['Ctrl S']()                # saveTabs()             # DBG?
-            elif b == 20:  self.uiCmds['Ctrl T']()                # appendLine()           # DBG?
-            elif b == 84:  self.uiCmds['Shift T']()               # removeLine()           # DBG?
-            elif b == 21:  self.uiCmds['Ctrl U']()                # unselectAll()          # N/A
-            elif b == 22:  self.uiCmds['Ctrl V']()                # pasteSelectTabs()      # N/A
-            elif b == 24:  self.uiCmds['Ctrl X']()                # cutSelectTabs()        # N/A
-            elif b == 88:  self.uiCmds['Shift X'](arpg=1)         # cutSelectTabs()        # N/A
-            elif b == 26:  self.uiCmds['Ctrl Z'](ll=1, cs=1)      # goToLastTab()          # cmd line opt -z
-            elif b == 90:  self.uiCmds['Shift Z'](ll=1)           # goToLastTab()          # cmd line opt -Z
-            elif b == 27:  self.uiCmds['ESC']()                   # toggleHarmonicNote()   # N/A
-            elif b == 32:  self.uiCmds['Space']()                 # moveCursor()           # N/A
-            elif b == 155: self.uiCmds['Alt Arrow Left'](left=1)  # unselectCol()          # N/A
-            elif b == 157: self.uiCmds['Alt Arrow Right']()       # unselectCol()          # N/A
-            elif b == 152: self.uiCmds['Alt Arrow Up'](up=1)      # unselectRow()          # N/A
-            elif b == 160: self.uiCmds['Alt Arrow Down']()        # unselectRow()          # N/A
-            elif b == 224:                                        # Escape Sequence        # N/A
-                b = ord(getwch())                                      # Read the escaped character
-                if   b == 75:  self.uiCmds['Arrow Left']()             # moveLeft()             # N/A
-                elif b == 77:  self.uiCmds['Arrow Right']()            # moveRight()            # N/A
-                elif b == 72:  self.uiCmds['Arrow Up']()               # moveUp()               # N/A
-                elif b == 80:  self.uiCmds['Arrow Down']()             # moveDown()             # N/A
-                elif b == 71:  self.uiCmds['Home']()                   # moveHome()             #?cmd line opt?
-                elif b == 79:  self.uiCmds['End']()                    # moveEnd()              #?cmd line opt?
-                elif b == 73:  self.uiCmds['Page Up']()                # movePageUp()           #?cmd line opt?
-                elif b == 81:  self.uiCmds['Page Down']()              # movePageDown()         #?cmd line opt?
-                elif b == 82:  self.uiCmds['Insert']()                 # toggleEditMode()       # cmd line opt
-                elif b == 83:  self.uiCmds['Delete']()                 # deleteTab()            # N/A
-                elif b == 115: self.uiCmds['Ctrl Arrow Left'](left=1)  # selectCol()            # N/A
-                elif b == 116: self.uiCmds['Ctrl Arrow Right']()       # selectCol()            # N/A
-                elif b == 141: self.uiCmds['Ctrl Arrow Up'](up=1)      # selectRow()            # N/A
-                elif b == 145: self.uiCmds['Ctrl Arrow Down']()        # selectRow()            # N/A
-                else:          self.unknown(b, 'Unknown Escape')
-            else:              self.unknown(b, 'Unknown Key')
+            self.writerObj.bgn()
+            try:     self.dispatch(b)
+            except Exception as e:
+                self.logs.dump('loop() b={}, Exception: {}'.format(b, e))
+                raise
+            finally: self.writerObj.end()
+
+    def dispatch(self, b):
+        '''Execute the user interactive command mapped to the given key.'''
+        if self.isTab(chr(b)): self.uiCmds['Tablature'](b)    # setTab()               # N/A
+        elif b == 1:   self.uiCmds['Ctrl A']()                # toggleDisplayLabels()  # cmd line opt  -a
+        elif b == 2:   self.uiCmds['Ctrl B']()                # toggleDisplayChords()  # cmd line opt  -b
+        elif b == 66:  self.uiCmds['Shift B'](arpg=0)         # copySelectTabs()       # N/A
+        elif b == 3:   self.uiCmds['Ctrl C']()                # copySelectTabs()       # N/A
+        elif b == 67:  self.uiCmds['Shift C'](arpg=1)         # copySelectTabs()       # N/A
+        elif b == 4:   self.uiCmds['Ctrl D']()                # deleteSelectTabs()     # N/A
+        elif b == 5:   self.uiCmds['Ctrl E']()                # eraseTabs()            #?cmd line opt?
+        elif b == 6:   self.uiCmds['Ctrl F']()                # toggleEnharmonic()     # cmd line opt  -F?
+        elif b == 7:   self.uiCmds['Ctrl G']()                # goTo()                 #?cmd line opt? -g
+        elif b == 8:   self.uiCmds['Ctrl H or Backspace']()   # deletePrevTab()        # N/A
+        elif b == 72:  self.uiCmds['Shift H'](ui=1)           # printHelpInfo()        # cmd line opt -h
+        elif b == 77:  self.uiCmds['Shift M']()               # printStats()           # N/A
+        elif b == 85:  self.uiCmds['Shift U']()               # undo()                 # N/A
+        elif b == 82:  self.uiCmds['Shift R']()               # redo()                 # N/A
+        elif b == 86:  self.uiCmds['Shift V']()               # insertVoicing()        # N/A
+        elif b == 9:   self.uiCmds['Ctrl I or Tab']()         # toggleCursorDir()      # cmd line opt  -i
+        elif b == 10:  self.uiCmds['Ctrl J']()                # shiftSelectTabs()      # N/A
+        elif b == 11:  self.uiCmds['Ctrl K'](dbg=1)           # printChord()           # N/A
+        elif b == 75:  self.uiCmds['Shift K']()               # setCapo()              # cmd line opt -k?
+        elif b == 12:  self.uiCmds['Ctrl L'](cs=1)            # goToLastTab()          # cmd line opt -l
+        elif b == 76:  self.uiCmds['Shift L']()               # goToLastTab()          # cmd line opt -L
+        elif b == 13:  self.uiCmds['Ctrl M or Enter']()       # toggleCursorMode()     # cmd line opt  -m
+        elif b == 14:  self.uiCmds['Ctrl N']()                # toggleDisplayNotes()   # cmd line opt  -n
+        elif b == 16:  self.uiCmds['Ctrl P']()                # printTabs()            # DBG?
+        elif b == 17:  self.uiCmds['Ctrl Q'](self.QUIT_STR)   # quit()                 # DBG?
+        elif b == 18:  self.uiCmds['Ctrl R']()                # resetTabs()            # DBG?
+        elif b == 19:  self.uiCmds['Ctrl S']()                # saveTabs()             # DBG?
+        elif b == 20:  self.uiCmds['Ctrl T']()                # appendLine()           # DBG?
+        elif b == 84:  self.uiCmds['Shift T']()               # removeLine()           # DBG?
+        elif b == 21:  self.uiCmds['Ctrl U']()                # unselectAll()          # N/A
+        elif b == 22:  self.uiCmds['Ctrl V']()                # pasteSelectTabs()      # N/A
+        elif b == 24:  self.uiCmds['Ctrl X']()                # cutSelectTabs()        # N/A
+        elif b == 88:  self.uiCmds['Shift X'](arpg=1)         # cutSelectTabs()        # N/A
+        elif b == 26:  self.uiCmds['Ctrl Z'](ll=1, cs=1)      # goToLastTab()          # cmd line opt -z
+        elif b == 90:  self.uiCmds['Shift Z'](ll=1)           # goToLastTab()          # cmd line opt -Z
+        elif b == 27:  self.uiCmds['ESC']()                   # toggleHarmonicNote()   # N/A
+        elif b == 32:  self.uiCmds['Space']()                 # moveCursor()           # N/A
+        elif b == 155: self.uiCmds['Alt Arrow Left'](left=1)  # unselectCol()          # N/A
+        elif b == 157: self.uiCmds['Alt Arrow Right']()       # unselectCol()          # N/A
+        elif b == 152: self.uiCmds['Alt Arrow Up'](up=1)      # unselectRow()          # N/A
+        elif b == 160: self.uiCmds['Alt Arrow Down']()        # unselectRow()          # N/A
+        elif b == 224:                                        # Escape Sequence        # N/A
+            b = ord(getwch())                                      # Read the escaped character
+            if   b == 75:  self.uiCmds['Arrow Left']()             # moveLeft()             # N/A
+            elif b == 77:  self.uiCmds['Arrow Right']()            # moveRight()            # N/A
+            elif b == 72:  self.uiCmds['Arrow Up']()               # moveUp()               # N/A
+            elif b == 80:  self.uiCmds['Arrow Down']()             # moveDown()             # N/A
+            elif b == 71:  self.uiCmds['Home']()                   # moveHome()             #?cmd line opt?
+            elif b == 79:  self.uiCmds['End']()                    # moveEnd()              #?cmd line opt?
+            elif b == 73:  self.uiCmds['Page Up']()                # movePageUp()           #?cmd line opt?
+            elif b == 81:  self.uiCmds['Page Down']()              # movePageDown()         #?cmd line opt?
+            elif b == 82:  self.uiCmds['Insert']()                 # toggleEditMode()       # cmd line opt
+            elif b == 83:  self.uiCmds['Delete']()                 # deleteTab()            # N/A
+            elif b == 115: self.uiCmds['Ctrl Arrow Left'](left=1)  # selectCol()            # N/A
+            elif b == 116: self.uiCmds['Ctrl Arrow Right']()       # selectCol()            # N/A
+            elif b == 141: self.uiCmds['Ctrl Arrow Up'](up=1)      # selectRow()            # N/A
+            elif b == 145: self.uiCmds['Ctrl Arrow Down']()        # selectRow()            # N/A
+            else:          self.unknown(b, 'Unknown Escape')
+        else:              self.unknown(b, 'Unknown Key')
         
     def unknown(self, b, reason):
         if b == 0:            return
@@ -590,7 +616,7 @@ class Tabs(object):
         '''Move to given row and col (optionally hilite row and col num).'''
         if row is not None: self.row = row
         if col is not None: self.col = col
-        print('moveTo({}, {}, {}) row={}, col={}, line={}'.format(row, col, hi, self.row, self.col, self.row2Line(self.row)), file=self.dbgFile)
+        if self.log.on(): self.log('moveTo({}, {}, {}) row={}, col={}, line={}', row, col, hi, self.row, self.col, self.row2Line(self.row))
         print(self.CSI + '{};{}H'.format(self.row, self.col), end='')
         self.printStatus()
         if self.displayLabels == self.DISPLAY_LABELS['ENABLED'] and hi == 1:
@@ -598,78 +624,78 @@ class Tabs(object):
    
     def moveLeft(self, dbg=None):
         '''Move cursor left one column on current line, wrapping to end of row on previous line or last line.'''
-        if dbg or self.dbgMove: print('moveLeft({}, {})'.format(self.row, self.col), file=self.dbgFile)
+        if dbg or self.dbgMove: self.log('moveLeft({}, {})', self.row, self.col)
         if self.col == self.bgnCol():
-            line = self.row2Line(self.row)
-            if line == 0: self.moveTo(row=self.row + self.lineDelta() * (self.numLines - 1), col=self.endCol(), hi=1)
-            else:         self.moveTo(row=self.row - self.lineDelta(), col=self.endCol(), hi=1)
+            line, r = self.row2Line(self.row), self.row2Index(self.row)
+            if line == 0: self.moveToLine(self.numLines - 1, r, col=self.endCol())
+            else:         self.moveToLine(line - 1, r, col=self.endCol())
         else:             self.moveTo(col=self.col - 1, hi=1)
 
     def moveRight(self, dbg=None):
         '''Move cursor right one column on current line, wrapping to beginning of row on next line or first line.'''
-        if dbg or self.dbgMove: print('moveRight({}, {})'.format(self.row, self.col), file=self.dbgFile)
+        if dbg or self.dbgMove: self.log('moveRight({}, {})', self.row, self.col)
         if self.col == self.endCol():
-            line = self.row2Line(self.row)
-            if line == self.numLines - 1: self.moveTo(row=self.row - self.lineDelta() * (self.numLines - 1), col=self.bgnCol(), hi=1)
-            else:                         self.moveTo(row=self.row + self.lineDelta(), col=self.bgnCol(), hi=1)
+            line, r = self.row2Line(self.row), self.row2Index(self.row)
+            if line == self.numLines - 1: self.moveToLine(0, r, col=self.bgnCol())
+            else:                         self.moveToLine(line + 1, r, col=self.bgnCol())
         else:                             self.moveTo(col=self.col + 1, hi=1)
         
     def moveUp(self, dbg=None):
         '''Move cursor up one row on current line, wrapping to last row on previous line or last line.'''
-        if dbg or self.dbgMove: print('moveUp({}, {})'.format(self.row, self.col), file=self.dbgFile)
+        if dbg or self.dbgMove: self.log('moveUp({}, {})', self.row, self.col)
         line = self.row2Line(self.row)
         if self.row == self.bgnRow(line):
-            if line == 0: self.moveTo(row=self.endRow(self.numLines - 1), hi=1)
-            else:         self.moveTo(row=self.endRow(line - 1), hi=1)
+            if line == 0: self.moveToLine(self.numLines - 1, self.numStrings - 1)
+            else:         self.moveToLine(line - 1, self.numStrings - 1)
         else:             self.moveTo(row=self.row - 1, hi=1)
     
     def moveDown(self, dbg=None):
         '''Move cursor down one row on current line, wrapping to first row on next line or first line.'''
-        if dbg or self.dbgMove: print('moveDown({}, {})'.format(self.row, self.col), file=self.dbgFile)
+        if dbg or self.dbgMove: self.log('moveDown({}, {})', self.row, self.col)
         line = self.row2Line(self.row)
         if self.row == self.endRow(line):
-            if line == self.numLines - 1: self.moveTo(row=self.bgnRow(0), hi=1)
-            else:                         self.moveTo(row=self.bgnRow(line + 1), hi=1)
+            if line == self.numLines - 1: self.moveToLine(0, 0)
+            else:                         self.moveToLine(line + 1, 0)
         else:                             self.moveTo(row=self.row + 1, hi=1)
     
     def moveHome(self, dbg=None):
         '''Move cursor to beginning of row on current line, wrapping to end of row on previous line or last line.'''
-        if dbg or self.dbgMove: print('moveHome({}, {})'.format(self.row, self.col), file=self.dbgFile)
+        if dbg or self.dbgMove: self.log('moveHome({}, {})', self.row, self.col)
         if self.col == self.bgnCol():
-            line = self.row2Line(self.row)
-            if line == 0: self.moveTo(row=self.row + self.lineDelta() * (self.numLines - 1), col=self.endCol(), hi=1)
-            else:         self.moveTo(row=self.row - self.lineDelta(), col=self.endCol(), hi=1)
+            line, r = self.row2Line(self.row), self.row2Index(self.row)
+            if line == 0: self.moveToLine(self.numLines - 1, r, col=self.endCol())
+            else:         self.moveToLine(line - 1, r, col=self.endCol())
         else:             self.moveTo(col=self.bgnCol(), hi=1)
             
     def moveEnd(self, dbg=None):
         '''Move cursor to end of row on current line, wrapping to beginning of row on next line or first line.'''
-        if dbg or self.dbgMove: print('moveEnd({}, {})'.format(self.row, self.col), file=self.dbgFile)
+        if dbg or self.dbgMove: self.log('moveEnd({}, {})', self.row, self.col)
         if self.col == self.endCol():
-            line = self.row2Line(self.row)
-            if line == self.numLines - 1: self.moveTo(row=self.row - self.lineDelta() * (self.numLines - 1), col=self.bgnCol(), hi=1)
-            else:                         self.moveTo(row=self.row + self.lineDelta(), col=self.bgnCol(), hi=1)
+            line, r = self.row2Line(self.row), self.row2Index(self.row)
+            if line == self.numLines - 1: self.moveToLine(0, r, col=self.bgnCol())
+            else:                         self.moveToLine(line + 1, r, col=self.bgnCol())
         else:                             self.moveTo(col=self.endCol(), hi=1)
 
     def movePageUp(self, dbg=None):
-        '''Move cursor to first row on current line, wrapping to last row on previous line or last line.'''
+        '''Move cursor to first row on current line, wrapping to last row on previous page (or line if all lines are displayed) or last line.'''
         if dbg or self.dbgMove: self.printLineInfo('movePageUp({}, {})'.format(self.row, self.col))
         line = self.row2Line(self.row)
         if self.row == self.bgnRow(line):
-            if line == 0: self.moveTo(row=self.endRow(self.numLines - 1), hi=1)
-            else:         self.moveTo(row=self.endRow(line - 1), hi=1)
+            if line == 0: self.moveToLine(self.numLines - 1, self.numStrings - 1)
+            else:         self.moveToLine(max(0, line - self.pageLen()), self.numStrings - 1)
         else:             self.moveTo(row=self.bgnRow(line), hi=1)
 
     def movePageDown(self, dbg=None):
-        '''Move cursor to last row on current line, wrapping to first row on next line or first line.'''
+        '''Move cursor to last row on current line, wrapping to first row on next page (or line if all lines are displayed) or first line.'''
         if dbg or self.dbgMove: self.printLineInfo('movePageDown({}, {})'.format(self.row, self.col))
         line = self.row2Line(self.row)
         if self.row == self.endRow(line):
-            if line == self.numLines - 1: self.moveTo(row=self.bgnRow(0), hi=1)
-            else:                         self.moveTo(row=self.bgnRow(line + 1), hi=1)
+            if line == self.numLines - 1: self.moveToLine(0, 0)
+            else:                         self.moveToLine(min(self.numLines - 1, line + self.pageLen()), 0)
         else:                             self.moveTo(row=self.endRow(line), hi=1)
 
     def row2Line(self, row):
-        for line in range(0, self.numLines):
+        for line in range(self.topLine, self.topLine + self.numViewLines):
             if self.bgnRow(line) <= row <= self.endRow(line):
                 return line
         return -1
@@ -684,7 +710,7 @@ class Tabs(object):
     
     def row2Index(self, row):
         r = row - self.ROW_OFF
-        r -= self.row2Line(row) * self.lineDelta()
+        r -= (self.row2Line(row) - self.topLine) * self.lineDelta()
         return r
     
     def col2Index(self, col):
@@ -693,7 +719,7 @@ class Tabs(object):
         return c
     
     def indices2Row(self, r, c):
-        return r + self.ROW_OFF + self.colIndex2Line(c) * self.lineDelta()
+        return r + self.ROW_OFF + (self.colIndex2Line(c) - self.topLine) * self.lineDelta()
     
     def index2Col(self, c):
         return c + self.COL_OFF - self.colIndex2Line(c) * self.numTabsPerStringPerLine
@@ -715,19 +741,49 @@ class Tabs(object):
         return self.numStrings + self.NOTES_LEN + self.CHORDS_LEN + 1
         
     def bgnRow(self, line):
-        return self.ROW_OFF + line * self.lineDelta()
+        return self.ROW_OFF + (line - self.topLine) * self.lineDelta()
             
     def endRow(self, line):
-        return self.ROW_OFF + line * self.lineDelta() + self.numStrings - 1
+        return self.ROW_OFF + (line - self.topLine) * self.lineDelta() + self.numStrings - 1
         
     def setLastRow(self):
-        self.lastRow = self.ROW_OFF + self.numLines * self.lineDelta() - 1
+        '''Fit the viewport, numViewLines lines starting at topLine, to the console height and calculate the last row, used to display the status.'''
+        rows = shutil.get_terminal_size().lines
+        self.numViewLines = max(1, min(self.numLines, (rows - self.ROW_OFF + 1) // self.lineDelta()))
+        self.topLine = max(0, min(self.topLine, self.numLines - self.numViewLines))
+        self.lastRow = self.ROW_OFF + self.numViewLines * self.lineDelta() - 1
+
+    def setView(self, line, r):
+        '''Refit the viewport after the number of rows per line or the number of lines changed, keeping the cursor on string index r of the given line.'''
+        self.setLastRow()
+        line = min(line, self.numLines - 1)
+        self.showLine(line)
+        self.row = self.bgnRow(line) + r
+
+    def showLine(self, line):
+        '''Scroll the viewport a page at a time so the given line is displayed.  Return True if the viewport moved, the caller is expected to reprint the tabs.'''
+        top = self.topLine
+        if   line < top:                      top = max(0, line - self.numViewLines + 1)
+        elif line >= top + self.numViewLines: top = min(line, self.numLines - self.numViewLines)
+        if top == self.topLine: return False
+        self.log('showLine({}) topLine={} -> {}, numViewLines={}', line, self.topLine, top, self.numViewLines)
+        self.topLine = top
+        return True
+
+    def pageLen(self):
+        '''Number of lines moved by movePageUp() and movePageDown(), a page when the viewport scrolls, else one line.'''
+        return self.numViewLines if self.numViewLines < self.numLines else 1
+
+    def moveToLine(self, line, r, col=None, hi=1):
+        '''Move to the given string index r on the given line, scrolling the viewport and reprinting the tabs if the line is not displayed.'''
+        if self.showLine(line): self.printTabs()
+        self.moveTo(row=self.bgnRow(line) + r, col=col, hi=hi)
     
     def toggleEditMode(self, dbg=None):
         '''Toggle cursor movement modes (insert or replace).'''
         self.editMode = (self.editMode + 1) % len(self.EDIT_MODES)
         if self.displayLabels == self.DISPLAY_LABELS['ENABLED']:
-            for line in range(0, self.numLines):
+            for line in range(0, self.numViewLines):
                 r = line * self.lineDelta() + 1
                 if self.editMode == self.EDIT_MODES['INSERT']:
                     self.prints('I', r, self.editModeCol, self.styles['MODES'])
@@ -740,7 +796,7 @@ class Tabs(object):
         '''Toggle cursor movement modes (melody, chord, or arpeggio).'''
         self.cursorMode = (self.cursorMode + 1) % len(self.CURSOR_MODES)
         if self.displayLabels == self.DISPLAY_LABELS['ENABLED']:
-            for line in range(0, self.numLines):
+            for line in range(0, self.numViewLines):
                 r = line * self.lineDelta() + 1
                 if self.cursorMode == self.CURSOR_MODES['MELODY']:
                     self.prints('M', r, self.cursorModeCol, self.styles['MODES'])
@@ -754,7 +810,7 @@ class Tabs(object):
     def toggleCursorDir(self, dbg=None):
         '''Toggle direction (up or down) of cursor vertical movement.  [cmd line opt -i]'''
         self.cursorDir = (self.cursorDir + 1) % len(self.CURSOR_DIRS)
-        for line in range(0, self.numLines):
+        for line in range(self.topLine, self.topLine + self.numViewLines):
             for r in range(0, self.numStrings):
                 if self.cursorDir == self.CURSOR_DIRS['DOWN']:
                     self.prints(chr(self.capo), r + self.bgnRow(line), self.cursorModeCol, self.styles['NUT_DN'])
@@ -768,55 +824,51 @@ class Tabs(object):
     def toggleEnharmonic(self):
         '''Toggle display of enharmonic (sharp or flat) notes.  [cmd line opt -F]'''
         self.enharmonic = (self.enharmonic + 1) % len(self.ENHARMONIC)
+        self.noteTable = None
         self.printTabs()
 
     def toggleDisplayLabels(self, printTabs=True):
         '''Toggle (enable or disable) display of modes and labels row.  [cmd line opt -a]'''
         self.displayLabels = (self.displayLabels + 1) % len(self.DISPLAY_LABELS)
-        line = self.row2Line(self.row)
+        line, r = self.row2Line(self.row), self.row2Index(self.row)
         if self.displayLabels == self.DISPLAY_LABELS['ENABLED']:
             self.ROW_OFF = 2
-            self.row += 1
         elif self.displayLabels == self.DISPLAY_LABELS['DISABLED']:
             self.ROW_OFF = 1
-            self.row -= 1
-        self.setLastRow()
+        self.setView(line, r)
         self.printLineInfo('toggleDisplayLabels({}) row,col=({}, {}), line={},'.format(self.displayLabels, self.row, self.col, line))
         if printTabs: self.printTabs()
         
     def toggleDisplayNotes(self, printTabs=True):
         '''Toggle (enable or disable) display of notes section.  [cmd line opt -n]'''
         self.displayNotes = (self.displayNotes + 1) % len(self.DISPLAY_NOTES)
-        line = self.row2Line(self.row)
+        line, r = self.row2Line(self.row), self.row2Index(self.row)
         if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
             self.NOTES_LEN = self.numStrings
-            self.row += line * self.NOTES_LEN
         elif self.displayNotes == self.DISPLAY_NOTES['DISABLED']:
-            self.row -= line * self.NOTES_LEN
             self.NOTES_LEN = 0
-        self.setLastRow()
+        self.setView(line, r)
         self.printLineInfo('toggleDisplayNotes({}) row,col=({}, {}), line={}'.format(self.displayNotes, self.row, self.col, line))
         if printTabs: self.printTabs()
     
     def toggleDisplayChords(self, printTabs=True):
         '''Toggle (enable or disable) display of chords section.  [cmd line opt -b]'''
         self.displayChords = (self.displayChords + 1) % len(self.DISPLAY_CHORDS)
-        line = self.row2Line(self.row)
+        line, r = self.row2Line(self.row), self.row2Index(self.row)
         if self.displayChords == self.DISPLAY_CHORDS['ENABLED']:
             if self.chordsObj is None:
                 self.chordsObj = chords.Chords(self)
-                print('toggleDisplayChords() loaded chords module and Chords class, chordsObj={}, getChordName={}'.format(self.chordsObj, self.chordsObj.getChordName), file=self.dbgFile)
+                self.log('toggleDisplayChords() loaded chords module and Chords class, chordsObj={}, getChordName={}', self.chordsObj, self.chordsObj.getChordName)
             self.CHORDS_LEN = 5
-            self.row += line * self.CHORDS_LEN
+            self.chordsObj.analyse()                           # name the chords of the whole song in one pass
         elif self.displayChords == self.DISPLAY_CHORDS['DISABLED']:
-            self.row -= line * self.CHORDS_LEN
             self.CHORDS_LEN = 0
-        self.setLastRow()
+        self.setView(line, r)
         self.printLineInfo('toggleDisplayChords({}) row,col=({}, {}), line={}'.format(self.displayChords, self.row, self.col, line))
         if printTabs: self.printTabs()
 
     def printCursorAndEditModes(self, r):
-        print('printCursorAndEditModes()'.format(), file=self.dbgFile)
+        self.log('printCursorAndEditModes()')
         if self.editMode == self.EDIT_MODES['INSERT']:
             self.prints('I', r, self.editModeCol, self.styles['MODES'])
         elif self.editMode == self.EDIT_MODES['REPLACE']:
@@ -833,7 +885,7 @@ class Tabs(object):
         self.prints('{}'.format(line + 1), r, self.cursorModeCol, self.styles['MODES'])
     
     def printColNums(self, row):
-        print('printColNums({})'.format(row), file=self.dbgFile)
+        self.log('printColNums({})', row)
         for c in range(0, self.numTabsPerStringPerLine):
             self.printColNum(row, c + 1, self.styles['NORMAL'])
 
@@ -852,16 +904,16 @@ class Tabs(object):
     def selectRow(self, up=0):
         '''Select row, append to selected rows list, hilite current tab, and advance (up or down) to next tab.'''
         row, col, r, c, br, er = self.row, self.col, self.row2Index(self.row), self.col2Index(self.col), self.bgnRow(self.row2Line(self.row)), self.endRow(self.row2Line(self.row))
-        print('selectRow(up={}) ({},{}) bgn r={}, c={}, selectRows={}, selectCols={}, br={}, er={}'.format(up, row, col, r, c, self.selectRows, self.selectCols, br, er), file=self.dbgFile)
+        self.log('selectRow(up={}) ({},{}) bgn r={}, c={}, selectRows={}, selectCols={}, br={}, er={}', up, row, col, r, c, self.selectRows, self.selectCols, br, er)
         if len(self.selectRows) < self.numStrings:
             self.selectRows.append(r)
             self.selectCols.append(c)
-            print('selectRow(up={}) ({},{}) after appending r={}, c={}, selectRows={}, selectCols={}'.format(up, row, col, r, c, self.selectRows, self.selectCols), file=self.dbgFile)
+            self.log('selectRow(up={}) ({},{}) after appending r={}, c={}, selectRows={}, selectCols={}', up, row, col, r, c, self.selectRows, self.selectCols)
             self.selectStyle(c, self.styles['BRIGHT'], rList=self.selectRows)
         if up == 1 and row == br or up == 0 and row == er:
             if up: dir, pos = 'up', 'bgn'
             else:  dir, pos = 'down', 'end'
-            print('selectRow(up={}) ignoring cursor movement, because dir={} and row={} == {}Row'.format(up, dir, row, pos), file=self.dbgFile)
+            self.log('selectRow(up={}) ignoring cursor movement, because dir={} and row={} == {}Row', up, dir, row, pos)
             self.resetPos()
             return
         if up: self.moveUp()
@@ -872,34 +924,34 @@ class Tabs(object):
         if len(self.selectRows):
             r = self.row2Index(self.row)
             c = self.col2Index(self.col)
-            print('unselectRow(up={}) ({},{}) checking if r={}, c={}, in selectRows={}, selectCols={}'.format(up, self.row, self.col, r, c, self.selectRows, self.selectCols), file=self.dbgFile)
+            self.log('unselectRow(up={}) ({},{}) checking if r={}, c={}, in selectRows={}, selectCols={}', up, self.row, self.col, r, c, self.selectRows, self.selectCols)
             if r in self.selectRows:
-                print('unselectRow(up={}) ({},{}) before removing r={}, c={}, from selectRows={}, selectCols={}'.format(up, self.row, self.col, r, c, self.selectRows, self.selectCols), file=self.dbgFile)
+                self.log('unselectRow(up={}) ({},{}) before removing r={}, c={}, from selectRows={}, selectCols={}', up, self.row, self.col, r, c, self.selectRows, self.selectCols)
                 self.selectRows.remove(r)
-                print('unselectRow(up={}) ({},{}) after removing r={}, c={}, from selectRows={}, selectCols={}'.format(up, self.row, self.col, r, c, self.selectRows, self.selectCols), file=self.dbgFile)
+                self.log('unselectRow(up={}) ({},{}) after removing r={}, c={}, from selectRows={}, selectCols={}', up, self.row, self.col, r, c, self.selectRows, self.selectCols)
                 self.selectStyle(c, self.styles['NORMAL'], r=r)
                 if up: self.moveUp()
                 else:  self.moveDown()
-            else: print('unselectRow(up={}) ({},{}) nothing to unselect, r={} not in selectRows={}, selectCols={}'.format(up, self.row, self.col, r, self.selectRows, self.selectCols), file=self.dbgFile)
-        else: print('unselectRow(up={}) ({},{}) empty list, nothing to unselect, r={} selectRows={}, selectCols={}'.format(up, self.row, self.col, r, self.selectRows, self.selectCols), file=self.dbgFile)
+            else: self.log('unselectRow(up={}) ({},{}) nothing to unselect, r={} not in selectRows={}, selectCols={}', up, self.row, self.col, r, self.selectRows, self.selectCols)
+        else: self.log('unselectRow(up={}) ({},{}) empty list, nothing to unselect, r={} selectRows={}, selectCols={}', up, self.row, self.col, r, self.selectRows, self.selectCols)
         
     def selectCol(self, left=0):
         '''Select column, append to selected columns list, hilite current tab, and advance (left or right) to next tab.'''
         cc = self.col2Index(self.col)
-        print('selectCol(left={}) ({}{}), cc={} selectFlag={}, selectRows={}, selectCols={}'.format(left, self.row, self.col, cc, self.selectFlag, self.selectRows, self.selectCols), file=self.dbgFile)
+        self.log('selectCol(left={}) ({}{}), cc={} selectFlag={}, selectRows={}, selectCols={}', left, self.row, self.col, cc, self.selectFlag, self.selectRows, self.selectCols)
         if len(self.selectRows) == 0:
             self.selectFlag = 1
             for r in range(0, self.numStrings):
                 self.selectRows.append(r)
-            print('selectCol(left={}) ({}{}) appended all rows, cc={}, selectFlag={}, selectRows={}, selectCols={}'.format(left, self.row, self.col, cc, self.selectFlag, self.selectRows, self.selectCols), file=self.dbgFile)
+            self.log('selectCol(left={}) ({}{}) appended all rows, cc={}, selectFlag={}, selectRows={}, selectCols={}', left, self.row, self.col, cc, self.selectFlag, self.selectRows, self.selectCols)
         elif self.selectFlag == 0:
             self.selectFlag = 1
             for c in range(0, len(self.selectCols)):
                 self.selectStyle(c, self.styles['NORMAL'], rList=self.selectRows)
             self.selectCols = []
-            print('selectCol(left={}) ({},{}) removed all cols, cc={}, selectFlag={}, selectRows={}, selectCols={}'.format(left, self.row, self.col, cc, self.selectFlag, self.selectRows, self.selectCols), file=self.dbgFile)
+            self.log('selectCol(left={}) ({},{}) removed all cols, cc={}, selectFlag={}, selectRows={}, selectCols={}', left, self.row, self.col, cc, self.selectFlag, self.selectRows, self.selectCols)
         self.selectCols.append(cc)
-        print('selectCol(left={}) ({},{}) appended cc={}, selectFlag={}, selectRows={}, selectCols={}'.format(left, self.row, self.col, cc, self.selectFlag, self.selectRows, self.selectCols), file=self.dbgFile)
+        self.log('selectCol(left={}) ({},{}) appended cc={}, selectFlag={}, selectRows={}, selectCols={}', left, self.row, self.col, cc, self.selectFlag, self.selectRows, self.selectCols)
         self.selectStyle(cc, self.styles['BRIGHT'], rList=self.selectRows)
         if left: self.moveLeft()
         else:    self.moveRight()
@@ -908,28 +960,28 @@ class Tabs(object):
         '''Unselect column, remove it from selected columns list, un-hilite the current tab, and advance (left or right) to the next tab.'''
         if len(self.selectCols):
             c = self.col2Index(self.col)
-            print('unselectCol(left={}) ({},{}) checking if c={} in selectCols={}'.format(left, self.row, self.col, c, self.selectCols), file=self.dbgFile)
+            self.log('unselectCol(left={}) ({},{}) checking if c={} in selectCols={}', left, self.row, self.col, c, self.selectCols)
             if c in self.selectCols:
-                print('unselectCol(left={}) ({},{}) before removing c={} from selectCols={}'.format(left, self.row, self.col, c, self.selectCols), file=self.dbgFile)
+                self.log('unselectCol(left={}) ({},{}) before removing c={} from selectCols={}', left, self.row, self.col, c, self.selectCols)
                 self.selectCols.remove(c)
-                print('unselectCol(left={}) ({},{}) after removing c={} from selectCols={}'.format(left, self.row, self.col, c, self.selectCols), file=self.dbgFile)
+                self.log('unselectCol(left={}) ({},{}) after removing c={} from selectCols={}', left, self.row, self.col, c, self.selectCols)
                 self.selectStyle(c, self.styles['NORMAL'], rList=self.selectRows)
                 if left: self.moveLeft()
                 else:    self.moveRight()
-            else: print('unselectCol(left={}) ({},{}) c={} not in selectCols={}, nothing to unselect'.format(left, self.row, self.col, c, self.selectCols), file=self.dbgFile)
-        else: print('unselectCol(left={}) ({},{}) selectCols={}, empty list, nothing to unselect'.format(left, self.row, self.col, self.selectCols), file=self.dbgFile)
+            else: self.log('unselectCol(left={}) ({},{}) c={} not in selectCols={}, nothing to unselect', left, self.row, self.col, c, self.selectCols)
+        else: self.log('unselectCol(left={}) ({},{}) selectCols={}, empty list, nothing to unselect', left, self.row, self.col, self.selectCols)
 
     def unselectAll(self):
         '''Unselect all rows and columns.'''
-        print('unselectAll({},{}) bgn selectFlag={}, selectRows={}, selectCols={}, selectTabs={}'.format(self.row, self.col, self.selectFlag, self.selectRows, self.selectCols, self.selectTabs), file=self.dbgFile)
+        self.log('unselectAll({},{}) bgn selectFlag={}, selectRows={}, selectCols={}, selectTabs={}', self.row, self.col, self.selectFlag, self.selectRows, self.selectCols, self.selectTabs)
         for c in range(0, len(self.selectCols)):
             self.selectStyle(self.selectCols[c], self.styles['NORMAL'], rList=self.selectRows)
         self.selectRows, self.selectCols, self.selectTabs, self.selectHTabs, self.selectFlag = [], [], [], [], 0
         self.resetPos()
-        print('unselectAll({},{}) end selectFlag={}, selectRows={}, selectCols={}, selectTabs={}'.format(self.row, self.col, self.selectFlag, self.selectRows, self.selectCols, self.selectTabs), file=self.dbgFile)
+        self.log('unselectAll({},{}) end selectFlag={}, selectRows={}, selectCols={}, selectTabs={}', self.row, self.col, self.selectFlag, self.selectRows, self.selectCols, self.selectTabs)
             
     def selectStyle(self, c, style, rList=None, r=None):
-        print('selectStyle({}) c={}, rList={}, r={}'.format(style, c, rList, r), file=self.dbgFile)
+        self.log('selectStyle({}) c={}, rList={}, r={}', style, c, rList, r)
         if rList is not None and r is None:
             for rr in range(0, len(rList)):
                 r = rList[rr]
@@ -940,19 +992,14 @@ class Tabs(object):
     def selectRowStyle(self, r, c, style):
         tab = self.tabs[r][c]
         row, col = self.indices2RowCol(r, c)
-        print('selectRowStyle({}) r={}, c={}, row={}, col={}, tab={}'.format(style, r, c, row, col, chr(tab)), file=self.dbgFile)
-        if self.htabs[r][c] == ord('1'):
+        self.log('selectRowStyle({}) r={}, c={}, row={}, col={}, tab={}', style, r, c, row, col, chr(tab))
+        if self.htabs.test(r, c):
             self.prints(chr(tab), row, col, style + self.styles['H_TABS'])
         else:
             self.prints(chr(tab), row, col, style + self.styles['TABS'])
         if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
             if self.isFret(chr(tab)):
-                if self.htabs[r][c] == ord('1'):
-                    n = self.getHarmonicNote(r + 1, tab)
-                    self.printNote(row + self.numStrings, col, n, style, hn=1)
-                else:
-                    n = self.getNote(r + 1, tab)
-                    self.printNote(row + self.numStrings, col, n, style)
+                self.printTabNote(row + self.numStrings, col, r, tab, style, self.htabs.test(r, c))
             else:
                 self.prints(chr(tab), row + self.numStrings, col, style + self.styles['NAT_NOTE'])
     
@@ -961,98 +1008,148 @@ class Tabs(object):
         line = self.row2Line(self.row)
         r, c = self.rowCol2Indices(self.row, self.col)
         tab = self.tabs[r][c]
-        if self.htabs[r][c] == ord('0'):
+        self.journalObj.save(r, c, c + 1)
+        if not self.htabs.test(r, c):
             if self.isFret(chr(tab)) and self.getFretNum(tab) in self.HARMONIC_FRETS:
-                self.htabs[r][c] = ord('1')
+                self.htabs.set(r, c)
                 n = self.getHarmonicNote(r + 1, tab)
                 self.prints(chr(tab), self.row, self.col, self.styles['H_TABS'])
                 if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
-                    self.printNote(r + line * self.lineDelta() + self.endRow(0) + 1 , self.col, n, hn=1)
+                    self.printNote(r + self.endRow(line) + 1 , self.col, n, hn=1)
                     self.resetPos()
                 pn = self.getNote(r + 1, tab)
-                print('toggleHarmonicNote({},{}) r,c={},{}, tab={}, pn.n={}, pn.i={} norm->harm n.n={}, n.i={}'.format(self.row, self.col, r, c, chr(tab), pn.name, pn.index, n.name, n.index), file=self.dbgFile)
+                self.log('toggleHarmonicNote({},{}) r,c={},{}, tab={}, pn.n={}, pn.i={} norm->harm n.n={}, n.i={}', self.row, self.col, r, c, chr(tab), pn.name, pn.index, n.name, n.index)
         else:
-            self.htabs[r][c] = ord('0')
+            self.htabs.set(r, c, 0)
             n = self.getNote(r + 1, tab)
             self.prints(chr(tab), self.row, self.col, self.styles['TABS'])
             if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
-                self.printNote(r + line * self.lineDelta() + self.endRow(0) + 1 , self.col, n)
+                self.printNote(r + self.endRow(line) + 1 , self.col, n)
                 self.resetPos()
             pn = self.getHarmonicNote(r + 1, tab)
-            print('toggleHarmonicNote({},{}) r,c={},{}, tab={}, pn.n={}, pn.i={} harm->norm n.n={}, n.i={}'.format(self.row, self.col, r, c, chr(tab), pn.name, pn.index, n.name, n.index), file=self.dbgFile)
+            self.log('toggleHarmonicNote({},{}) r,c={},{}, tab={}, pn.n={}, pn.i={} harm->norm n.n={}, n.i={}', self.row, self.col, r, c, chr(tab), pn.name, pn.index, n.name, n.index)
         if self.displayChords == self.DISPLAY_CHORDS['ENABLED']:
-            self.chordsObj.eraseChord(c)
             self.chordsObj.printChord(c=c)
         self.printStatus()
 
     def setCapo(self, c=None):
         '''Model a capo placed at fret position specified by user input of a single character, [0-9] [a-o].  [cmd line opt -k]'''
-        if c is None: c = getwch()
-        print('setCapo({}, {}) c={}, ord(c)={}, prevCapo={} bgn: check isFret(c)'.format(self.row, self.col, c, ord(c), self.capo), file=self.dbgFile)
+        if c is None:
+            self.writerObj.flush()
+            c = getwch()
+        self.log('setCapo({}, {}) c={}, ord(c)={}, prevCapo={} bgn: check isFret(c)', self.row, self.col, c, ord(c), self.capo)
         if self.isFret(c):
             capFN = self.getFretNum(ord(c))
             maxFN = self.getFretNum(self.maxFret)
-            print('setCapo() c={}, ord(c)={}, chr(mf)={}, maxFret={}, check capFN:{} + maxFN:{} <= {}?'.format(c, ord(c), chr(self.maxFret), self.maxFret, capFN, maxFN, self.NUM_FRETS), file=self.dbgFile)
+            self.log('setCapo() c={}, ord(c)={}, chr(mf)={}, maxFret={}, check capFN:{} + maxFN:{} <= {}?', c, ord(c), chr(self.maxFret), self.maxFret, capFN, maxFN, self.NUM_FRETS)
             if capFN + maxFN > self.NUM_FRETS:
                 info = 'setCapo() capFN:{} + maxFN:{} > {}!  c={}, ord(c)={}, capo={}, chr(mf)={}, maxFret={}'.format(capFN, maxFN, self.NUM_FRETS, c, ord(c), self.capo, chr(self.maxFret), self.maxFret)
                 self.printe(info)
             else:
-                self.capo = ord(c)            
-                print('setCapo() c={}, ord(c)={}, capo={}, capFN={}, chr(mf)={}, maxFret={}, maxFN={} setting capo'.format(c, ord(c), self.capo, capFN, chr(self.maxFret), self.maxFret, maxFN), file=self.dbgFile)
+                self.capo, self.noteTable = ord(c), None
+                self.log('setCapo() c={}, ord(c)={}, capo={}, capFN={}, chr(mf)={}, maxFret={}, maxFN={} setting capo', c, ord(c), self.capo, capFN, chr(self.maxFret), self.maxFret, maxFN)
                 self.printTabs()
 
-    def findMaxFret(self):
-        maxFN = 0
-        for r in range(0, len(self.tabs)):
-            for c in range(0, len(self.tabs[r])):
-                tab = self.tabs[r][c]
-                if self.isFret(chr(tab)):
-                    currFN = self.getFretNum(tab)
-                    if currFN > maxFN:
-                        maxFN = currFN
-        return self.getFretByte(maxFN)
+    def insertVoicing(self):
+        '''Insert a voicing of the chord named by user input of up to 6 characters terminated by space char e.g. Am7, chosen by a single digit [1-9] from the ranked voicings shown in the status row.'''
+        c, tmp = '', []
+        self.writerObj.flush()
+        while len(tmp) < 6:
+            c = getwch()
+            if c != ' ': tmp.append(c)
+            else: break
+        name = ''.join(tmp)
+        if self.chordsObj is None:                             # the voicings are checked against the chord names, even if the chords section is not displayed
+            self.chordsObj = chords.Chords(self)
+            self.log('insertVoicing() loaded chords module and Chords class, chordsObj={}, getChordName={}', self.chordsObj, self.chordsObj.getChordName)
+        if self.voicingsObj is None: self.voicingsObj = voicings.Voicings(self)
+        try: chordVoicings = self.voicingsObj.getVoicings(name)[:9]
+        except Exception as e:
+            self.printe('insertVoicing() {}'.format(e))
+            return
+        self.log('insertVoicing() name={}, voicings={}', name, chordVoicings)
+        if not chordVoicings:
+            self.printe('insertVoicing() no voicing of {} within {} frets'.format(name, self.voicingsObj.MAX_SPAN + 1))
+            return
+        info = '{} '.format(name) + ' '.join('{}:{}'.format(i + 1, self.voicingsObj.getText(v)) for i, v in enumerate(chordVoicings))
+        print(self.CSI + self.styles['STATUS'] + self.CSI + '{};{}H{}'.format(self.lastRow, 1, info), end='')
+        self.clearRow(arg=0)
+        self.resetPos()
+        self.writerObj.flush()
+        c = getwch()
+        if '1' <= c <= str(len(chordVoicings)):
+            self.voicingsObj.insert(chordVoicings[int(c) - 1])
+        self.printStatus()
+
+    @property
+    def maxFret(self):
+        '''Return the fret byte of the highest fret number in the tabs, found in the fret counts without looking at the tabs.'''
+        for fn in range(self.NUM_FRETS, 0, -1):
+            if self.fretCounts[fn]: return self.getFretByte(fn)
+        return ord('0')
+
+    def countFrets(self):
+        '''Count the tabs with each fret number from scratch, e.g. after reading the tabs.'''
+        tabs = self.tabs.tobytes()
+        self.fretCounts = [tabs.count(self.getFretByte(fn)) for fn in range(0, self.NUM_FRETS + 1)]
+        self.keysObj.countAll()
+
+    def countTabs(self, tabs, n=1, r=None):
+        '''Add n to the fret counts and the key counts for each fret in the given tabs of string index r, or in the given column of tabs if r is None,
+           n=-1 for tabs that are about to be overwritten or removed.'''
+        for tab in bytes(tabs).translate(None, self.NON_FRETS):
+            self.fretCounts[self.getFretNum(tab)] += n
+        self.keysObj.countTabs(tabs, n, r)
+
+    def putTab(self, r, c, tab):
+        '''Set tabs[r][c] to the given tab byte and update the fret counts and the key counts.'''
+        prevTab = self.tabs[r][c]
+        if self.isFret(chr(prevTab)): self.fretCounts[self.getFretNum(prevTab)] -= 1
+        if self.isFret(chr(tab)):     self.fretCounts[self.getFretNum(tab)] += 1
+        self.keysObj.countTab(r, prevTab, -1)
+        self.keysObj.countTab(r, tab)
+        self.tabs[r][c] = tab
         
+
     def setTab(self, tab):
         '''Set given tab byte at the current row and col, print the corresponding tab character and then move cursor according to the cursor mode.'''
-        print('setTab({}, {}) chr(tab)={}, tab, bgn: check row/col'.format(self.row, self.col, chr(tab), tab), file=self.dbgFile)
-        if self.bgnCol() <= self.col <= self.endCol() and self.ROW_OFF <= self.row < self.ROW_OFF + self.numLines * self.lineDelta():
+        self.log('setTab({}, {}) chr(tab)={}, tab, bgn: check row/col', self.row, self.col, chr(tab), tab)
+        if self.bgnCol() <= self.col <= self.endCol() and self.ROW_OFF <= self.row < self.ROW_OFF + self.numViewLines * self.lineDelta():
             row, col = self.row, self.col
             rr, cc = self.rowCol2Indices(row, col)
             if self.editMode == self.EDIT_MODES['INSERT']:
-                for c in range(len(self.tabs[rr]) - 1, cc, - 1):
-                    self.tabs[rr][c] = self.tabs[rr][c - 1]
-            if self.htabs[rr][cc] == ord('1'):
-                self.htabs[rr][cc] = ord('0')
-                print('setTab() cleared htab={}, rr={}, cc={}'.format(chr(self.htabs[rr][cc]), rr, cc), file=self.dbgFile)
-            prevTab = self.tabs[rr][cc]
-            capTab = self.tabs[rr][cc] = tab
-            if self.isFret(chr(prevTab)) and self.getFretNum(prevTab) == self.getFretNum(self.maxFret):
-                self.maxFret = self.findMaxFret()
-                print('setTab() setting maxFret=({},{},{}) prevMF=({},{},{})'.format(self.maxFret, chr(self.maxFret), self.getFretNum(self.maxFret), prevTab, chr(prevTab), self.getFretNum(prevTab)), file=self.dbgFile)
-            print('setTab({}, {}) chr(tab)={}, tab={}, check isFret(chr(tab)), htab={}'.format(rr, cc, chr(tab), tab, self.htabs[rr][cc]), file=self.dbgFile)
+                self.journalObj.saveInsert(rr, cc)
+                self.countTabs(self.tabs[rr][-1:], -1, rr)     # the last tab is shifted out of the row
+                self.tabs.insert(cc, [rr])
+                self.htabs.insert(cc, [rr])
+                self.countTabs(self.tabs[rr][cc:cc + 1], 1, rr) # the tab at cc is now in the row twice, until it is overwritten below
+            self.journalObj.save(rr, cc, cc + 1)
+            if self.htabs.test(rr, cc):
+                self.htabs.set(rr, cc, 0)
+                self.log('setTab() cleared htab={}, rr={}, cc={}', self.htabs.test(rr, cc), rr, cc)
+            self.putTab(rr, cc, tab)
+            capTab = tab
+            self.log('setTab({}, {}) chr(tab)={}, tab={}, check isFret(chr(tab)), htab={}', rr, cc, chr(tab), tab, self.htabs.test(rr, cc))
             if self.isFret(chr(tab)):
                 tabFN = self.getFretNum(tab)
                 maxFN = self.getFretNum(self.maxFret)
                 capFN = self.getFretNum(self.capo)
-                print('setTab() chr(tab)={}, tab={}, chr(capo)={}, capo={}, check tabFN:{} + capFN:{} > {}?'.format(chr(tab), tab, chr(self.capo), self.capo, tabFN, capFN, self.NUM_FRETS), file=self.dbgFile)
+                self.log('setTab() chr(tab)={}, tab={}, chr(capo)={}, capo={}, check tabFN:{} + capFN:{} > {}?', chr(tab), tab, chr(self.capo), self.capo, tabFN, capFN, self.NUM_FRETS)
                 if tabFN + capFN > self.NUM_FRETS:
                     info = 'setTab() capFN:{} + tabFN:{} > {}! chr(tab)={}, tab={}, chr(capo)={}, capo={}'.format(capFN, tabFN, self.NUM_FRETS, chr(tab), tab, chr(self.capo), self.capo)
                     self.printe(info)
                     return
-                print('setTab() check tabFn:{} > maxFn:{}? chr(tab)={}, tab={}, chr(mf)={}, maxFret={}'.format(tabFN, maxFN, chr(tab), tab, chr(self.maxFret), self.maxFret), file=self.dbgFile)
-                if tabFN > maxFN: 
-                    self.maxFret = tab
-                    print('setTab() updating maxFret: chr(mf)={}, maxFret={}, maxFN={}'.format(chr(self.maxFret), self.maxFret, self.getFretNum(self.maxFret)), file=self.dbgFile)
+                self.log('setTab() tabFn:{}, maxFn:{}, chr(tab)={}, tab={}, chr(mf)={}, maxFret={}', tabFN, maxFN, chr(tab), tab, chr(self.maxFret), self.maxFret)
                 capTab = self.getFretByte(tabFN + capFN)
-                print('setTab() setting capTab:{} = self.getFretByte(tabFN:{} + capFN:{})'.format(capTab, tabFN, capFN), file=self.dbgFile)
+                self.log('setTab() setting capTab:{} = self.getFretByte(tabFN:{} + capFN:{})', capTab, tabFN, capFN)
             if self.editMode == self.EDIT_MODES['INSERT']:
-                self.printTabs()
+                self.printTails(cc, [rr])
             elif self.editMode == self.EDIT_MODES['REPLACE']:
                 if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
                     if self.isFret(chr(capTab)):
                         note = self.getNote(rr + 1, tab)
                         self.printNote(row + self.numStrings, col, note)
-                        print('setTab() chr(capTab)={} note={}'.format(chr(capTab), note.name), file=self.dbgFile)
+                        self.log('setTab() chr(capTab)={} note={}', chr(capTab), note.name)
                     else:
                         self.prints(chr(capTab), row + self.numStrings, col, self.styles['NAT_NOTE'])
                 self.prints(chr(tab), row, col, self.styles['TABS'])
@@ -1062,7 +1159,7 @@ class Tabs(object):
                         if self.isTab(chr(self.tabs[r][cc])):
                             noteCount += 1
                             if noteCount > 1:
-                                print('setTab() noteCount={}'.format(noteCount), file=self.dbgFile)
+                                self.log('setTab() noteCount={}', noteCount)
                                 self.chordsObj.printChord(c=cc)
                                 break
             self.moveCursor()
@@ -1071,15 +1168,19 @@ class Tabs(object):
             self.printe(info)
 
     def goTo(self):
-        '''Go to tab location specified by user numeric input of up to 3 characters terminated by space char.'''
+        '''Go to tab location specified by user numeric input of up to 3 characters terminated by space char.  The tab number counts from the beginning of the current line
+           and may continue on the following lines, scrolling the viewport if needed.'''
         cc, tmp = '', []
+        self.writerObj.flush()
         while len(tmp) < 3:
             cc = getwch()
             if cc != ' ' and '0' <= cc <= '9' : tmp.append(cc)
             else: break
         if len(tmp):
             c = int(''.join(tmp))
-            self.moveTo(col=c + self.COL_OFF - 1, hi=1)
+            if c < 1: return
+            line = min(self.row2Line(self.row) + (c - 1) // self.numTabsPerStringPerLine, self.numLines - 1)
+            self.moveToLine(line, self.row2Index(self.row), col=(c - 1) % self.numTabsPerStringPerLine + self.COL_OFF)
         
     def goToLastTab(self, cs=0, ll=0):
         '''Go to last tab position on the current line, ll=0, or the last line, ll=1, of all strings, cs=0, or the current string, cs=1.'''
@@ -1088,7 +1189,7 @@ class Tabs(object):
         else:  lineBgn, lineEnd = self.row2Line(self.row) + 1, self.row2Line(self.row)      # lineBgn - 1
         if cs: rowBgn,  rowEnd = self.row2Index(self.row),     self.row2Index(self.row) + 1 # rowBgn + 1
         else:  rowBgn,  rowEnd = 0,                            self.numStrings
-        print('goToLastTab({}, {}) cs={}, ll={}, rowBng={}, rowEnd={}, lineBgn={}, lineEnd={}'.format(self.row, self.col, cs, ll, rowBgn, rowEnd, lineBgn, lineEnd), file=self.dbgFile)
+        self.log('goToLastTab({}, {}) cs={}, ll={}, rowBng={}, rowEnd={}, lineBgn={}, lineEnd={}', self.row, self.col, cs, ll, rowBgn, rowEnd, lineBgn, lineEnd)
         for line in range(lineBgn, lineEnd, -1):
             for r in range(rowBgn, rowEnd):
                 for c in range(line * self.numTabsPerStringPerLine - 1, (line - 1) * self.numTabsPerStringPerLine - 1, -1):
@@ -1096,16 +1197,15 @@ class Tabs(object):
                     if t != '-' and self.isTab(t):
                         if c > cc:
                             rr, cc, ll = r, c, line
-                            print('goToLastTab(updating col) t={}, line={}, r={}, c={}'.format(t, line, r, c), file=self.dbgFile)
+                            self.log('goToLastTab(updating col) t={}, line={}, r={}, c={}', t, line, r, c)
                         break
         if cc > 0:
-            row, col = self.indices2RowCol(rr, cc)
-            print('goToLastTab() row,col=({},{})'.format(row, col), file=self.dbgFile)
-            self.moveTo(row=row, col=col, hi=1)
+            self.log('goToLastTab() rr,cc=({},{})', rr, cc)
+            self.moveToLine(self.colIndex2Line(cc), rr, col=self.index2Col(cc))
 
     def moveCursor(self, row=None, col=None):
         '''Move cursor to the next row and or col using cursor mode (optionally hilite new row and col nums).'''
-        print('moveCursor({}, {}) old: row={}, col={}'.format(row, col, self.row, self.col), file=self.dbgFile)
+        self.log('moveCursor({}, {}) old: row={}, col={}', row, col, self.row, self.col)
         if row != None: self.row = row
         if col != None: self.col = col
         elif self.cursorMode == self.CURSOR_MODES['MELODY']:
@@ -1126,26 +1226,26 @@ class Tabs(object):
                 else:
                     self.row = self.endRow(line)
                     self.moveRight()
-        print('moveCursor({}, {}) new: row={}, col={}'.format(row, col, self.row, self.col), file=self.dbgFile)
+        self.log('moveCursor({}, {}) new: row={}, col={}', row, col, self.row, self.col)
 
     def hiliteRowColNum(self):
         self.hiliteCount += 1
-        print('hiliteRowColNum({}, {}) hilitePrevRowPos={}, hiliteRowNum={}, hiliteColNum={}, hiliteCount={}'.format(self.row, self.col, self.hilitePrevRowPos, self.hiliteRowNum, self.hiliteColNum, self.hiliteCount), file=self.dbgFile)
-        for line in range(0, self.numLines):
+        self.log('hiliteRowColNum({}, {}) hilitePrevRowPos={}, hiliteRowNum={}, hiliteColNum={}, hiliteCount={}', self.row, self.col, self.hilitePrevRowPos, self.hiliteRowNum, self.hiliteColNum, self.hiliteCount)
+        for line in range(0, self.numViewLines):
             row = line * self.lineDelta() + 1
             if self.hiliteColNum != 0:
                 self.printColNum(row, self.hiliteColNum, self.styles['NORMAL'])
         self.hiliteColNum = self.col - self.COL_OFF + 1
-        for line in range(0, self.numLines):
+        for line in range(0, self.numViewLines):
             row = line * self.lineDelta() + 1
             if self.hiliteColNum != 0:
                 self.printColNum(row, self.hiliteColNum, self.styles['BRIGHT'])
                 
         if self.hiliteRowNum != 0:
             self.prints(self.hiliteRowNum, self.hilitePrevRowPos, self.editModeCol, self.styles['NORMAL'] + self.styles['TABS'])
-        self.hiliteRowNum = self.row - self.row2Line(self.row) *  self.lineDelta() - 1
+        self.hiliteRowNum = self.row - (self.row2Line(self.row) - self.topLine) *  self.lineDelta() - 1
         self.hilitePrevRowPos = self.row
-        print('hiliteRowColNum({}, {}) hilitePrevRowPos={}, hiliteRowNum={}, hiliteColNum={}, hiliteCount={}'.format(self.row, self.col, self.hilitePrevRowPos, self.hiliteRowNum, self.hiliteColNum, self.hiliteCount), file=self.dbgFile)
+        self.log('hiliteRowColNum({}, {}) hilitePrevRowPos={}, hiliteRowNum={}, hiliteColNum={}, hiliteCount={}', self.row, self.col, self.hilitePrevRowPos, self.hiliteRowNum, self.hiliteColNum, self.hiliteCount)
         self.prints(self.hiliteRowNum, self.row, self.editModeCol, self.styles['BRIGHT'] + self.styles['TABS'])
         self.resetPos()
 
@@ -1157,26 +1257,25 @@ class Tabs(object):
         tab = self.tabs[r][c]
         tabFN = self.getFretNum(tab)
         maxFN = self.getFretNum(self.maxFret)
-        print('deleteTab({},{},{},{}) tab={}, chr(tab)={}, tabFN={}'.format(row, col, r, c, tab, chr(tab), tabFN, maxFN), file=self.dbgFile)
+        self.log('deleteTab({},{},{},{}) tab={}, chr(tab)={}, tabFN={}', row, col, r, c, tab, chr(tab), tabFN, maxFN)
         if self.editMode == self.EDIT_MODES['INSERT']:
-            for cc in range(c, len(self.tabs[r])):
-                if len(self.tabs[r]) > cc + 1:
-                    self.tabs[r][cc]  = self.tabs[r][cc + 1]
-                    self.htabs[r][cc] = self.htabs[r][cc + 1]
-            self.printTabs()
+            self.journalObj.saveDelete(r, c)
+            self.countTabs(self.tabs[r][c:c + 1], -1, r)
+            self.countTabs(self.tabs[r][-1:], 1, r)            # the last tab stays in place and is also shifted left
+            self.tabs.delete(c, [r])
+            self.htabs.delete(c, [r])
+            self.printTails(c, [r])
         elif self.editMode == self.EDIT_MODES['REPLACE']:
-            self.tabs[r][c] = ord('-')
-            self.htabs[r][c] = ord('0')
+            self.journalObj.save(r, c, c + 1)
+            self.putTab(r, c, ord('-'))
+            self.htabs.set(r, c, 0)
             self.prints(chr(self.tabs[r][c]), row, col, self.styles['TABS'])
             if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
                 self.prints(chr(self.tabs[r][c]), row + self.numStrings, col, self.styles['NAT_NOTE'])
             if self.displayChords == self.DISPLAY_CHORDS['ENABLED']:
-                self.chordsObj.eraseChord(c)
                 self.chordsObj.printChord(c=c)
             self.moveTo(row=row, col=col)
-        if self.isFret(chr(tab)) and tabFN == maxFN:
-            self.maxFret = self.findMaxFret()
-            print('deleteTab() reset maxFret={}, chr(maxFret)={}, maxFN={}, tab={}, chr(tab)={}, tabFN={}'.format(self.maxFret, chr(self.maxFret), self.getFretNum(self.maxFret), tab, chr(tab), tabFN), file=self.dbgFile)
+        self.log('deleteTab() maxFret={}, chr(maxFret)={}, maxFN={}, tab={}, chr(tab)={}, tabFN={}', self.maxFret, chr(self.maxFret), self.getFretNum(self.maxFret), tab, chr(tab), tabFN)
 
     def deletePrevTab(self):
         '''Delete previous tab (backspace).'''
@@ -1185,11 +1284,12 @@ class Tabs(object):
     
     def eraseTabs(self):
         '''Erase all tabs (resets all tabs to '-').'''
-        for r in range(0, len(self.tabs)):
-            for c in range(0, len(self.tabs[r])):
-                self.tabs[r][c] = ord('-')
-                self.htabs[r][c] = ord('0')
-        self.maxFret = ord('0')
+        for r in range(0, self.numStrings):
+            self.journalObj.save(r, 0, len(self.tabs[r]))
+        self.tabs.fill(ord('-'))
+        self.htabs.fill(0)
+        self.fretCounts = [0] * (self.NUM_FRETS + 1)
+        self.keysObj.countAll()
         self.printTabs()
 
     def resetTabs(self):
@@ -1197,7 +1297,14 @@ class Tabs(object):
         self.init()
 
     def saveTabs(self):
-        '''Save all tabs (with ANSI codes) to the configured output file.  Use cat to display the file'''
+        '''Save all tabs (with ANSI codes) to the configured output file.  Use cat to display the file.  [cmd line opt -N saves the native format]'''
+        if self.chordsObj is not None: self.chordsObj.saveCache()
+        if self.fileFormat == self.FILE_FORMATS['NATIVE']:
+            self.saveNativeTabs()
+            return
+        line, r, topLine, numViewLines = self.row2Line(self.row), self.row2Index(self.row), self.topLine, self.numViewLines
+        self.topLine, self.numViewLines = 0, self.numLines     # the file has all the lines, not just the ones in the viewport
+        self.lastRow, self.row = self.ROW_OFF + self.numLines * self.lineDelta() - 1, self.bgnRow(line) + r
         with open(self.outName, 'w') as self.outFile:
             self.printLineInfo('saveTabs({}, {}) bgn writing tabs to file'.format(self.row, self.col))
             self.clearScreen(2, file=self.outFile)
@@ -1208,26 +1315,49 @@ class Tabs(object):
             self.dumpTabs('saveTabs(h)', h=1)
             self.printLineInfo('saveTabs({}, {}) end writing tabs to file'.format(self.row, self.col))
         self.outFile = None
+        self.topLine = topLine
+        self.setView(line, r)
+        self.resetPos()
+
+    def saveNativeTabs(self):
+        '''Save all tabs in the native format, a small header followed by the raw tabs bytes and the packed htabs flags, see parseNativeTabs().'''
+        spelling = self.strings.spelling.encode('ascii')
+        self.printLineInfo('saveNativeTabs({}, {}) bgn writing tabs to file'.format(self.row, self.col))
+        with open(self.outName, 'wb') as outFile:
+            outFile.write(self.NATIVE_HDR.pack(self.NATIVE_MAGIC, self.NATIVE_VERSION, self.capo, self.numTabsPerStringPerLine, self.numLines, len(spelling)))
+            outFile.write(spelling)
+            outFile.write(self.tabs.tobytes())
+            outFile.write(self.htabs.tobytes())
+        self.printLineInfo('saveNativeTabs({}, {}) end writing tabs to file'.format(self.row, self.col))
 
     def shiftSelectTabs(self):
         '''Shift selected tabs (left or right) specified by user numeric input of up to 3 characters terminated by space char.'''
         c, tmp = '', []
+        self.writerObj.flush()
         while len(tmp) <= 3:
             c = getwch()
             if c != ' ': tmp.append(c)
             else: break
         shift = int(''.join(tmp))
         shifted = False
-        print('shiftSelectTabs({}, {})'.format(shift, len(self.selectCols)), file=self.dbgFile)
-        for cc in range(0, len(self.selectCols)):
-            for r in range(0, self.numStrings):
-                c = self.selectCols[cc]
-                if self.isFret(chr(self.tabs[r][c])):
-                    if self.tabs[r][c] + shift >= ord('0') - 1:
-                        self.tabs[r][c] = self.tabs[r][c] + shift
-                        shifted = True
-                        print('shiftSelectTabs() r,c,tab=({},{},{})'.format(r, c, chr(self.tabs[r][c])), file=self.dbgFile)
-                    else: self.printe('shiftSelectTabs() Lower than open string! r,c,tab=({},{},{})'.format(self.row, self.col, chr(self.tabs[r][c])))
+        self.log('shiftSelectTabs({}, {})', shift, len(self.selectCols))
+        table, outOfRange = bytearray(range(256)), set()       # translate() table of fret byte -> shifted fret byte, and the fret bytes that can not be shifted
+        for fret in range(0, self.NUM_FRETS + 1):
+            if 0 <= fret + shift <= self.NUM_FRETS: table[self.getFretByte(fret)] = self.getFretByte(fret + shift)
+            else:                                   outOfRange.add(self.getFretByte(fret))
+        for c in self.selectCols:
+            tabs = self.tabs.col(c)
+            if outOfRange & set(tabs):
+                self.printe('shiftSelectTabs() Lower than open string or higher than fret {}! c={}, tabs={}, shift={}'.format(self.NUM_FRETS, c, tabs, shift))
+            shiftedTabs = tabs.translate(table)
+            if shiftedTabs != tabs:
+                for r in range(0, self.numStrings):
+                    self.journalObj.save(r, c, c + 1)
+                self.countTabs(tabs, -1)
+                self.countTabs(shiftedTabs)
+                self.tabs.setCol(c, shiftedTabs)
+                shifted = True
+                self.log('shiftSelectTabs() c={}, tabs={}, shiftedTabs={}', c, tabs, shiftedTabs)
         if shifted:
             self.printTabs()
 
@@ -1243,9 +1373,9 @@ class Tabs(object):
         self.printSelectTabs(info='copySelectTabs()', cols=1)
         for r in range(0, nsr):
             self.selectTabs.append(bytearray([ord(' ')] * size))
-            self.selectHTabs.append(bytearray([ord('0')] * size))
+        self.selectHTabs = bits.Bits(nsr, size)
         nst = len(self.selectTabs[0])
-        print('copySelectTabs({},{}) row={}, col={}, ns={}, nsr={}, nsc={}, nt={}, nst={}, nc={}'.format(arpg, self.cursorDir, self.row, self.col, ns, nsr, nsc, nt, nst, nc), file=self.dbgFile)
+        self.log('copySelectTabs({},{}) row={}, col={}, ns={}, nsr={}, nsc={}, nt={}, nst={}, nc={}', arpg, self.cursorDir, self.row, self.col, ns, nsr, nsc, nt, nst, nc)
         for c in range(0, nc):
             cc = self.selectCols[c]
             for r in range(0, nsr):
@@ -1257,18 +1387,17 @@ class Tabs(object):
                 elif arpg == 1:
                     if   self.cursorDir == self.CURSOR_DIRS['DOWN']: cst, ct = c * nsr + r, cc
                     elif self.cursorDir == self.CURSOR_DIRS['UP']:   cst, ct = (c + 1) * nsr - r - 1, cc
-                print('copySelectTabs({},{}) r={},  ={}, c={}, cc={}, cst={}, ct={}, '.format(arpg, self.cursorDir, r, rr, c, cc, cst, ct), end='', file=self.dbgFile)
                 self.selectTabs[r][cst]  = self.tabs[rr][ct]
-                self.selectHTabs[r][cst] = self.htabs[rr][ct]
-                print('selectTabs[{}][{}]={}, tabs[{}][{}]={}'.format(r, cst, chr(self.selectTabs[r][cst]), rr, ct, chr(self.tabs[rr][ct])), file=self.dbgFile)
+                self.selectHTabs.set(r, cst, self.htabs.test(rr, ct))
+                self.log('copySelectTabs({},{}) r={}, rr={}, c={}, cc={}, cst={}, ct={}, selectTabs[{}][{}]={:c}, tabs[{}][{}]={:c}', arpg, self.cursorDir, r, rr, c, cc, cst, ct, r, cst, self.selectTabs[r][cst], rr, ct, self.tabs[rr][ct])
             self.printSelectTabs(info='copySelectTabs()')
             
     def deleteSelectTabs(self, delSel=True):
         '''Delete selected tabs.'''
-#        print('deleteSelectTabs(): {', end='', file=self.dbgFile)
+#        print('deleteSelectTabs(): {', end='', file=self.log)
 #        for c in range(0, len(self.selectCols)):
-#            print('{}'.format(self.selectCols[c]), end=',', file=self.dbgFile)
-#        print('}', file=self.dbgFile)
+#            print('{}'.format(self.selectCols[c]), end=',', file=self.log)
+#        self.log('}')
         self.printLineInfo('deleteSelectTabs({}, {})'.format(self.row, self.col))
         self.selectCols.sort(key = int, reverse = True)
         for c in range(0, len(self.selectCols)):
@@ -1277,7 +1406,6 @@ class Tabs(object):
             self.selectCols = []
         if self.displayChords == self.DISPLAY_NOTES['ENABLED']:
             self.chordsObj.printChords()
-        self.maxFret = self.findMaxFret()
         self.resetPos()
 
     def cutSelectTabs(self, arpg=0):
@@ -1286,27 +1414,30 @@ class Tabs(object):
         self.deleteSelectTabs(delSel=False)
     
     def printSelectTabs(self, info='', cols=0):
-        print('printSelectTabs(cols={}, info={}) len(selectCols)={}, len(selectTabs)={}'.format(cols, info, len(self.selectCols), len(self.selectTabs)), file=self.dbgFile)
+        self.log('printSelectTabs(cols={}, info={}) len(selectCols)={}, len(selectTabs)={}', cols, info, len(self.selectCols), len(self.selectTabs))
         if cols:
             for c in range(0, len(self.selectCols)):
-                print('    selectCols[{}]={}'.format(c, self.selectCols[c]), file=self.dbgFile)
+                self.log('    selectCols[{}]={}', c, self.selectCols[c])
         for c in range(0, len(self.selectTabs)):
-            print('    selectTabs[{}]={}'.format(c, self.selectTabs[c]), file=self.dbgFile)
+            self.log('    selectTabs[{}]={}', c, self.selectTabs[c])
 
     def deleteTabs(self, cc):
         row, col = self.indices2RowCol(0, cc)
+        for r in range(0, self.numStrings):
+            if self.editMode == self.EDIT_MODES['INSERT']: self.journalObj.saveDelete(r, cc)
+            else:                                          self.journalObj.save(r, cc, cc + 1)
 #        self.dumpTabs('deleteTabs({}, {}) (row,col)=({},{}), cc={} bgn: '.format(self.row, self.col, row, col, cc))
         if self.editMode == self.EDIT_MODES['INSERT']:
-            for r in range(0, self.numStrings):
-                for c in range(cc, len(self.tabs[r]) - 1):
-                    self.tabs[r][c] = self.tabs[r][c + 1]
-                    self.htabs[r][c] = self.htabs[r][c + 1]
-            self.printTabs()
+            self.countTabs(self.tabs.col(cc), -1)
+            self.countTabs(self.tabs.col(len(self.tabs[0]) - 1))   # the last column stays in place and is also shifted left
+            self.tabs.delete(cc)
+            self.htabs.delete(cc)
+            self.printTails(cc)
         elif self.editMode == self.EDIT_MODES['REPLACE']:
             for r in range(0, self.numStrings):
                 tab = ord('-')
-                self.tabs[r][cc] = tab
-                self.htabs[r][cc] = ord('0')
+                self.putTab(r, cc, tab)
+                self.htabs.set(r, cc, 0)
                 if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
                     if self.isFret(chr(tab)):
                         self.printNote(r + row + self.numStrings, col, self.getNote(r + 1, tab))
@@ -1316,38 +1447,46 @@ class Tabs(object):
 #        self.dumpTabs('deleteTabs({}, {}) col={} end: '.format(self.row, self.col, col))
 
     def _initPasteInfo(self):
-        nc, rangeError, row, col = 0, 0, self.row, self.col
+        nc, rangeError, row, col, rr, cc = 0, 0, self.row, self.col, 0, 0
         line, ns, nt, nsr, nsc, nst = self.row2Line(self.row), self.numStrings, len(self.tabs[0]), len(self.selectRows), len(self.selectCols), len(self.selectTabs)
         if nst == 0:
             self.printe('pasteSelectTabs() no tabs to paste, nsr={}, nsc={}, nst={}, use CTRL/SHIFT C or X to copy or cut selected tabs'.format(nsr, nsc, nst))
             return rangeError, nc, row, col, rr, cc, line, ns, nt, nsr, nsc, nst
         nst, br, er = len(self.selectTabs[0]), self.bgnRow(line), self.endRow(line)
-        print('pasteSelectTabs({},{}) ({},{}) bgn ns={}, nt={}, nsr={}, nsc={}, nst={}, line={}, br={}, er={}'.format(self.arpeggiate, self.cursorDir, row, col, ns, nt, nsr, nsc, nst, line, br, er), file=self.dbgFile)
+        self.log('pasteSelectTabs({},{}) ({},{}) bgn ns={}, nt={}, nsr={}, nsc={}, nst={}, line={}, br={}, er={}', self.arpeggiate, self.cursorDir, row, col, ns, nt, nsr, nsc, nst, line, br, er)
         while row + nsr - 1 > er:
             row -= 1
             if row < br: self.printe('pasteSelectTabs() tried to adjust row={} < br={}, nsr={}'.format(row, br, nsr))
-            print('pasteSelectTabs(--row) row={} + nsr={} - 1 <= er={}'.format(row, nsr, er), file=self.dbgFile)
+            self.log('pasteSelectTabs(--row) row={} + nsr={} - 1 <= er={}', row, nsr, er)
         rr, cc = self.rowCol2Indices(row, col)
         if self.arpeggiate is None: nc = nsc
         else:                       nc = nst
-        print('pasteSelectTabs({},{}) row={}, col={}, rr={}, cc={}, nc={}'.format(self.arpeggiate, self.cursorDir, row, col, rr, cc, nc), file=self.dbgFile)
+        self.log('pasteSelectTabs({},{}) row={}, col={}, rr={}, cc={}, nc={}', self.arpeggiate, self.cursorDir, row, col, rr, cc, nc)
         if self.editMode == self.EDIT_MODES['INSERT']:
-            for c in range(len(nt - 1, cc - 1, -1)):
-                for r in range(0, nsr):
-                    if c >= nc + cc:
-                        self.tabs[r][c] = self.tabs[r][c - nc]
-                        self.htabs[r][c] = self.htabs[r][c - nc]
-                        print('pasteSelectTabs(INSERT) c={} >= cc={} + nc={}, tabs[{}][{}]={}'.format(c, cc, nc, r, c, chr(self.tabs[r][c])), file=self.dbgFile)
-                    elif self.arpeggiate:
-                        self.tabs[r][c] = ord('-')
-                        self.htabs[r][c] = ord('-')
-                        print('pasteSelectTabs(INSERT) c={} < cc={} + nst={}, tabs[{}][{}]={}'.format(c, cc, nst, r, c, chr(self.tabs[r][c])), file=self.dbgFile)
+            for r in range(rr, rr + nsr):
+                self.journalObj.saveInsert(r, cc, nc)
+        else:
+            for r in sorted(set(range(0, nsr)) | set(range(rr, rr + nsr))):  # the arpeggio is cleared from string 0, it is pasted from string rr
+                self.journalObj.save(r, cc, cc + nst)
+        if self.editMode == self.EDIT_MODES['INSERT']:
+            n = min(nc, nt - cc)                               # number of tabs shifted out of the row, fewer than nc near the end of the row
+            for r in range(rr, rr + nsr):
+                self.countTabs(self.tabs[r][nt - n:], -1, r)   # the last n tabs are shifted out of the row
+                self.tabs.insert(cc, [r], nc)
+                self.htabs.insert(cc, [r], nc)
+                self.journalObj.save(r, cc, cc + n)            # the tabs pasted in the inserted columns
+                self.countTabs(self.tabs[r][cc:cc + n], 1, r)  # the tabs from cc to cc + n are now in the row twice, until they are overwritten below
+                self.log('pasteSelectTabs(INSERT) shifted tabs[{}][{}:] right by nc={}', r, cc, nc)
+                if self.arpeggiate:
+                    for c in range(cc, cc + n):
+                        self.putTab(r, c, ord('-'))
+                        self.htabs.set(r, c, 0)
         elif self.editMode == self.EDIT_MODES['REPLACE'] and self.arpeggiate and cc + nst < nt:
             for c in range(cc, cc + nst):
                 for r in range(0, nsr):
-                    self.tabs[r][c] = ord('-')
-                    self.htabs[r][c] = ord('-')
-                    print('pasteSelectTabs(REPLACE) tabs[{}][{}]={}'.format(r, c, chr(self.tabs[r][c])), file=self.dbgFile)
+                    self.putTab(r, c, ord('-'))
+                    self.htabs.set(r, c, 0)
+                    self.log('pasteSelectTabs(REPLACE) tabs[{}][{}]={}', r, c, chr(self.tabs[r][c]))
         for c in range(0, nsc):
             if rangeError: break
             for r in range(0, nsr):
@@ -1355,18 +1494,17 @@ class Tabs(object):
                     if   self.cursorDir == self.CURSOR_DIRS['DOWN']: ccc = c * nsr + r
                     elif self.cursorDir == self.CURSOR_DIRS['UP']:   ccc = (c + 1) * nsr - r - 1
                 else: ccc = c
-                print('pasteSelectTabs(check) r={}, rr={}, c={}, cc={}, ccc={}, nt={}, nst={}'.format(r, rr, c, cc, ccc, nt, nst), end='', file=self.dbgFile)
+                self.log('pasteSelectTabs(check) r={}, rr={}, c={}, cc={}, ccc={}, nt={}, nst={}', r, rr, c, cc, ccc, nt, nst)
                 if c < nst:
                     if ccc + cc < nt:
-                        self.tabs[r + rr][ccc + cc] = self.selectTabs[r][ccc]
-                        self.htabs[r + rr][ccc + cc] = self.selectHTabs[r][ccc]
-                        print(', selectTabs[{}][{}]={}, tabs[{}][{}]={}'.format(r, ccc, chr(self.selectTabs[r][ccc]), r + rr, ccc + cc, chr(self.tabs[r + rr][ccc + cc])), file=self.dbgFile)
+                        self.putTab(r + rr, ccc + cc, self.selectTabs[r][ccc])
+                        self.htabs.set(r + rr, ccc + cc, self.selectHTabs.test(r, ccc))
+                        self.log('pasteSelectTabs() selectTabs[{}][{}]={:c}, tabs[{}][{}]={:c}', r, ccc, self.selectTabs[r][ccc], r + rr, ccc + cc, self.tabs[r + rr][ccc + cc])
                     else:
-                        print(file=self.dbgFile)
                         self.printe('pasteSelectTabs() ccc={} + cc={} >= len(tabs[0])={} skip remaining rows and columns'.format(ccc, cc, len(self.tabs[0])))
                         rangeError = 1
                         break
-            print('pasteSelectTabs(loop1) c={}, sc={}'.format(c, self.selectCols[c]), file=self.dbgFile)
+            self.log('pasteSelectTabs(loop1) c={}, sc={}', c, self.selectCols[c])
             if not rangeError: self.selectStyle(self.selectCols[c], self.styles['NORMAL'], rList=self.selectRows)
         return rangeError, nc, row, col, rr, cc, line, ns, nt, nsr, nsc, nst
         
@@ -1375,7 +1513,7 @@ class Tabs(object):
         rangeError, nc, row, col, rr, cc, line, ns, nt, nsr, nsc, nst = self._initPasteInfo()
         if nst == 0: return
         if self.editMode == self.EDIT_MODES['INSERT']:
-            self.printTabs()
+            self.printTails(cc, range(rr, rr + nsr))
         elif self.editMode == self.EDIT_MODES['REPLACE']:
             for c in range(cc, cc + nc):
                 if c >= len(self.tabs[0]):
@@ -1384,22 +1522,20 @@ class Tabs(object):
                 col = self.index2Col(c)
                 if c % self.numTabsPerStringPerLine == 0:
                     row += self.lineDelta()
-                    print('pasteSelectTabs(wrap) row={}, col={}, c={}'.format(row, col, c), file=self.dbgFile)
+                    self.log('pasteSelectTabs(wrap) row={}, col={}, c={}', row, col, c)
                 for r in range(rr, rr + nsr):
                     row = self.indices2Row(r, c)
                     tab = self.tabs[r][c]
-                    print('pasteSelectTabs(loop2) row={}, col={}, r={}, c={}, tab[{}][{}]={}'.format(row, col, r, c, r, c, chr(tab)), file=self.dbgFile)
+                    self.log('pasteSelectTabs(loop2) row={}, col={}, r={}, c={}, tab[{}][{}]={}', row, col, r, c, r, c, chr(tab))
                     if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
                         if self.isFret(chr(tab)):
-                            if self.htabs[r][c] == ord('1'):
-                                note = self.getHarmonicNote(r + 1, tab)
-                                self.printNote(row + r + self.numStrings, col, note, hn=1)
+                            if self.htabs.test(r, c):
+                                self.printTabNote(row + r + self.numStrings, col, r, tab, hn=1)
                             else:
-                                note = self.getNote(r + 1, tab)
-                                self.printNote(row + self.numStrings, col, note)
+                                self.printTabNote(row + self.numStrings, col, r, tab)
                         else:
                             self.prints(chr(tab), row + self.numStrings, col, self.styles['NAT_NOTE'])
-                    if self.htabs[r][c] == ord('1'):
+                    if self.htabs.test(r, c):
                         self.prints(chr(tab), row, col, self.styles['H_TABS'])
                     else:
                         self.prints(chr(tab), row, col, self.styles['TABS'])
@@ -1413,40 +1549,42 @@ class Tabs(object):
         self.dumpTabs('pasteSelectTabs({},{}) end row={}, col={}'.format(self.arpeggiate, self.cursorDir, row, col))
 
     def dumpTabs(self, reason='', h=None):
-        print('dumpTabs({})'.format(reason), file=self.dbgFile)
+        if not self.log.on(): return
+        self.log('dumpTabs({})', reason)
         for line in range(0, self.numLines):
             for r in range(0, self.numStrings): #len(self.tabs)):
                 if r == 0:
-                    print('L={}: '.format(line), end='', file=self.dbgFile)
+                    print('L={}: '.format(line), end='', file=self.log)
                     for c in range(0, self.numTabsPerStringPerLine):
-                        print('{}'.format(self.getColMod(c)), end='', file=self.dbgFile)
-                    print(file=self.dbgFile)
-                print('R={}: '.format(r), end='', file=self.dbgFile)
+                        print('{}'.format(self.getColMod(c)), end='', file=self.log)
+                    print(file=self.log)
+                print('R={}: '.format(r), end='', file=self.log)
                 for c in range(0, self.numTabsPerStringPerLine):
                     if h is None:
-                        print(chr(self.tabs[r][c + line * self.numTabsPerStringPerLine]), end='', file=self.dbgFile)
+                        print(chr(self.tabs[r][c + line * self.numTabsPerStringPerLine]), end='', file=self.log)
                     else:
-                        print(chr(self.htabs[r][c + line * self.numTabsPerStringPerLine]), end='', file=self.dbgFile)
-                print('', file=self.dbgFile)
+                        print(self.htabs.test(r, c + line * self.numTabsPerStringPerLine), end='', file=self.log)
+                self.log('')
     
     def printLineInfo(self, reason):
-        print('{} numStrings={}, numLines={}, lineDelta={},'.format(reason, self.numStrings, self.numLines, self.lineDelta()), end='', file=self.dbgFile)
+        if not self.log.on(): return
+        print('{} numStrings={}, numLines={}, lineDelta={},'.format(reason, self.numStrings, self.numLines, self.lineDelta()), end='', file=self.log)
         for line in range(0, self.numLines):
-            print(' bgnRow{}={}, endRow{}={},'.format(line, self.bgnRow(line), line, self.endRow(line)), end='', file=self.dbgFile)
-        print(' lastRow={}, bgnCol={}, endCol={}'.format(self.lastRow, self.bgnCol(), self.endCol()), file=self.dbgFile)
+            print(' bgnRow{}={}, endRow{}={},'.format(line, self.bgnRow(line), line, self.endRow(line)), end='', file=self.log)
+        self.log(' lastRow={}, bgnCol={}, endCol={}', self.lastRow, self.bgnCol(), self.endCol())
     
     def printTabs(self):
-        '''Print tabs using ANSI escape sequences to control the cursor position, foreground and background colors, and brightness'''
+        '''Print the tabs of the lines in the viewport using ANSI escape sequences to control the cursor position, foreground and background colors, and brightness'''
         self.printLineInfo('printTabs({}, {}) bgn'.format(self.row, self.col))
-        if self.outFile == None: self.clearScreen()
+        if self.outFile == None: self.screenObj.bgnFrame(self.lastRow, self.endCol())
         self.printFileMark('<BGN_TABS_SECTION>')
-        for line in range(0, self.numLines):
+        for line in range(self.topLine, self.topLine + self.numViewLines):
             for r in range(0, self.numStrings):
-                row = r + line * self.lineDelta() + self.ROW_OFF
+                row = r + self.bgnRow(line)
                 for c in range(0, self.numTabsPerStringPerLine):
                     tab = self.tabs[r][c + line * self.numTabsPerStringPerLine]
                     style = self.styles['TABS']
-                    if chr(self.htabs[r][c + line * self.numTabsPerStringPerLine]) == '1':
+                    if self.htabs.test(r, c + line * self.numTabsPerStringPerLine):
                         style = self.styles['H_TABS']
                     if c == 0:
                         self.prints('{}'.format(r + 1), row, self.editModeCol, style)
@@ -1455,36 +1593,29 @@ class Tabs(object):
                         elif self.cursorDir == self.CURSOR_DIRS['UP']:
                             self.prints(chr(self.capo), row, self.cursorModeCol, self.styles['NUT_UP'])
                     self.prints(chr(tab), row, c + self.COL_OFF, style)
-                print(file=self.outFile)
-            print()
+                if self.outFile != None: print(file=self.outFile)
         self.printFileMark('<END_TABS_SECTION>')
         if self.displayNotes == self.DISPLAY_NOTES['ENABLED']:
             self.printFileMark('<BGN_NOTES_SECTION>')
-            for line in range(0, self.numLines):
+            for line in range(self.topLine, self.topLine + self.numViewLines):
                 for r in range(0, self.numStrings):
-                    row = r + line * self.lineDelta() + self.endRow(0) + 1
+                    row = r + self.endRow(line) + 1
                     for c in range (0, self.numTabsPerStringPerLine):
                         capTab = tab = self.tabs[r][c + line * self.numTabsPerStringPerLine]
                         if self.isFret(chr(tab)):
                             capTab = self.getFretByte(self.getFretNum(tab) + self.getFretNum(self.capo))
                         if c == 0:
-                            n = self.getNote(r + 1, ord('0'))
-                            self.printNote(row, self.editModeCol, n)
+                            self.printTabNote(row, self.editModeCol, r, ord('0'))
                             if self.cursorDir == self.CURSOR_DIRS['DOWN']:
                                 self.prints(chr(self.capo), row, self.cursorModeCol, self.styles['NUT_DN'])
                             elif self.cursorDir == self.CURSOR_DIRS['UP']:
                                 self.prints(chr(self.capo), row, self.cursorModeCol, self.styles['NUT_UP'])
                         if self.isFret(chr(capTab)):
-                            if chr(self.htabs[r][c + line * self.numTabsPerStringPerLine]) == '1':
-                                print('printTabs() tab={}, capTab={}, chr(tab)={}, chr(capTab)={}, tabFN={}, capoFN={}'.format(tab, capTab, chr(tab), chr(capTab), self.getFretNum(tab), self.getFretNum(capTab)), file=self.dbgFile)
-                                n = self.getHarmonicNote(r + 1, tab)
-                                self.printNote(row, c + self.COL_OFF, n, hn=1)
-                            else:
-                                n = self.getNote(r + 1, tab)
-                                self.printNote(row, c + self.COL_OFF, n)
+                            hn = self.htabs.test(r, c + line * self.numTabsPerStringPerLine)
+                            if hn and self.log.on(): self.log('printTabs() tab={}, capTab={}, chr(tab)={}, chr(capTab)={}, tabFN={}, capoFN={}', tab, capTab, chr(tab), chr(capTab), self.getFretNum(tab), self.getFretNum(capTab))
+                            self.printTabNote(row, c + self.COL_OFF, r, tab, hn=hn)
                         else: self.prints(chr(tab), row, c + self.COL_OFF, self.styles['NAT_NOTE'])
-                    print(file=self.outFile)
-                print()
+                    if self.outFile != None: print(file=self.outFile)
             self.printFileMark('<END_NOTES_SECTION>')
         if self.displayChords == self.DISPLAY_CHORDS['ENABLED']:
             self.printFileMark('<BGN_CHORDS_SECTION>')
@@ -1492,8 +1623,8 @@ class Tabs(object):
             self.printFileMark('<END_CHORDS_SECTION>')
         if self.displayLabels == self.DISPLAY_LABELS['ENABLED']:
             self.printFileMark('<BGN_LABELS_SECTION>')
-            for line in range(0, self.numLines):
-                r = line * self.lineDelta() + 1
+            for line in range(self.topLine, self.topLine + self.numViewLines):
+                r = (line - self.topLine) * self.lineDelta() + 1
                 if self.outFile == None:
                     self.printCursorAndEditModes(r)
                 else: 
@@ -1502,10 +1633,29 @@ class Tabs(object):
                 self.printColNums(r)
                 if self.outFile != None: print(file=self.outFile)
 #            self.printFileMark('<END_LABELS_SECTION>')
+        if self.outFile == None: self.screenObj.endFrame()
         if self.row > 0 and self.col > 0:
             print(self.CSI + self.styles['NORMAL'] + self.styles['CONS'] + self.CSI + '{};{}H'.format(self.row, self.col), end='') # restore the console cursor to the given position (row, col) and set the foreground and background color
         self.printLineInfo('printTabs({}, {}) end'.format(self.row, self.col))
 
+    def printTails(self, c, rList=None, end=None):
+        '''Print the tabs and notes of the strings in rList, default all the strings, from tab index c to end, default the end of the viewport, and the chords of those columns.
+           Used after an insert or a delete shifts the rest of a row, the frame keeps the rest of the screen and only the cells that changed are written.'''
+        if not self.screenObj.isShown(self.lastRow, self.endCol()):
+            self.printTabs()
+            return
+        self.log('printTails({}, {}) c={}, rList={}, end={}', self.row, self.col, c, rList, end)
+        viewEnd = (self.topLine + self.numViewLines) * self.numTabsPerStringPerLine
+        end = viewEnd if end is None else min(end, viewEnd)
+        self.screenObj.bgnFrame(self.lastRow, self.endCol(), keep=True)
+        for r in range(0, self.numStrings) if rList is None else rList:
+            for cc in range(max(c, self.topLine * self.numTabsPerStringPerLine), end):
+                self.selectRowStyle(r, cc, '')
+        if self.displayChords == self.DISPLAY_CHORDS['ENABLED']:
+            self.chordsObj.printChords(c, end)
+        self.screenObj.endFrame()
+        self.resetPos()
+
     def printFileMark(self, mark):
         if self.outFile != None:
             if mark == '<BGN_TABS_SECTION>' or mark == '<END_TABS_SECTION>':
@@ -1540,13 +1690,22 @@ class Tabs(object):
         style = self.getNoteStyle(note, style, hn)
         self.prints(note.name[0], row, col, style)
 
+    def printTabNote(self, row, col, r, tab, style='', hn=0):
+        '''Print the note of the tab fret number byte on string index r, the note and its style are looked up in the note table.'''
+        entry = self.getNoteTable()[r][hn][tab]
+        if entry is None:
+            self.printNote(row, col, self.getHarmonicNote(r + 1, tab) if hn else self.getNote(r + 1, tab), style, hn or None)
+        else:
+            self.prints(entry[0].name[0], row, col, style + entry[1])
+
     def printStatus(self):
         r, c = self.rowCol2Indices(self.row, self.col)
         tab = chr(self.tabs[r][c])
-        print('printStatus({}, {}) r={}, c={}, tab={}'.format(self.row, self.col, r, c, tab), file=self.dbgFile)
+        self.log('printStatus({}, {}) r={}, c={}, tab={}', self.row, self.col, r, c, tab)
         if   self.isFret(tab): self.printTabFretInfo(tab, r, c)
         elif tab in self.mods: self.printTabModInfo(tab, r, c)
         else:                  self.printDefTabInfo(tab, r, c)
+        print(self.CSI + self.styles['STATUS'] + ' ' + self.keysObj.getInfo(), end='', file=self.outFile)
         self.clearRow(arg=0, file=self.outFile)
         self.resetPos()
         
@@ -1554,12 +1713,12 @@ class Tabs(object):
         s, ss = r + 1, self.getOrdSfx(r + 1)
         f, fs = self.getFretNum(ord(tab)), self.getOrdSfx(self.getFretNum(ord(tab)))
         statStyle, fretStyle, typeStyle, noteStyle = self.CSI + self.styles['STATUS'], self.CSI + '32;40m', self.CSI + '33;40m', self.CSI + '32;40m'
-        if self.htabs[r][c] == ord('1'): n, noteType, tabStyle = self.getHarmonicNote(s, ord(tab)), 'harmonic', self.CSI + self.styles['H_TABS']
+        if self.htabs.test(r, c): n, noteType, tabStyle = self.getHarmonicNote(s, ord(tab)), 'harmonic', self.CSI + self.styles['H_TABS']
         else:                            n, noteType, tabStyle = self.getNote(s, ord(tab)), None, self.CSI + self.styles['TABS']
         if len(n.name) > 1:
             if n.name[1] == '#': noteStyle = self.CSI + '31;40m'
             else:                noteStyle = self.CSI + '36;40m'
-        print('printTabFretInfo({}) r={}, c={}, tab={}, n.n={}, n.o={}, n.i={}, {}'.format(noteType, r, c, tab, n.name, n.getOctaveNum(), n.index, n.getPhysProps()), file=self.dbgFile)
+        if self.log.on(): self.log('printTabFretInfo({}) r={}, c={}, tab={}, n.n={}, n.o={}, n.i={}, {}', noteType, r, c, tab, n.name, n.getOctaveNum(), n.index, n.getPhysProps())
         print(tabStyle + self.CSI + '{};{}H{}'.format(self.lastRow, 1, tab), end='', file=self.outFile)
         if f != 0: print(fretStyle + ' {}{}'.format(s, ss) + statStyle + ' string ' + fretStyle + '{}{}'.format(f, fs) + statStyle + ' fret ', end='', file=self.outFile)
         else:      print(fretStyle + ' {}{}'.format(s, ss) + statStyle + ' string ' + fretStyle + 'open' + statStyle + ' fret ', end='', file=self.outFile)
@@ -1574,39 +1733,40 @@ class Tabs(object):
         prevFN, nextFN, prevNote, nextNote, dir1, dir2 = None, None, None, None, None, None
         if self.isFret(chr(self.tabs[r][c-1])): 
             prevFN = self.getFretNum(self.tabs[r][c-1])
-            if self.htabs[r][c-1] == ord('1'): 
+            if self.htabs.test(r, c-1): 
                 prevNote = self.getHarmonicNote(s, self.tabs[r][c-1])
                 ph=1
             else: prevNote = self.getNote(s, self.tabs[r][c-1])
         if self.isFret(chr(self.tabs[r][c+1])): 
             nextFN = self.getFretNum(self.tabs[r][c+1])
-            if self.htabs[r][c+1] == ord('1'): 
+            if self.htabs.test(r, c+1): 
                 nextNote = self.getHarmonicNote(s, self.tabs[r][c+1])
                 nh=1
             else: nextNote = self.getNote(s, self.tabs[r][c+1])
         if prevFN is not None and nextFN is not None:
             if   prevFN < nextFN: dir1, dir2 = 'up',   'on'
             elif prevFN > nextFN: dir1, dir2 = 'down', 'off'
-        print('printTabModInfo({}, {}) tab={}, pfn={}, nfn={}'.format(r, c, tab, prevFN, nextFN), file=self.dbgFile)
+        self.log('printTabModInfo({}, {}) tab={}, pfn={}, nfn={}', r, c, tab, prevFN, nextFN)
         self.modsObj.setMods(dir1=dir1, dir2=dir2, prevFN=prevFN, nextFN=nextFN, prevNote=prevNote, nextNote=nextNote, ph=ph, nh=nh)
         print(self.CSI + self.styles['TABS'] + self.CSI + '{};{}H{} '.format(self.lastRow, 1, tab), end='', file=self.outFile)
         print(self.CSI + self.styles['TABS'] + '{}{}'.format(s, ss) + self.CSI + self.styles['STATUS'] + ' string {}'.format(self.mods[tab]), end='', file=self.outFile)
     
     def printDefTabInfo(self, tab, r, c):
         s, ss, tabStyle, statStyle = r + 1, self.getOrdSfx(r + 1), self.CSI + self.styles['TABS'], self.CSI + self.styles['STATUS']
-        print('printDefTabInfo({}, {}) tab={}'.format(r, c, tab), file=self.dbgFile)
+        self.log('printDefTabInfo({}, {}) tab={}', r, c, tab)
         print(tabStyle + self.CSI + '{};{}H{} '.format(self.lastRow, 1, tab), end='', file=self.outFile)
         print(tabStyle + '{}{}'.format(s, ss) + statStyle + ' string ' + tabStyle + 'muted' + statStyle + ' not played', end='', file=self.outFile)
     
     def prints(self, c, row, col, style):
-       print(self.CSI + style + self.CSI + '{};{}H{}'.format(row, col, str(c)), end='', file=self.outFile)
+        if self.outFile == None: self.screenObj.put(row, col, str(c), style)
+        else:                    print(self.CSI + style + self.CSI + '{};{}H{}'.format(row, col, str(c)), end='', file=self.outFile)
 
     def printe(self, info, row=None, col=None, style=None):
         if row is None: row=self.row
         if col is None: col=self.col
         if style == None: style = self.styles['ERROR']
         info = 'ERROR! printe({}, {}) {}'.format(row, col, info)
-        print(info, file=self.dbgFile)
+        self.log.err(info)
         print(self.CSI + style + self.CSI + '{};{}H{}'.format(self.lastRow, 1, info), end='')
         self.clearRow(arg=0, file=self.outFile)
         self.resetPos()
@@ -1615,25 +1775,53 @@ class Tabs(object):
         return self.CSI + self.styles['ERROR'] + text + self.CSI + self.styles['CONS']
         
     def getNote(self, str, tab):
-        '''Return note object given string number and tab fret number byte.'''
+        '''Return the shared note object given string number and tab fret number byte, see getNoteTable().'''
+        entry = self.getNoteTable()[str - 1][0][tab]
+        return entry[0] if entry else self.newNote(str, tab)
+
+    def getHarmonicNote(self, str, tab):
+        '''Return the shared harmonic note object given string number and tab fret number byte, see getNoteTable().'''
+        entry = self.getNoteTable()[str - 1][1][tab]
+        return entry[0] if entry else self.newHarmonicNote(str, tab)
+
+    def getNoteTable(self):
+        '''Return the note table, built once for each tuning, capo, and enharmonic setting.  noteTable[r][hn][tab] is the shared (note, style) pair of string index r,
+           harmonic flag hn, and tab fret number byte, or None if tab is not a fret or not a harmonic fret.  The style is the note style suffix, see getNoteStyle().'''
+        if self.noteTable is None:
+            frets = [self.getFretByte(fn) for fn in range(0, self.NUM_FRETS + 1)]
+            self.noteTable = []
+            for r in range(0, self.numStrings):
+                entries = ([None] * 256, [None] * 256)
+                for tab in frets:
+                    note = self.newNote(r + 1, tab)
+                    entries[0][tab] = (note, self.getNoteStyle(note, ''))
+                    if self.getFretNum(tab) in self.HARMONIC_FRETS:
+                        note = self.newHarmonicNote(r + 1, tab)
+                        entries[1][tab] = (note, self.getNoteStyle(note, '', hn=1))
+                self.noteTable.append(entries)
+            self.log('getNoteTable() built the notes of numStrings={}, capo={}, enharmonic={}', self.numStrings, chr(self.capo), self.enharmonic)
+        return self.noteTable
+
+    def newNote(self, str, tab):
+        '''Return the interned note object given string number and tab fret number byte, computed without the note table.'''
         fret = self.getFretNum(tab)
         cfret = fret + self.getFretNum(self.capo)
-        return notes.Note(self.getNoteIndex(str, cfret), self.enharmonic)
+        return notes.Note.get(self.getNoteIndex(str, cfret), self.enharmonic)
 
-    def getHarmonicNote(self, str, tab):
-        '''Return harmonic note object given string number and tab fret number byte.'''
+    def newHarmonicNote(self, str, tab):
+        '''Return the interned harmonic note object given string number and tab fret number byte, computed without the note table.'''
         fret = self.getFretNum(tab)
         hfret = self.HARMONIC_FRETS[fret]
         chfret = hfret + self.getFretNum(self.capo)
-        note = notes.Note(self.getNoteIndex(str, chfret), self.enharmonic)
-        print('getHarmonicNote({}, {}) f={}, hf={}, chf={}, n.i={}, n.n={}, n.o={})'.format(str, tab, fret, hfret, chfret, note.index, note.name, note.getOctaveNum()), file=self.dbgFile)
+        note = notes.Note.get(self.getNoteIndex(str, chfret), self.enharmonic)
+        if self.log.on(): self.log('newHarmonicNote({}, {}) f={}, hf={}, chf={}, n.i={}, n.n={}, n.o={})', str, tab, fret, hfret, chfret, note.index, note.name, note.getOctaveNum())
         return note
         
     def getNoteIndex(self, str, f):
         '''Converts string numbering from 1 based with str=1 denoting the high E first string and str=numStrings the low E sixth string.'''
         s = self.numStrings - str                     # Reverse and zero base the string numbering: str[1 ... numStrings] => s[(numStrings - 1) ... 0]
         i = self.stringMap[self.stringKeys[s]] + f    # calculate the fretted note index using the sorted map
-#        print('getNoteIndex() str={}, s={}, f={}, i={}, sk={}, sm={}'.format(str, s, f, i, self.stringKeys[s], self.stringMap[self.stringKeys[s]]), file=self.dbgFile)
+#        self.log('getNoteIndex() str={}, s={}, f={}, i={}, sk={}, sm={}', str, s, f, i, self.stringKeys[s], self.stringMap[self.stringKeys[s]])
         return i
     
     def printChord(self, c=None, dbg=1):
@@ -1686,7 +1874,8 @@ class Tabs(object):
         '''
 Note the console window should be at least as wide as the number of tabs + 2.  Window resizing is not supported.  
 The command line arg -t specifies the number of tabs per string per line.  
-The command line arg -f specifies the file name to read from and write to.  
+The command line arg -f specifies the file name to read from and write to.  The file format (ANSI or native) is detected when reading.  
+The command line arg -N specifies the tabs are saved in the compact native file format rather than with ANSI codes.  
 The command line arg -s specifies the spelling of the string names e.g. -s 'E2A2D3G3B3E4' is 6 string standard guitar tuning.  
 The command line arg -S specifies the spelling of the string names via an alias e.g. -s 'GUITAR' is 6 string standard guitar tuning.  
 The command line arg -k specifies the fret to place the capo at [0-9], [a-o].  
@@ -1700,6 +1889,10 @@ The command line arg -L moves the cursor to the last tab on the current line of
 The command line arg -z moves the cursor to the last tab on the last line of the current string  
 The command line arg -Z moves the cursor to the last tab on the last line of all strings  
 The command line arg -h enables display of this help info.  
+The command line arg -d enables debug logging to the dbg.tab file e.g. -d 3 or -d DEBUG for all modules, -d chords=3 for one module, levels are 0=OFF 1=ERROR 2=INFO 3=DEBUG.  
+The command line arg -D keeps the last N debug messages in memory e.g. -D 1000 and writes them to the dbg.tab file only on error.  
+The command line arg -j specifies the maximum number of bytes of tabs kept by the undo and redo journal e.g. -j 4194304.  
+The command line arg -C specifies the file the discovered chord names are cached in between sessions e.g. -C my.cache, -C alone uses chords.cache, by default no cache file is read or written.  
 
 Tabs are displayed in the tabs section with an optional row to label and highlight the selected tab column.  
 An optional notes section and an optional chords section can also be displayed below the tabs section.  
@@ -1736,7 +1929,7 @@ Minor and diminished chords use the color blue for the 'm' or the 'dim' characte
 
 Note the tabs, notes, and chords can be saved to a file and if you 'cat' the file you can see the ANSI colors.  
         '''
-        print(summary, file=self.dbgFile)
+        self.log(summary)
         print(summary)
         
 def main():
@@ -0,0 +1,93 @@
+'''voicings.py module.  class list: [Voicings].  Users are encouraged to modify this module to customize the voicing search e.g. the fret span limit'''
+
+import chords, notes
+
+class Voicings(object):
+    '''Model the voicings of a chord on the current tuning and capo.  A voicing is a tuple with the fret number of each string index, or None if the string is not played.'''
+
+    MAX_SPAN = 3                                               # bound on the number of frets between the lowest and the highest fretted note, open strings are not counted
+    MAX_COUNT = 10000                                          # bound on the number of voicings found for one chord, e.g. for instruments with many strings
+
+    def __init__(self, tabsObj):
+        self.tabsObj = tabsObj
+        self.log = tabsObj.logs.channel('voicings')           # the logs.Channel for this module
+        self.masks = chords.Chords.getSuffixMasks()            # dict of chord name suffix -> 12 bit pitch class mask of the chord with root C
+        self.memo = {}                                         # dict of (string spelling, capo, chord name) -> list of voicings, see getVoicings()
+        self.log('Voicings() MAX_SPAN={}, MAX_COUNT={}', self.MAX_SPAN, self.MAX_COUNT)
+
+    def parseChordName(self, name):
+        '''Return the root pitch class, the suffix, and the 12 bit pitch class mask of the given chord name e.g. Am7, the suffix is one of the chords.Chords.VOCABULARY suffixes.'''
+        n = 2 if len(name) > 1 and name[1] in '#b' else 1
+        root, suffix = name[:n], name[n:]
+        if root + '0' not in notes.Note.INDICES or suffix not in self.masks:
+            raise Exception('Voicings.parseChordName() ERROR! Invalid chord name={}, root={}, suffix={}'.format(name, root, suffix))
+        pc = notes.Note.INDICES[root + '0'] % 12
+        mask = self.masks[suffix]
+        return pc, suffix, ((mask << pc) | (mask >> (12 - pc))) & 0xFFF
+
+    def getVoicings(self, name):
+        '''Return the list of voicings of the named chord, ranked by position, number of strings played, and stretch, see rank().  The lowest note of each voicing is the root,
+           so the chords section names it as the given chord.  The muted strings are below the root or above the highest note, each pitch class of the chord is played,
+           and no fret is past NUM_FRETS with the capo, and the chords section names it as the given chord, see isNamed().  The list is memoized for each string spelling, capo, and chord name.'''
+        tabsObj = self.tabsObj
+        key = (tabsObj.strings.spelling, tabsObj.capo, name)
+        if key in self.memo: return self.memo[key]
+        root, suffix, mask = self.parseChordName(name)
+        order = list(range(tabsObj.numStrings - 1, -1, -1))   # string indices, lowest string first
+        capFN = tabsObj.getFretNum(tabsObj.capo)
+        frets = {}                                             # dict of string index -> list of (fret number, pitch class) of the frets that play a chord tone
+        for r in order:
+            frets[r] = []
+            for fn in range(0, tabsObj.NUM_FRETS + 1 - capFN):
+                pc = tabsObj.getNote(r + 1, tabsObj.getFretByte(fn)).index % 12
+                if mask >> pc & 1: frets[r].append((fn, pc))
+        voicings, voicing = [], [None] * tabsObj.numStrings
+
+        def search(i, lo, hi, covered):
+            if len(voicings) >= self.MAX_COUNT: return
+            if covered == mask: voicings.append(tuple(voicing))   # the rest of the strings are muted
+            if i == len(order) or bin(mask & ~covered).count('1') > len(order) - i: return
+            r = order[i]
+            for fn, pc in frets[r]:
+                if covered == 0 and pc != root: continue       # the lowest note is the root
+                l, h = (min(lo, fn), max(hi, fn)) if fn else (lo, hi)
+                if h - l > self.MAX_SPAN: continue
+                voicing[r] = fn
+                search(i + 1, l, h, covered | 1 << pc)
+            voicing[r] = None
+            if covered == 0: search(i + 1, lo, hi, covered)    # mute a string below the root
+
+        search(0, tabsObj.NUM_FRETS, 0, 0)
+        voicings = [voicing for voicing in voicings if self.isNamed(voicing, root, suffix)]
+        voicings.sort(key=self.rank)
+        self.memo[key] = voicings
+        self.log('getVoicings({}) spelling={}, capo={}, {} voicings', name, key[0], chr(key[1]), len(voicings))
+        return voicings
+
+    def isNamed(self, voicing, root, suffix):
+        '''Return True if the chords section names the voicing as the chord with the given root pitch class and suffix, e.g. a voicing with a 2 and a 9 may name another root.'''
+        tabsObj = self.tabsObj
+        notes = [tabsObj.getNote(r + 1, tabsObj.getFretByte(voicing[r])) for r in range(tabsObj.numStrings - 1, -1, -1) if voicing[r] is not None]
+        chord = tabsObj.chordsObj.getChord(notes)
+        return chord is not None and chord[0].index % 12 == root and chord[1] == suffix
+
+    @staticmethod
+    def rank(voicing):
+        '''Return the sort key of the voicing: the position, the highest fretted note, then more strings played, then the stretch.'''
+        fretted = [fn for fn in voicing if fn]
+        return (max(fretted) if fretted else 0, -sum(fn is not None for fn in voicing), max(fretted) - min(fretted) if fretted else 0)
+
+    def getText(self, voicing):
+        '''Return the tabs of the voicing as a string, lowest string first, e.g. -32010 for a C chord on a guitar.'''
+        return ''.join('-' if fn is None else chr(self.tabsObj.getFretByte(fn)) for fn in reversed(voicing))
+
+    def insert(self, voicing):
+        '''Write the voicing in the cursor column with setTab(), one string at a time, so the insert and replace edit modes and the redraw work as they do for typed tabs.'''
+        tabsObj = self.tabsObj
+        row, col = tabsObj.row, tabsObj.col
+        bgnRow = tabsObj.bgnRow(tabsObj.row2Line(row))
+        self.log('insert({}) row={}, col={}', self.getText(voicing), row, col)
+        for r in range(0, tabsObj.numStrings):
+            tabsObj.moveTo(bgnRow + r, col)
+            tabsObj.setTab(ord('-') if voicing[r] is None else tabsObj.getFretByte(voicing[r]))
+        tabsObj.moveTo(row, col, hi=1)